@@ -0,0 +1,140 @@
+import json
+import time
+from datetime import datetime, timedelta
+from models import db, User, Job, Application, LoginHistory, ResumeUpload, JobView, AdminStatsSnapshot
+
+class AdminStatsService:
+    """Materialized admin statistics.
+
+    The expensive aggregates are computed by refresh() (called from a
+    background task or on demand) and stored as a single JSON snapshot row;
+    page views only read that row.
+    """
+
+    def compute(self):
+        """Compute every admin statistic with a handful of aggregate queries"""
+        now = datetime.utcnow()
+        week_ago = now - timedelta(days=7)
+        month_ago = now - timedelta(days=30)
+
+        def count_if(condition):
+            return db.func.coalesce(db.func.sum(db.case((condition, 1), else_=0)), 0)
+
+        # User statistics in one pass
+        total_users, total_students, total_employers, active_users, recent_users = db.session.query(
+            db.func.count(User.id),
+            count_if(User.user_type == 'student'),
+            count_if(User.user_type == 'employer'),
+            count_if(User.is_active == True),
+            count_if(User.created_at >= month_ago)
+        ).one()
+
+        total_jobs, total_job_views = db.session.query(
+            db.func.count(Job.id),
+            db.func.coalesce(db.func.sum(Job.views), 0)
+        ).one()
+
+        total_applications, recent_applications = db.session.query(
+            db.func.count(Application.id),
+            count_if(Application.applied_at >= week_ago)
+        ).one()
+
+        total_resume_uploads, avg_ats_score, recent_resume_uploads = db.session.query(
+            db.func.count(ResumeUpload.id),
+            db.func.avg(ResumeUpload.ats_score),
+            count_if(ResumeUpload.upload_time >= week_ago)
+        ).one()
+
+        total_logins, recent_logins = db.session.query(
+            db.func.count(LoginHistory.id),
+            count_if(LoginHistory.login_time >= week_ago)
+        ).one()
+
+        recent_job_views = db.session.query(db.func.count(JobView.id)).filter(
+            JobView.view_time >= week_ago
+        ).scalar()
+
+        # Top performing employers
+        top_employers = db.session.query(
+            User.username,
+            db.func.count(Job.id).label('jobs_posted'),
+            db.func.coalesce(db.func.sum(Job.views), 0).label('total_views')
+        ).join(Job, Job.employer_id == User.id).filter(User.user_type == 'employer').group_by(User.id).order_by(
+            db.desc('total_views')
+        ).limit(5).all()
+
+        # Most active students: aggregate each child table separately so the
+        # application and resume rows are not multiplied together by the join
+        app_counts = db.session.query(
+            Application.user_id.label('user_id'),
+            db.func.count(Application.id).label('applications')
+        ).group_by(Application.user_id).subquery()
+        resume_counts = db.session.query(
+            ResumeUpload.user_id.label('user_id'),
+            db.func.count(ResumeUpload.id).label('resumes_uploaded')
+        ).group_by(ResumeUpload.user_id).subquery()
+        active_students = db.session.query(
+            User.username,
+            db.func.coalesce(app_counts.c.applications, 0).label('applications'),
+            db.func.coalesce(resume_counts.c.resumes_uploaded, 0).label('resumes_uploaded')
+        ).outerjoin(app_counts, app_counts.c.user_id == User.id).outerjoin(
+            resume_counts, resume_counts.c.user_id == User.id
+        ).filter(User.user_type == 'student').order_by(
+            db.desc('applications')
+        ).limit(5).all()
+
+        return {
+            'total_users': total_users,
+            'total_students': total_students,
+            'total_employers': total_employers,
+            'active_users': active_users,
+            'recent_users': recent_users,
+            'total_jobs': total_jobs,
+            'total_applications': total_applications,
+            'total_job_views': total_job_views,
+            'total_resume_uploads': total_resume_uploads,
+            'avg_ats_score': round(avg_ats_score or 0, 2),
+            'total_logins': total_logins,
+            'recent_logins': recent_logins,
+            'top_employers': [
+                {'username': username, 'jobs_posted': jobs_posted, 'total_views': total_views}
+                for username, jobs_posted, total_views in top_employers
+            ],
+            'active_students': [
+                {'username': username, 'applications': applications, 'resumes_uploaded': resumes_uploaded}
+                for username, applications, resumes_uploaded in active_students
+            ],
+            'recent_applications': recent_applications,
+            'recent_job_views': recent_job_views,
+            'recent_resume_uploads': recent_resume_uploads
+        }
+
+    def refresh(self):
+        """Recompute the statistics and replace the stored snapshot"""
+        started = time.perf_counter()
+        stats = self.compute()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        snapshot = AdminStatsSnapshot.query.order_by(AdminStatsSnapshot.id.desc()).first()
+        if not snapshot:
+            snapshot = AdminStatsSnapshot()
+            db.session.add(snapshot)
+        snapshot.computed_at = datetime.utcnow()
+        snapshot.duration_ms = duration_ms
+        snapshot.payload = json.dumps(stats)
+        db.session.commit()
+        return snapshot
+
+    def get_snapshot(self, max_age=300, force_refresh=False):
+        """Return the stored snapshot, refreshing it if missing or older than max_age seconds"""
+        snapshot = None
+        if not force_refresh:
+            snapshot = AdminStatsSnapshot.query.order_by(AdminStatsSnapshot.id.desc()).first()
+        if snapshot is None or snapshot.computed_at < datetime.utcnow() - timedelta(seconds=max_age):
+            snapshot = self.refresh()
+        return snapshot
+
+    def get_stats(self, max_age=300, force_refresh=False):
+        """Return (stats dict, computed_at) from the snapshot"""
+        snapshot = self.get_snapshot(max_age, force_refresh)
+        return json.loads(snapshot.payload), snapshot.computed_at
@@ -0,0 +1,316 @@
+"""Local embedding service: one copy of the embedding model shared by every web worker.
+
+Run one per host next to the app and point the workers at its socket:
+
+    python -m ai.embedding_service --socket instance/embedding.sock
+    python -m ai.embedding_service --socket instance/embedding.sock --backend onnx --model-dir instance/models/minilm
+    EMBEDDING_SERVICE_SOCKET=instance/embedding.sock gunicorn -w 3 app:app
+
+Messages in both directions are a 4-byte big-endian header length, a JSON
+header and, for encode replies, the float32 payload of header['shape'].
+Requests are {"op": "encode", "texts": [...]} or {"op": "info"}.
+
+Concurrent encode requests are micro-batched: the batcher thread takes the
+first queued request, keeps collecting until max_batch texts are waiting or
+max_wait_ms has passed, encodes them in one call and hands each caller its
+rows. The queue is bounded; when it is full a request is answered "busy"
+right away so the caller falls back instead of piling up behind the model.
+"""
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+import numpy as np
+from ai.inference_backends import BACKENDS, load_backend
+
+LENGTH = struct.Struct('>I')
+MAX_HEADER_BYTES = 64 * 1024 * 1024
+
+class EmbeddingServiceError(Exception):
+    """The service is unreachable, overloaded or returned an error"""
+
+def _recv_exactly(sock, size):
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        chunk = sock.recv_into(view[received:])
+        if not chunk:
+            raise ConnectionError('connection closed')
+        received += chunk
+    return bytes(buffer)
+
+def send_message(sock, header, payload=b''):
+    data = json.dumps(header).encode('utf-8')
+    sock.sendall(LENGTH.pack(len(data)) + data + payload)
+
+def recv_message(sock):
+    """(header, payload) of one message; the payload length follows from header['shape']"""
+    (size,) = LENGTH.unpack(_recv_exactly(sock, LENGTH.size))
+    if size > MAX_HEADER_BYTES:
+        raise ConnectionError(f'message header of {size} bytes is too large')
+    header = json.loads(_recv_exactly(sock, size))
+    payload = b''
+    if header.get('shape'):
+        rows, dim = header['shape']
+        payload = _recv_exactly(sock, rows * dim * 4)
+    return header, payload
+
+# --- server ---
+
+class _Pending:
+    __slots__ = ('texts', 'done', 'vectors', 'error')
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.done = threading.Event()
+        self.vectors = None
+        self.error = None
+
+class MicroBatcher:
+    """Bounded request queue drained by one thread that encodes in batches"""
+
+    def __init__(self, encode, max_batch=64, max_wait_ms=5.0, queue_size=256):
+        self.encode = encode
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'texts': 0, 'batches': 0, 'rejected': 0, 'errors': 0, 'encode_ms': 0.0}
+        self._thread = threading.Thread(target=self._run, name='embedding-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, texts, timeout=30.0):
+        """Encoded rows for texts; raises EmbeddingServiceError when busy, failed or timed out"""
+        pending = _Pending(texts)
+        try:
+            self._queue.put_nowait(pending)
+        except queue.Full:
+            with self._stats_lock:
+                self.stats['rejected'] += 1
+            raise EmbeddingServiceError('busy')
+        if not pending.done.wait(timeout):
+            raise EmbeddingServiceError('timed out waiting for the model')
+        if pending.error is not None:
+            raise EmbeddingServiceError(pending.error)
+        return pending.vectors
+
+    def _collect(self):
+        try:
+            first = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return []
+        batch, size = [first], len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(pending)
+            size += len(pending.texts)
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            texts = [text for pending in batch for text in pending.texts]
+            started = time.perf_counter()
+            try:
+                vectors = np.asarray(self.encode(texts), dtype=np.float32)
+            except Exception as e:
+                for pending in batch:
+                    pending.error = f'encode failed: {e}'
+                    pending.done.set()
+                with self._stats_lock:
+                    self.stats['errors'] += 1
+                continue
+            offset = 0
+            for pending in batch:
+                pending.vectors = vectors[offset:offset + len(pending.texts)]
+                offset += len(pending.texts)
+                pending.done.set()
+            with self._stats_lock:
+                self.stats['requests'] += len(batch)
+                self.stats['texts'] += len(texts)
+                self.stats['batches'] += 1
+                self.stats['encode_ms'] += (time.perf_counter() - started) * 1000
+
+    def snapshot(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['queued'] = self._queue.qsize()
+        stats['mean_batch_texts'] = round(stats['texts'] / stats['batches'], 2) if stats['batches'] else 0.0
+        return stats
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=2)
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        # Clients keep their connection open and send one request at a time
+        server = self.server
+        while True:
+            try:
+                header, _ = recv_message(self.request)
+            except (ConnectionError, OSError, ValueError):
+                return
+            try:
+                if header.get('op') == 'info':
+                    send_message(self.request, {'ok': True, 'model': server.model_name, 'dim': server.dim,
+                                                'stats': server.batcher.snapshot()})
+                    continue
+                texts = [str(text) for text in header.get('texts', [])]
+                try:
+                    vectors = server.batcher.submit(texts, server.request_timeout) if texts else np.empty((0, server.dim), np.float32)
+                except EmbeddingServiceError as e:
+                    send_message(self.request, {'ok': False, 'error': str(e)})
+                    continue
+                send_message(self.request, {'ok': True, 'model': server.model_name, 'shape': list(vectors.shape)},
+                             np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            except OSError:
+                return
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128  # listen backlog: every worker thread may connect at once
+
+    def __init__(self, socket_path, encode, model_name, dim, max_batch=64, max_wait_ms=5.0,
+                 queue_size=256, request_timeout=30.0):
+        self.model_name = model_name
+        self.dim = dim
+        self.request_timeout = request_timeout
+        self.batcher = MicroBatcher(encode, max_batch, max_wait_ms, queue_size)
+        if os.path.exists(socket_path):
+            os.remove(socket_path)  # stale socket from a previous run
+        super().__init__(socket_path, _Handler)
+        os.chmod(socket_path, 0o660)
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.stop()
+        try:
+            os.remove(self.server_address)
+        except OSError:
+            pass
+
+# --- client ---
+
+class EmbeddingClient:
+    """Thin client used by the web workers; one persistent connection per thread.
+
+    After a failed call the service is treated as down for retry_after
+    seconds, so callers fall back immediately instead of paying a connect
+    timeout on every request.
+    """
+
+    def __init__(self, socket_path, model=None, timeout=2.0, retry_after=30.0):
+        self.socket_path = socket_path
+        self.model = model
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._local = threading.local()
+        self._down_until = 0.0
+
+    @property
+    def available(self):
+        return time.monotonic() >= self._down_until
+
+    def _connection(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, 'sock', None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def _call(self, header):
+        if not self.available:
+            raise EmbeddingServiceError('embedding service marked down')
+        try:
+            # A kept-alive connection may have been closed by a service restart: retry once on a new one
+            for attempt in range(2):
+                try:
+                    sock = self._connection()
+                    send_message(sock, header)
+                    reply, payload = recv_message(sock)
+                    break
+                except ConnectionError:
+                    self._close()
+                    if attempt:
+                        raise
+        except (OSError, ValueError) as e:
+            self._close()
+            if self.available:
+                print(f"⚠️ Embedding service at {self.socket_path} unavailable ({e}); "
+                      f"falling back for {self.retry_after:.0f}s")
+            self._down_until = time.monotonic() + self.retry_after
+            raise EmbeddingServiceError(str(e)) from e
+        if not reply.get('ok'):
+            raise EmbeddingServiceError(reply.get('error', 'unknown error'))
+        return reply, payload
+
+    def encode(self, texts):
+        """float32 (len(texts), dim) embeddings as computed by the service"""
+        reply, payload = self._call({'op': 'encode', 'texts': list(texts)})
+        if self.model and reply.get('model') != self.model:
+            raise EmbeddingServiceError(f"service runs {reply.get('model')!r}, expected {self.model!r}")
+        return np.frombuffer(payload, dtype=np.float32).reshape(reply['shape'])
+
+    def info(self):
+        return self._call({'op': 'info'})[0]
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve sentence embeddings to the web workers over a Unix socket')
+    parser.add_argument('--socket', default=os.environ.get('EMBEDDING_SERVICE_SOCKET', 'instance/embedding.sock'))
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--backend', default='sentence-transformers', choices=BACKENDS)
+    parser.add_argument('--model-dir', help='Exported model directory for the onnx backend')
+    parser.add_argument('--quantized', action='store_true', help='Use the int8 ONNX model')
+    parser.add_argument('--max-batch', type=int, default=64, help='Texts encoded per model call at most')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help='How long a batch waits for more requests')
+    parser.add_argument('--queue-size', type=int, default=256, help='Pending requests before new ones are rejected')
+    parser.add_argument('--threads', type=int, default=0, help='Intra-op threads (0 keeps the default)')
+    args = parser.parse_args()
+
+    backend = load_backend(args.backend, args.model, args.model_dir, args.quantized, args.threads)
+
+    def encode(texts):
+        return backend.encode(texts, batch_size=args.max_batch)
+
+    encode(['warm up'])
+    server = EmbeddingServer(args.socket, encode, backend.model_id, backend.dim,
+                             args.max_batch, args.max_wait_ms, args.queue_size)
+    print(f"🧠 Embedding service for {backend.model_id} ({backend.name}) listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
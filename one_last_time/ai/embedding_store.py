@@ -0,0 +1,265 @@
+"""Append-friendly, memory-mapped store of fixed-width embedding vectors.
+
+On-disk layout of a store directory::
+
+    MANIFEST.json   {"generation": n, "dim": d, "dtype": "float32", "model": "..."}
+    g<n>.vec        64-byte header (magic, dim, dtype code, row count) + rows of d floats
+    g<n>.ids        one (id int64, text_hash uint64) record per row
+    g<n>.del        one tombstone byte per row (1 = deleted or superseded)
+
+Appends write the new rows past the current end of all three files and
+only then bump the row count in the .vec header, which is the commit point;
+readers never see a partially written row. Re-embedding an id appends a new
+row and tombstones the old one. compact() rewrites the live rows into the
+next generation and switches MANIFEST.json atomically; readers that still
+map the old generation keep working until they refresh.
+
+Readers use numpy.memmap, so a cold worker maps the file instead of
+re-encoding and only pages it actually touches become resident. Writers
+(in any process) are serialized with an flock on the directory's .lock file.
+"""
+import hashlib
+import json
+import os
+import struct
+import threading
+from contextlib import contextmanager
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+MAGIC = b'OLTEMB01'
+HEADER = struct.Struct('<8sIIQ')  # magic, dim, dtype code, row count
+HEADER_SIZE = 64
+COUNT_OFFSET = 16
+DTYPES = {'float32': (0, np.float32), 'float16': (1, np.float16)}
+ROW_DTYPE = np.dtype([('id', '<i8'), ('text_hash', '<u8')])
+
+def text_hash(text):
+    """Stable 64-bit hash of the text an embedding was computed from"""
+    return int.from_bytes(hashlib.blake2b((text or '').encode('utf-8'), digest_size=8).digest(), 'little')
+
+class EmbeddingStore:
+    def __init__(self, directory, dim, dtype='float32', model=''):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported embedding dtype {dtype!r}; use one of {sorted(DTYPES)}")
+        self.directory = directory
+        self.dim = dim
+        self.dtype_name = dtype
+        self.dtype_code, self.dtype = DTYPES[dtype]
+        self.model = model
+        self.row_bytes = dim * np.dtype(self.dtype).itemsize
+        self._lock = threading.RLock()
+        self._generation = None
+        self._count = 0
+        self._vectors = self._rows = self._deleted = None
+        self._index = {}  # id -> newest row
+        os.makedirs(directory, exist_ok=True)
+        with self._writer():
+            manifest = self._read_manifest()
+            if manifest is None or (manifest['dim'], manifest['dtype'], manifest['model']) != (dim, dtype, model):
+                # New store, or vectors from another model/shape: start a fresh generation
+                generation = manifest['generation'] + 1 if manifest else 1
+                self._write_generation(generation, np.empty((0, dim), self.dtype), np.empty(0, ROW_DTYPE))
+                self._switch(generation, manifest)
+        self.refresh()
+
+    # --- files ---
+
+    def _path(self, generation, ext):
+        return os.path.join(self.directory, f'g{generation}.{ext}')
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.directory, 'MANIFEST.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _switch(self, generation, previous):
+        manifest_path = os.path.join(self.directory, 'MANIFEST.json')
+        tmp_path = f'{manifest_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'generation': generation, 'dim': self.dim, 'dtype': self.dtype_name, 'model': self.model}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, manifest_path)
+        if previous:
+            # Open maps of the old generation stay valid after unlink
+            for ext in ('vec', 'ids', 'del'):
+                try:
+                    os.remove(self._path(previous['generation'], ext))
+                except OSError:
+                    pass
+
+    def _write_generation(self, generation, vectors, rows):
+        with open(self._path(generation, 'vec'), 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.dim, self.dtype_code, len(rows)).ljust(HEADER_SIZE, b'\0'))
+            f.write(np.ascontiguousarray(vectors, dtype=self.dtype).tobytes())
+        with open(self._path(generation, 'ids'), 'wb') as f:
+            f.write(rows.tobytes())
+        with open(self._path(generation, 'del'), 'wb') as f:
+            f.write(bytes(len(rows)))
+
+    def _read_count(self, generation):
+        with open(self._path(generation, 'vec'), 'rb') as f:
+            magic, dim, dtype_code, count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or dim != self.dim or dtype_code != self.dtype_code:
+            raise ValueError(f"{self._path(generation, 'vec')} is not a {self.dim}-d {self.dtype_name} embedding file")
+        return count
+
+    @contextmanager
+    def _writer(self):
+        with self._lock, open(os.path.join(self.directory, '.lock'), 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    # --- reading ---
+
+    def refresh(self):
+        """Pick up rows appended (or a compaction done) by any process since the last call"""
+        with self._lock:
+            for attempt in range(3):
+                generation = self._read_manifest()['generation']
+                try:
+                    count = self._read_count(generation)
+                    break
+                except FileNotFoundError:
+                    if attempt == 2:
+                        raise  # compacted away between reading the manifest and opening, repeatedly
+            if generation == self._generation and count == self._count:
+                return
+            start = self._count if generation == self._generation else 0
+            if count:
+                vectors = np.memmap(self._path(generation, 'vec'), dtype=self.dtype, mode='r',
+                                    offset=HEADER_SIZE, shape=(count, self.dim))
+                rows = np.memmap(self._path(generation, 'ids'), dtype=ROW_DTYPE, mode='r', shape=(count,))
+                deleted = np.memmap(self._path(generation, 'del'), dtype=np.uint8, mode='r', shape=(count,))
+            else:
+                vectors = np.empty((0, self.dim), self.dtype)
+                rows = np.empty(0, ROW_DTYPE)
+                deleted = np.empty(0, np.uint8)
+            index = self._index if start else {}
+            index.update(zip(rows['id'][start:count].tolist(), range(start, count)))
+            self._generation, self._count = generation, count
+            self._vectors, self._rows, self._deleted, self._index = vectors, rows, deleted, index
+
+    def lookup(self, ids, hashes=None):
+        """Row of each id (-1 if absent, tombstoned or embedded from different text)"""
+        self.refresh()
+        with self._lock:
+            positions = np.fromiter((self._index.get(int(i), -1) for i in ids), dtype=np.int64, count=len(ids))
+            found = np.flatnonzero(positions >= 0)
+            if len(found):
+                rows = positions[found]
+                ok = self._deleted[rows] == 0
+                if hashes is not None:
+                    ok &= self._rows['text_hash'][rows] == np.asarray(hashes, dtype=np.uint64)[found]
+                positions[found[~ok]] = -1
+            return positions
+
+    def vectors(self, positions):
+        """float32 copies of the given rows"""
+        with self._lock:
+            return np.asarray(self._vectors[np.asarray(positions, dtype=np.int64)], dtype=np.float32)
+
+    def live(self):
+        """(ids, rows) of every live vector, for full scans"""
+        self.refresh()
+        with self._lock:
+            rows = np.fromiter(self._index.values(), dtype=np.int64, count=len(self._index))
+            rows = np.sort(rows[self._deleted[rows] == 0])
+            return np.asarray(self._rows['id'][rows]), rows
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def matrix(self):
+        """The mapped (rows, dim) matrix of the current generation, dead rows included"""
+        self.refresh()
+        return self._vectors
+
+    def stats(self):
+        self.refresh()
+        with self._lock:
+            dead = int(np.count_nonzero(self._deleted)) if self._count else 0
+            return {
+                'generation': self._generation,
+                'rows': self._count,
+                'live': self._count - dead,
+                'dead': dead,
+                'dtype': self.dtype_name,
+                'bytes': HEADER_SIZE + self._count * self.row_bytes,
+            }
+
+    # --- writing ---
+
+    def append(self, ids, vectors, hashes=None):
+        """Append vectors for ids, superseding any earlier rows for the same ids"""
+        vectors = np.asarray(vectors, dtype=self.dtype).reshape(-1, self.dim)
+        ids = [int(i) for i in ids]
+        hashes = list(hashes) if hashes is not None else [0] * len(ids)
+        # Within one batch the last vector for an id wins
+        last = {job_id: i for i, job_id in enumerate(ids)}
+        keep = sorted(last.values())
+        if not keep:
+            return
+        rows = np.zeros(len(keep), ROW_DTYPE)
+        rows['id'] = [ids[i] for i in keep]
+        rows['text_hash'] = [hashes[i] for i in keep]
+        with self._writer():
+            self.refresh()
+            generation, count = self._generation, self._count
+            superseded = [self._index[i] for i in rows['id'].tolist() if i in self._index]
+            with open(self._path(generation, 'vec'), 'r+b') as f:
+                f.seek(HEADER_SIZE + count * self.row_bytes)
+                f.write(np.ascontiguousarray(vectors[keep]).tobytes())
+            with open(self._path(generation, 'ids'), 'r+b') as f:
+                f.seek(count * ROW_DTYPE.itemsize)
+                f.write(rows.tobytes())
+            with open(self._path(generation, 'del'), 'r+b') as f:
+                f.seek(count)
+                f.write(bytes(len(rows)))
+            self._tombstone(generation, superseded)
+            with open(self._path(generation, 'vec'), 'r+b') as f:
+                f.seek(COUNT_OFFSET)
+                f.write(struct.pack('<Q', count + len(rows)))
+        self.refresh()
+
+    def delete(self, ids):
+        """Tombstone the rows of deleted or inactive ids"""
+        with self._writer():
+            self.refresh()
+            self._tombstone(self._generation, [self._index[int(i)] for i in ids if int(i) in self._index])
+
+    def _tombstone(self, generation, positions):
+        if not positions:
+            return
+        with open(self._path(generation, 'del'), 'r+b') as f:
+            for position in sorted(positions):
+                f.seek(position)
+                f.write(b'\x01')
+
+    def compact(self, keep_ids=None, min_dead_ratio=0.0):
+        """Rewrite live rows (optionally only those in keep_ids) into a new generation"""
+        with self._writer():
+            self.refresh()
+            if keep_ids is not None:
+                keep_ids = set(keep_ids)
+                self._tombstone(self._generation, [row for job_id, row in self._index.items() if job_id not in keep_ids])
+            ids, rows = self.live()
+            dead = self._count - len(rows)
+            if not dead or dead / max(self._count, 1) < min_dead_ratio:
+                return self.stats()
+            previous = self._read_manifest()
+            generation = self._generation + 1
+            self._write_generation(generation, self._vectors[rows], np.array(self._rows[rows]))
+            self._switch(generation, previous)
+            print(f"🧹 Compacted embeddings in {self.directory}: dropped {dead} dead rows, {len(rows)} live")
+        self.refresh()
+        return self.stats()
@@ -0,0 +1,94 @@
+"""Two-stage job retrieval: a cheap skill-index pass picks candidates, the
+embedding model scores only those, and the two rankings are fused.
+
+Stage 1 scores every job of a catalog snapshot with its skill bitsets (an
+AND and two popcounts per job) and keeps the best `candidates`. Stage 2
+embeds the resume once and scores just those candidates against their
+stored job embeddings, so embedding work stays bounded however large the
+catalog grows. With a quantized job index (SEMANTIC_QUANTIZATION), stage 2
+also adds the `semantic_candidates` jobs nearest the resume in the
+quantized scan, so a strong semantic match the skill pass ranked low is
+still scored. The scores are fused with reciprocal-rank fusion (default)
+or a weighted sum, and heapq cuts the result to the top k.
+"""
+import heapq
+from collections import namedtuple
+import numpy as np
+from ai.job_matcher import encode_texts, quantized_search_enabled, semantic_candidates, semantic_scores
+
+# One ranked job; semantic_score is None when no embedding model is available
+HybridMatch = namedtuple('HybridMatch', ['index', 'job', 'score', 'skill_percentage', 'semantic_score'])
+
+FUSIONS = ('rrf', 'weighted')
+
+def competition_ranks(scores):
+    """0-based rank of each score, best first; equal scores share a rank"""
+    descending = -np.sort(scores)[::-1]
+    return np.searchsorted(descending, -np.asarray(scores), side='left')
+
+class HybridRetriever:
+    def __init__(self, matcher='resume', candidates=300, fusion='rrf', rrf_k=60, semantic_weight=0.5,
+                 semantic_candidates=50):
+        if fusion not in FUSIONS:
+            raise ValueError(f"Unknown fusion {fusion!r}; use one of {FUSIONS}")
+        self.matcher = matcher
+        self.candidates = candidates
+        self.fusion = fusion
+        self.rrf_k = rrf_k
+        self.semantic_weight = semantic_weight
+        self.semantic_candidates = semantic_candidates
+
+    def skill_order(self, snapshot, user_skills):
+        """(row indices by skill match, best first with catalog order on ties, percentages)"""
+        percentages = snapshot.match_percentages(self.matcher, user_skills)
+        return np.argsort(-percentages, kind='stable'), percentages
+
+    def fuse(self, skill_percentages, semantic):
+        if semantic is None:
+            scale = 100.0 if self.fusion == 'weighted' else 1.0
+            return np.asarray(skill_percentages, dtype=np.float64) / scale
+        weight = self.semantic_weight
+        if self.fusion == 'weighted':
+            return (1 - weight) * skill_percentages / 100.0 + weight * np.clip(semantic, 0.0, 1.0)
+        return ((1 - weight) / (self.rrf_k + 1 + competition_ranks(skill_percentages))
+                + weight / (self.rrf_k + 1 + competition_ranks(semantic)))
+
+    def rank(self, snapshot, user_skills, resume_text=None, k=None, order=None, resume_vector=None):
+        """Top k (default: every candidate) HybridMatch rows of the snapshot, best first;
+        a precomputed resume_vector avoids encoding resume_text. A given `order` (row
+        indices, percentages) also limits which rows can be returned"""
+        if order is None:
+            order, percentages = self.skill_order(snapshot, user_skills)
+        else:
+            order, percentages = order
+        candidates = order[:self.candidates]
+        if not len(candidates):
+            return []
+        semantic_wanted = bool(resume_text) or resume_vector is not None
+        if semantic_wanted and self.semantic_candidates and quantized_search_enabled():
+            if resume_vector is None:
+                encoded = encode_texts([resume_text])
+                resume_vector = None if encoded is None else encoded[0]
+            if resume_vector is not None:
+                # Drawn from `order` only, so rows a caller left out (e.g. expired jobs) stay out
+                extra = order[semantic_candidates(resume_vector, snapshot.ids[order], self.semantic_candidates)]
+                candidates = np.concatenate([candidates, extra[~np.isin(extra, candidates)]])
+        jobs = [snapshot.rows[i] for i in candidates]
+        semantic = semantic_scores(resume_text, jobs, resume_vector) if semantic_wanted else None
+        fused = self.fuse(percentages[candidates], semantic)
+        k = len(candidates) if k is None else min(k, len(candidates))
+        # Ties keep the stage-1 order
+        best = heapq.nlargest(k, range(len(candidates)), key=lambda i: (fused[i], -i))
+        return [HybridMatch(int(candidates[i]), jobs[i], float(fused[i]), float(percentages[candidates[i]]),
+                            None if semantic is None else float(semantic[i]))
+                for i in best]
+
+    def order(self, snapshot, user_skills, resume_text=None, resume_vector=None):
+        """Every row index: the fused candidates first, then the rest by skill match"""
+        order, percentages = self.skill_order(snapshot, user_skills)
+        ranked = [match.index for match in self.rank(snapshot, user_skills, resume_text, order=(order, percentages),
+                                                     resume_vector=resume_vector)]
+        ranked = np.asarray(ranked, dtype=np.int64)
+        return np.concatenate([ranked, order[~np.isin(order, ranked)]]), percentages
+
+hybrid_retriever = HybridRetriever()
@@ -0,0 +1,180 @@
+"""Pluggable CPU inference backends for the sentence embedding model.
+
+sentence-transformers  PyTorch eager mode, the original path
+onnx                   ONNX Runtime session over an exported model directory,
+                       optionally with dynamically int8-quantized weights
+
+Every backend exposes model_id, dim and encode(texts, batch_size) returning
+L2-normalized float32 rows, so job_matcher and the embedding service can
+swap them freely. model_id only changes for the int8 model: its vectors are
+close to but not bit-identical with fp32 ones, and EmbeddingStore starts a
+fresh generation rather than mixing the two.
+
+Export a model directory once per deployment (needs torch and transformers):
+
+    python -m ai.inference_backends export --model-dir instance/models/minilm --quantize
+    python -m ai.inference_backends check --model-dir instance/models/minilm --quantized
+"""
+import argparse
+import json
+import os
+import numpy as np
+
+DEFAULT_MODEL = 'all-MiniLM-L6-v2'
+MAX_LENGTH = 256  # max_seq_length of all-MiniLM-L6-v2 in sentence-transformers
+ONNX_FILE = 'model.onnx'
+ONNX_INT8_FILE = 'model_int8.onnx'
+CONFIG_FILE = 'backend.json'
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+class SentenceTransformerBackend:
+    name = 'sentence-transformers'
+
+    def __init__(self, model_name=DEFAULT_MODEL, threads=0):
+        from sentence_transformers import SentenceTransformer
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+        self.model = SentenceTransformer(model_name)
+        self.model_id = model_name
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts, batch_size=64):
+        return self.model.encode(list(texts), batch_size=batch_size, normalize_embeddings=True,
+                                 convert_to_numpy=True).astype(np.float32, copy=False)
+
+class OnnxBackend:
+    """Mean-pooled, normalized transformer outputs from an ONNX Runtime session"""
+
+    name = 'onnx'
+
+    def __init__(self, model_dir, quantized=False, threads=0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+        with open(os.path.join(model_dir, CONFIG_FILE), encoding='utf-8') as f:
+            config = json.load(f)
+        path = os.path.join(model_dir, ONNX_INT8_FILE if quantized else ONNX_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found; run `python -m ai.inference_backends export"
+                                    f"{' --quantize' if quantized else ''}` first")
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length=config.get('max_length', MAX_LENGTH))
+        self.tokenizer.enable_padding()
+        self.model_id = config['model'] + ('-int8' if quantized else '')
+        self.dim = config['dim']
+
+    def _encode_batch(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {'input_ids': input_ids, 'attention_mask': attention_mask}
+        if 'token_type_ids' in self.input_names:
+            feeds['token_type_ids'] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        hidden = self.session.run(None, feeds)[0]
+        # Mean pooling over real tokens, as the sentence-transformers pooling layer does
+        mask = attention_mask[:, :, None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+    def encode(self, texts, batch_size=64):
+        texts = list(texts)
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        # Batch texts of similar length together so little time goes into padding
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            out[chunk] = self._encode_batch([texts[i] for i in chunk])
+        return _normalize(out)
+
+BACKENDS = ('sentence-transformers', 'onnx')
+
+def load_backend(name='sentence-transformers', model_name=DEFAULT_MODEL, model_dir=None, quantized=False, threads=0):
+    if name == 'sentence-transformers':
+        return SentenceTransformerBackend(model_name, threads)
+    if name == 'onnx':
+        if not model_dir:
+            raise ValueError('The onnx backend needs a model directory (see `python -m ai.inference_backends export`)')
+        return OnnxBackend(model_dir, quantized, threads)
+    raise ValueError(f"Unknown inference backend {name!r}; use one of {BACKENDS}")
+
+def export_onnx(model_dir, model_name=DEFAULT_MODEL, quantize=False, opset=14):
+    """Export the transformer to model_dir/model.onnx (plus model_int8.onnx with quantize)"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    hub_name = model_name if '/' in model_name else f'sentence-transformers/{model_name}'
+    os.makedirs(model_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(hub_name)
+    model = AutoModel.from_pretrained(hub_name).eval()
+    tokenizer.save_pretrained(model_dir)  # writes tokenizer.json for the tokenizers library
+    sample = tokenizer(['a sample resume sentence'], return_tensors='pt')
+    names = ['input_ids', 'attention_mask', 'token_type_ids']
+    axes = {name: {0: 'batch', 1: 'sequence'} for name in names + ['last_hidden_state']}
+    path = os.path.join(model_dir, ONNX_FILE)
+    with torch.no_grad():
+        torch.onnx.export(model, tuple(sample[name] for name in names), path, input_names=names,
+                          output_names=['last_hidden_state'], dynamic_axes=axes, opset_version=opset)
+    with open(os.path.join(model_dir, CONFIG_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'model': model_name, 'dim': model.config.hidden_size, 'max_length': MAX_LENGTH}, f)
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(path, os.path.join(model_dir, ONNX_INT8_FILE), weight_type=QuantType.QInt8)
+    print(f"📦 Exported {model_name} to {model_dir}{' (fp32 + int8)' if quantize else ''}")
+
+def consistency_check(reference, candidate, texts, min_cosine=0.99, max_score_delta=0.02):
+    """Compare two backends on texts: per-text cosine of their embeddings and the
+    largest change in any pairwise similarity score (what matching actually ranks by)"""
+    a = reference.encode(texts)
+    b = candidate.encode(texts)
+    cosines = np.sum(a * b, axis=1)
+    score_delta = float(np.abs(a @ a.T - b @ b.T).max()) if len(texts) else 0.0
+    return {
+        'reference': reference.model_id,
+        'candidate': candidate.model_id,
+        'texts': len(texts),
+        'min_cosine': round(float(cosines.min()), 5) if len(texts) else 1.0,
+        'mean_cosine': round(float(cosines.mean()), 5) if len(texts) else 1.0,
+        'max_score_delta': round(score_delta, 5),
+        'ok': bool((not len(texts) or cosines.min() >= min_cosine) and score_delta <= max_score_delta),
+    }
+
+SAMPLE_TEXTS = [
+    'Senior Python developer with Flask, SQLAlchemy and PostgreSQL experience',
+    'Data scientist: machine learning, pandas, scikit-learn, statistics and SQL',
+    'Frontend engineer building React and TypeScript single page applications',
+    'We are hiring a DevOps engineer to run Kubernetes clusters on AWS',
+    'Marketing coordinator with social media and content writing skills',
+    'Entry level accountant familiar with Excel and financial reporting',
+]
+
+def main():
+    parser = argparse.ArgumentParser(description='Export and verify sentence embedding inference backends')
+    sub = parser.add_subparsers(dest='command', required=True)
+    export = sub.add_parser('export', help='Export the model to ONNX')
+    export.add_argument('--model-dir', required=True)
+    export.add_argument('--model', default=DEFAULT_MODEL)
+    export.add_argument('--quantize', action='store_true', help='Also write a dynamically int8-quantized model')
+    check = sub.add_parser('check', help='Compare the ONNX backend with sentence-transformers')
+    check.add_argument('--model-dir', required=True)
+    check.add_argument('--quantized', action='store_true')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        export_onnx(args.model_dir, args.model, args.quantize)
+        return
+    candidate = load_backend('onnx', model_dir=args.model_dir, quantized=args.quantized)
+    reference = load_backend('sentence-transformers', candidate.model_id.removesuffix('-int8'))
+    result = consistency_check(reference, candidate, SAMPLE_TEXTS)
+    print(json.dumps(result, indent=2))
+    raise SystemExit(0 if result['ok'] else 1)
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,180 @@
+import heapq
+import importlib.util
+import threading
+import numpy as np
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-try:
-    from sentence_transformers import SentenceTransformer, util
-    st_model = SentenceTransformer('all-MiniLM-L6-v2')
-except ImportError:
-    st_model = None
+from instrumentation import timed, registry
+from ai.embedding_store import EmbeddingStore, text_hash
+from ai.embedding_service import EmbeddingClient, EmbeddingServiceError
+from ai.inference_backends import load_backend
+from ai.quantization import QuantizedIndex
+from ai.skill_registry import skill_registry
+MODEL_NAME = 'all-MiniLM-L6-v2'
+MODEL_DIM = 384  # output size of MODEL_NAME
+
+# Inference backend for this process (see configure_inference_backend), loaded on
+# first use unless configure_embedding_service points the worker at the shared
+# embedding service (python -m ai.embedding_service)
+inference = {'backend': 'sentence-transformers', 'model_dir': None, 'quantized': False, 'threads': 0}
+encoder = None
+embedding_client = None
+_encoder_lock = threading.Lock()
+
+# Persistent job description embeddings (see init_job_embedding_store) and the
+# optional quantized index over them for HybridRetriever's semantic candidates
+job_embedding_store = None
+quantization = {'mode': None, 'oversample': 40}
+_quantized_index = None
+_quantized_lock = threading.Lock()
+
+def configure_inference_backend(backend='sentence-transformers', model_dir=None, quantized=False, threads=0):
+    # backend 'onnx' runs the model exported to model_dir under ONNX Runtime
+    # (see ai/inference_backends.py); quantized picks its int8 variant
+    global encoder
+    inference.update(backend=backend or 'sentence-transformers', model_dir=model_dir or None,
+                     quantized=bool(quantized), threads=threads)
+    encoder = None  # False once loading has failed
+
+def embedding_model_id():
+    # Identifies which vectors are stored and served; int8 ones are kept apart
+    quantized = inference['backend'] == 'onnx' and inference['quantized']
+    return MODEL_NAME + ('-int8' if quantized else '')
+
+def configure_embedding_service(socket_path, timeout=2.0, retry_after=30.0):
+    # Encode through the service at socket_path instead of a per-worker model copy;
+    # the service must run the same backend variant (checked on every reply)
+    global embedding_client
+    embedding_client = EmbeddingClient(socket_path, model=embedding_model_id(), timeout=timeout,
+                                       retry_after=retry_after) if socket_path else None
+    return embedding_client
+
+def local_encoder():
+    global encoder
+    if encoder is None and semantic_enabled():
+        with _encoder_lock:
+            if encoder is None:
+                try:
+                    encoder = load_backend(inference['backend'], MODEL_NAME, inference['model_dir'],
+                                           inference['quantized'], inference['threads'])
+                except (ImportError, OSError, ValueError) as e:
+                    # Misconfigured backend: keep serving with the CountVectorizer path
+                    print(f"⚠️ Could not load the {inference['backend']} inference backend: {e}")
+                    encoder = False
+    return encoder or None
+
+def semantic_enabled():
+    if embedding_client is not None:
+        return True
+    if inference['backend'] == 'onnx':
+        return bool(inference['model_dir']) and importlib.util.find_spec('onnxruntime') is not None
+    return importlib.util.find_spec('sentence_transformers') is not None
+
+def encode_texts(texts):
+    # Normalized embeddings as a float32 (n, MODEL_DIM) array, or None when no
+    # semantic encoder is reachable and callers should use the CountVectorizer path
+    if embedding_client is not None:
+        try:
+            return embedding_client.encode(texts)
+        except EmbeddingServiceError:
+            registry.inc('embedding_service_fallbacks_total')
+            return None
+    model = local_encoder()
+    if model is None:
+        return None
+    return model.encode(texts, batch_size=64)
+
+def init_job_embedding_store(directory, dtype='float32', quantization_mode=None, oversample=40):
+    # Map (or create) the on-disk job embedding store; needs a semantic encoder.
+    # quantization_mode 'binary' enables the compressed first-stage scan
+    global job_embedding_store
+    if quantization_mode and quantization_mode not in QuantizedIndex.MODES:
+        raise ValueError(f"Unknown quantization mode {quantization_mode!r}; use one of {QuantizedIndex.MODES}")
+    if not semantic_enabled():
+        return None
+    job_embedding_store = EmbeddingStore(directory, MODEL_DIM, dtype=dtype, model=embedding_model_id())
+    quantization.update(mode=quantization_mode or None, oversample=oversample)
+    return job_embedding_store
+
+def job_quantized_index():
+    # Codes for every row of the store, extended in place as rows are appended
+    global _quantized_index
+    matrix = job_embedding_store.matrix()
+    with _quantized_lock:
+        index = _quantized_index
+        if (index is None or index.generation != job_embedding_store.generation
+                or index.rows > len(matrix) or index.mode != quantization['mode']):
+            index = QuantizedIndex(quantization['mode'], quantization['oversample'])
+            index.generation = job_embedding_store.generation
+        if index.rows < len(matrix):
+            index.extend(matrix[index.rows:])
+        _quantized_index = index
+    return index, matrix
+
+def job_embeddings(jobs):
+    # Normalized description embeddings aligned with jobs (None if no encoder is
+    # reachable); only jobs missing from the store (or whose description changed)
+    # are encoded, then appended to it
+    texts = [job.description or '' for job in jobs]
+    if job_embedding_store is None:
+        return encode_texts(texts)
+    ids = [job.id for job in jobs]
+    hashes = [text_hash(text) for text in texts]
+    positions = job_embedding_store.lookup(ids, hashes)
+    embeddings = np.empty((len(jobs), job_embedding_store.dim), dtype=np.float32)
+    found = positions >= 0
+    embeddings[found] = job_embedding_store.vectors(positions[found])
+    missing = np.flatnonzero(~found)
+    if len(missing):
+        encoded = encode_texts([texts[i] for i in missing])
+        if encoded is None:
+            return None
+        embeddings[missing] = encoded
+        try:
+            job_embedding_store.append([ids[i] for i in missing], encoded, [hashes[i] for i in missing])
+        except OSError as e:
+            print(f"⚠️ Could not append job embeddings: {e}")
+    return embeddings
+
+def quantized_search_enabled():
+    return job_embedding_store is not None and bool(quantization['mode'])
+
+def semantic_candidates(resume_vector, ids, count):
+    # Positions in ids of up to count jobs nearest the resume, from a quantized scan of
+    # their stored embeddings with exact rescoring; empty unless quantization is enabled.
+    # Rows are looked up by id only, so callers rescore the result with semantic_scores
+    if not quantized_search_enabled() or not len(ids) or count <= 0:
+        return np.empty(0, dtype=np.int64)
+    rows = job_embedding_store.lookup(ids)
+    stored = np.flatnonzero(rows >= 0)
+    if not len(stored):
+        return np.empty(0, dtype=np.int64)
+    index, matrix = job_quantized_index()
+    found, _ = index.search(resume_vector, count, matrix, positions=rows[stored])
+    at = dict(zip(rows[stored].tolist(), stored.tolist()))
+    return np.fromiter((at[int(row)] for row in found), dtype=np.int64, count=len(found))
+
+def semantic_scores(resume_text, jobs, resume_vector=None):
+    # Cosine similarity of the resume to each job, or None without a semantic encoder;
+    # pass resume_vector (e.g. from ResumeEmbeddingService) to skip encoding the resume
+    if resume_vector is None:
+        encoded = encode_texts([resume_text])
+        if encoded is None:
+            return None
+        resume_vector = encoded[0]
+    if not jobs:
+        return np.empty(0, dtype=np.float32)
+    job_vectors = job_embeddings(jobs)
+    return None if job_vectors is None else job_vectors @ resume_vector
+
+def match_explanation(percent):
+    if percent > 80:
+        return "Excellent match: Your skills and experience closely align with the job requirements."
+    elif percent > 60:
+        return "Good match: You meet most requirements, but could improve by adding more relevant skills or experience."
+    elif percent > 40:
+        return "Partial match: Some important skills or experience are missing."
+    return "Low match: Resume and job description have little overlap. Consider tailoring your resume."
 
 def extract_required_skills(job_description, common_skills):
     # Simple extraction: match common skills in job description
@@ -15,49 +185,81 @@ def skill_gap(user_skills, required_skills):
     # Return skills required by job but missing in user
     return [skill for skill in required_skills if skill not in user_skills]
 
-def match_jobs(user_skills, jobs, common_skills=None):
+def _skill_set(skills):
+    return skills if isinstance(skills, (set, frozenset)) else set(skills)
+
+def job_required_skills(job, common_skills=None, required=None):
+    # A job's required skills: required[job.id] if precomputed (a set or a skill_registry
+    # mask), else substring matches of common_skills, else the registry's mask of the description
+    if required is not None and job.id in required:
+        return required[job.id]
+    if common_skills:
+        return set(extract_required_skills(job.description, common_skills))
+    return skill_registry.extract(job.description)
+
+def match_jobs(user_skills, jobs, common_skills=None, required=None):
     # Rank jobs by number of matching skills
-    ranked = []
+    return [job for job, score in sorted(scored_jobs(user_skills, jobs, common_skills, required),
+                                         key=lambda x: x[1], reverse=True)]
+
+def scored_jobs(user_skills, jobs, common_skills=None, required=None):
+    # Lazily yield (job, matching skill count); jobs may be any iterable, e.g. a query, and
+    # required maps job ids to precomputed skill sets or masks (see job_required_skills)
+    user_skills = _skill_set(user_skills)
+    user_mask = skill_registry.encode(user_skills)
     for job in jobs:
-        required = extract_required_skills(job.description, common_skills) if common_skills else []
-        score = len(set(user_skills).intersection(set(required)))
-        ranked.append((job, score))
-    ranked.sort(key=lambda x: x[1], reverse=True)
-    return [job for job, score in ranked]
+        needed = job_required_skills(job, common_skills, required)
+        yield job, (user_mask & needed).bit_count() if isinstance(needed, int) else len(user_skills.intersection(needed))
 
-def rank_applicants(applicants, job, common_skills):
+def top_k_jobs(user_skills, jobs, k, common_skills=None, required=None):
+    # The k best (job, score) pairs in O(n log k) time and O(k) memory; ties keep input order
+    return heapq.nlargest(k, scored_jobs(user_skills, jobs, common_skills, required), key=lambda x: x[1])
+
+def rank_applicants(applicants, job, common_skills=None, required=None):
     # Rank applicants by skill match to job requirements
-    required = extract_required_skills(job.description, common_skills)
-    ranked = []
+    return sorted(scored_applicants(applicants, job, common_skills, required), key=lambda x: x[1], reverse=True)
+
+def scored_applicants(applicants, job, common_skills=None, required=None):
+    # Lazily yield (applicant, matching skill count); pass `required` (a set or a
+    # skill_registry mask) to reuse the job's skills, and sets as applicant['skills']
+    # (or a mask as applicant['skill_mask']) to skip conversions
+    if required is None:
+        required = job_required_skills(job, common_skills)
     for app in applicants:
-        user_skills = app['skills']
-        score = len(set(user_skills).intersection(set(required)))
-        ranked.append((app, score))
-    ranked.sort(key=lambda x: x[1], reverse=True)
-    return ranked
-
-def match_jobs_advanced(resume_text, jobs):
-    # Use semantic similarity if available, else fallback to cosine similarity
+        if isinstance(required, int):
+            user_mask = app['skill_mask'] if 'skill_mask' in app else skill_registry.encode(app['skills'])
+            yield app, (user_mask & required).bit_count()
+        else:
+            yield app, len(required.intersection(app['skills']))
+
+def top_k_applicants(applicants, job, k, common_skills=None, required=None):
+    # The k best (applicant, score) pairs, streaming applicants (e.g. from a query iterator)
+    return heapq.nlargest(k, scored_applicants(applicants, job, common_skills, required), key=lambda x: x[1])
+
+@timed('match_jobs_advanced')
+def match_jobs_advanced(resume_text, jobs, top_k=None, resume_vector=None):
+    # Use semantic similarity if available, else fallback to cosine similarity.
+    # With top_k, only the best top_k matches are returned; a cached resume_vector
+    # saves encoding the resume again.
     results = []
-    if st_model:
-        resume_emb = st_model.encode(resume_text, convert_to_tensor=True)
-        for job in jobs:
-            job_emb = st_model.encode(job.description, convert_to_tensor=True)
-            score = float(util.pytorch_cos_sim(resume_emb, job_emb).item())
-            percent = int(score * 100)
-            explanation = ""
-            if percent > 80:
-                explanation = "Excellent match: Your skills and experience closely align with the job requirements."
-            elif percent > 60:
-                explanation = "Good match: You meet most requirements, but could improve by adding more relevant skills or experience."
-            elif percent > 40:
-                explanation = "Partial match: Some important skills or experience are missing."
-            else:
-                explanation = "Low match: Resume and job description have little overlap. Consider tailoring your resume."
+    if not jobs:
+        resume_emb = None
+    elif resume_vector is not None:
+        resume_emb = resume_vector
+    else:
+        encoded = encode_texts([resume_text])
+        resume_emb = None if encoded is None else encoded[0]
+    job_vectors = None
+    if resume_emb is not None:
+        job_vectors = job_embeddings(jobs)
+    if job_vectors is not None:
+        # Cosine similarity of normalized vectors is a dot product
+        for job, score in zip(jobs, job_vectors @ resume_emb):
+            percent = int(float(score) * 100)
             results.append({
                 'job': job,
                 'score': percent,
-                'explanation': explanation
+                'explanation': match_explanation(percent)
             })
     else:
         texts = [resume_text] + [job.description for job in jobs]
@@ -68,19 +270,10 @@ def match_jobs_advanced(resume_text, jobs):
             job_vec = vectors[i+1]
             score = cosine_similarity([resume_vec], [job_vec])[0][0]
             percent = int(score * 100)
-            explanation = ""
-            if percent > 80:
-                explanation = "Excellent match: Your skills and experience closely align with the job requirements."
-            elif percent > 60:
-                explanation = "Good match: You meet most requirements, but could improve by adding more relevant skills or experience."
-            elif percent > 40:
-                explanation = "Partial match: Some important skills or experience are missing."
-            else:
-                explanation = "Low match: Resume and job description have little overlap. Consider tailoring your resume."
             results.append({
                 'job': job,
                 'score': percent,
-                'explanation': explanation
+                'explanation': match_explanation(percent)
             })
     results.sort(key=lambda x: x['score'], reverse=True)
-    return results
+    return results[:top_k] if top_k else results
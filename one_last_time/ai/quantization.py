@@ -0,0 +1,101 @@
+"""Compact embedding codes for a fast first-stage similarity scan.
+
+binary: one sign bit per dimension packed into uint64 words; candidates are
+        ranked by Hamming distance, which tracks angular distance. Codes are
+        kept word-major (words, n) so each XOR/popcount pass is one
+        contiguous vector operation over all rows.
+
+The stage only picks candidates. QuantizedIndex.search rescores them with
+the full-precision vectors, so the final ranking is exact within the
+candidate set and recall depends only on the oversampling factor.
+
+There is no int8 mode: NumPy has no BLAS kernel for int8 dot products, so an
+int8 scan converts every code to float per query and ran slower than exact
+float32 scoring (benchmarks/bench_quantization.py).
+"""
+import numpy as np
+
+if hasattr(np, 'bitwise_count'):
+    word_popcount = np.bitwise_count
+else:
+    _BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def word_popcount(words):
+        # Set bits of each uint64 element
+        words = np.ascontiguousarray(words, dtype=np.uint64)
+        return _BYTE_POPCOUNT[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+def popcount(words):
+    """Set bits per row of a (..., words) uint64 array"""
+    return word_popcount(words).sum(axis=-1, dtype=np.int64)
+
+def binary_codes(vectors):
+    """Sign bits packed into (n, ceil(d / 64)) uint64 words"""
+    bits = np.packbits(np.asarray(vectors) > 0, axis=1)
+    pad = (-bits.shape[1]) % 8
+    if pad:
+        bits = np.pad(bits, ((0, 0), (0, pad)))
+    return np.ascontiguousarray(bits).view(np.uint64)
+
+def hamming_distances(columns, query_code):
+    """Hamming distance of word-major (words, n) codes to one (words,) query code"""
+    distances = np.zeros(columns.shape[1], dtype=np.uint16)
+    for column, word in zip(columns, query_code):
+        distances += word_popcount(column ^ word)
+    return distances
+
+def top_k_indices(scores, k, largest=True):
+    """Indices of the k best scores, best first (argpartition, then sort only those k)"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    keyed = -scores if largest else scores
+    candidates = np.argpartition(keyed, k - 1)[:k]
+    return candidates[np.argsort(keyed[candidates], kind='stable')]
+
+class QuantizedIndex:
+    """First-stage codes for the rows of an embedding matrix, grown as rows are appended"""
+
+    MODES = ('binary',)
+
+    def __init__(self, mode='binary', oversample=40):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown quantization mode {mode!r}; use one of {self.MODES}")
+        self.mode = mode
+        self.oversample = oversample
+        self.generation = None  # store generation the codes were built from
+        self.rows = 0
+        self.codes = None
+
+    def extend(self, vectors):
+        """Quantize and append rows (e.g. the tail of an embedding store)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(vectors):
+            return
+        codes = np.ascontiguousarray(binary_codes(vectors).T)
+        self.codes = codes if self.codes is None else np.concatenate([self.codes, codes], axis=1)
+        self.rows += len(vectors)
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes if self.codes is not None else 0
+
+    def candidates(self, query, count, positions=None):
+        """Row numbers of the `count` most similar rows by the approximate score"""
+        if self.codes is None:
+            return np.empty(0, dtype=np.int64)
+        codes = self.codes if positions is None else self.codes[:, positions]
+        scores = hamming_distances(codes, binary_codes(query[None, :])[0])
+        order = top_k_indices(scores, count, largest=False)
+        return order if positions is None else np.asarray(positions, dtype=np.int64)[order]
+
+    def search(self, query, k, vectors, positions=None):
+        """(rows, exact scores) of the top k, rescoring oversampled candidates with `vectors` (float rows by number)"""
+        query = np.asarray(query, dtype=np.float32)
+        rows = self.candidates(query, k * self.oversample, positions)
+        if not len(rows):
+            return rows, np.empty(0, dtype=np.float32)
+        rows = np.sort(rows)  # ascending reads are friendlier to a memory-mapped matrix
+        exact = np.asarray(vectors[rows], dtype=np.float32) @ query
+        best = top_k_indices(exact, k)
+        return rows[best], exact[best]
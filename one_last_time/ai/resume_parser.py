@@ -3,6 +3,8 @@ import os
 from pdfminer.high_level import extract_text as extract_pdf_text
 from docx import Document
 import re
+from instrumentation import timed
+from ai.skill_registry import skill_registry
 try:
     import textract
 except ImportError:
@@ -11,12 +13,8 @@ except ImportError:
 # Load spaCy English model
 nlp = spacy.load('en_core_web_sm')
 
-# Example list of common skills (expand as needed)
-COMMON_SKILLS = [
-    'python', 'java', 'c++', 'machine learning', 'data analysis', 'sql', 'excel', 'communication',
-    'project management', 'deep learning', 'nlp', 'cloud', 'aws', 'azure', 'javascript', 'html', 'css',
-    'leadership', 'teamwork', 'problem solving', 'pandas', 'numpy', 'tensorflow', 'keras', 'pytorch'
-]
+# Canonical skills of the shared registry (see ai/skill_registry.py)
+COMMON_SKILLS = skill_registry.skills
 SOFT_SKILLS = [
     'communication', 'leadership', 'teamwork', 'problem solving', 'adaptability', 'creativity',
     'work ethic', 'time management', 'critical thinking', 'collaboration', 'initiative', 'empathy'
@@ -52,6 +50,7 @@ ATS_SECTIONS = [
 
 # Helper to extract text from file
 
+@timed('extract_text')
 def extract_text(file_path):
     file_ext = os.path.splitext(file_path)[1].lower()
     if file_ext == '.pdf':
@@ -146,14 +145,12 @@ def infer_personality_and_domain(text, skills, experience, education):
         ideal_roles.append('Generalist/Entry-level roles')
     return personality, domain, ideal_roles
 
+@timed('parse_resume')
 def parse_resume(file_path):
     text = extract_text(file_path)
     doc = nlp(text.lower())
-    # Extract skills
-    skills = set()
-    for token in doc:
-        if token.text in COMMON_SKILLS:
-            skills.add(token.text)
+    # Extract skills (aliases resolved, multi-word skills included)
+    skills = skill_registry.extract_skills(text)
     # Extract education
     education = [sent.text for sent in doc.sents if any(k in sent.text for k in EDU_KEYWORDS)]
     # Extract experience
@@ -275,5 +272,6 @@ def parse_resume(file_path):
         'chart_data': chart_data,
         'feedback': feedback,
         'career_counseling': career_counseling,
-        'career_plan': career_plan
+        'career_plan': career_plan,
+        'text': text
     }
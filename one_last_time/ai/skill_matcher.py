@@ -0,0 +1,109 @@
+from collections import namedtuple
+from functools import lru_cache
+
+# Result of scoring one user against one job
+SkillMatch = namedtuple('SkillMatch', ['match_percentage', 'matching_skills', 'missing_skills', 'required_skills'])
+
+class SkillVocabulary:
+    """Maps each skill of a fixed vocabulary to a bit position"""
+
+    def __init__(self, skills):
+        self.skills = list(dict.fromkeys(skill.lower() for skill in skills))
+        self.index = {skill: bit for bit, skill in enumerate(self.skills)}
+        self._decoded = {}
+
+    def __len__(self):
+        return len(self.skills)
+
+    def encode(self, skills):
+        """Bitmask of the given skills; skills outside the vocabulary are ignored"""
+        mask = 0
+        for skill in skills:
+            bit = self.index.get(skill.lower())
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def decode(self, mask):
+        """Skills set in a bitmask, in vocabulary order"""
+        skills = self._decoded.get(mask)
+        if skills is None:
+            skills = tuple(skill for bit, skill in enumerate(self.skills) if mask >> bit & 1)
+            if len(self._decoded) < 65536:
+                self._decoded[mask] = skills
+        return list(skills)
+
+    def signature(self):
+        """Text that changes whenever the vocabulary (and so any job mask) changes"""
+        return '\n'.join(self.skills)
+
+    def extract(self, text):
+        """Bitmask of vocabulary skills mentioned in free text (substring match)"""
+        text = (text or '').lower()
+        mask = 0
+        for bit, skill in enumerate(self.skills):
+            if skill in text:
+                mask |= 1 << bit
+        return mask
+
+class SkillMatcher:
+    """One scoring engine for every "matching / required skills" view.
+
+    Jobs and users are reduced to integer bitmasks over a shared vocabulary,
+    so scoring a row is an AND, an AND-NOT and two popcounts.
+    """
+
+    def __init__(self, skills, cache_size=16384):
+        self.vocabulary = skills if isinstance(skills, SkillVocabulary) else SkillVocabulary(skills)
+        self.job_mask_for_text = lru_cache(maxsize=cache_size)(self.vocabulary.extract)
+
+    def user_mask(self, user_skills):
+        return self.vocabulary.encode(user_skills or [])
+
+    def job_mask(self, job):
+        return self.job_mask_for_text(job.description or '')
+
+    def score_masks(self, user_mask, job_masks):
+        """Yield (percentage, matching_mask, missing_mask) for each job mask"""
+        for job_mask in job_masks:
+            required = job_mask.bit_count()
+            matching = user_mask & job_mask
+            percentage = matching.bit_count() / required * 100 if required else 0
+            yield percentage, matching, job_mask & ~user_mask
+
+    def _result(self, percentage, matching, missing, required):
+        decode = self.vocabulary.decode
+        return SkillMatch(percentage, decode(matching), decode(missing), decode(required))
+
+    def match(self, user_skills, job):
+        """Score one user against one job"""
+        return self.match_user_to_jobs(user_skills, [job])[0]
+
+    def match_user_to_jobs(self, user_skills, jobs):
+        """Score one user against many jobs; results are aligned with jobs"""
+        user_mask = self.user_mask(user_skills)
+        job_masks = [self.job_mask(job) for job in jobs]
+        return [
+            self._result(percentage, matching, missing, job_mask)
+            for job_mask, (percentage, matching, missing) in zip(job_masks, self.score_masks(user_mask, job_masks))
+        ]
+
+    def match_job_to_users(self, job, user_skill_lists):
+        """Score many users (lists of skills) against one job; results are aligned with the input"""
+        job_mask = self.job_mask(job)
+        required = job_mask.bit_count()
+        results = []
+        for user_skills in user_skill_lists:
+            user_mask = self.user_mask(user_skills)
+            matching = user_mask & job_mask
+            percentage = matching.bit_count() / required * 100 if required else 0
+            results.append(self._result(percentage, matching, job_mask & ~user_mask, job_mask))
+        return results
+
+    def missing_across_jobs(self, user_skills, jobs):
+        """Union of required-but-missing skills over many jobs"""
+        user_mask = self.user_mask(user_skills)
+        missing = 0
+        for job in jobs:
+            missing |= self.job_mask(job) & ~user_mask
+        return self.vocabulary.decode(missing)
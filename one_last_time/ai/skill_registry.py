@@ -0,0 +1,107 @@
+"""The one skill vocabulary shared by resume parsing, job matching and alerts.
+
+Each canonical skill has a stable integer id, its position in SKILLS, which
+is also its bit in SkillMatcher masks. Aliases ('nodejs', 'ml', ...) map to
+canonical skills, and every surface form is found in free text by one
+compiled, word-bounded regex. VERSION must be bumped whenever SKILLS or
+ALIASES change; SkillReindexService then re-derives the stored job and
+resume skills in resumable chunks.
+
+Ids are positions, so new skills are only ever appended.
+"""
+import re
+from ai.skill_matcher import SkillVocabulary
+
+VERSION = 1
+
+SKILLS = [
+    'python', 'java', 'c++', 'machine learning', 'data analysis', 'sql', 'excel', 'communication',
+    'project management', 'deep learning', 'nlp', 'cloud', 'aws', 'azure', 'javascript', 'html', 'css',
+    'leadership', 'teamwork', 'problem solving', 'pandas', 'numpy', 'tensorflow', 'keras', 'pytorch',
+    'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'mongodb', 'postgresql', 'mysql', 'docker',
+    'kubernetes', 'ai', 'data science', 'analytics', 'powerbi', 'tableau', 'git', 'agile', 'scrum',
+    'marketing', 'sales', 'customer service'
+]
+
+# Alternative spellings -> canonical skill
+ALIASES = {
+    'cpp': 'c++',
+    'ml': 'machine learning',
+    'dl': 'deep learning',
+    'natural language processing': 'nlp',
+    'cloud computing': 'cloud',
+    'amazon web services': 'aws',
+    'microsoft azure': 'azure',
+    'js': 'javascript',
+    'html5': 'html',
+    'css3': 'css',
+    'team work': 'teamwork',
+    'problem-solving': 'problem solving',
+    'ms excel': 'excel',
+    'microsoft excel': 'excel',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'angularjs': 'angular',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'nodejs': 'node.js',
+    'node js': 'node.js',
+    'mongo': 'mongodb',
+    'postgres': 'postgresql',
+    'k8s': 'kubernetes',
+    'artificial intelligence': 'ai',
+    'power bi': 'powerbi',
+}
+
+class SkillRegistry(SkillVocabulary):
+    """A SkillVocabulary that also resolves aliases and extracts skills on word boundaries"""
+
+    def __init__(self, skills, aliases=None, version=1):
+        super().__init__(skills)
+        self.version = version
+        self.forms = {skill: skill for skill in self.skills}  # surface form -> canonical skill
+        for alias, skill in (aliases or {}).items():
+            skill = skill.lower()
+            if skill not in self.index:
+                raise ValueError(f"Alias {alias!r} points outside the vocabulary: {skill!r}")
+            self.forms[alias.lower()] = skill
+        # Longest forms first so 'node.js' wins over a shorter overlapping form
+        alternatives = '|'.join(r'\s+'.join(map(re.escape, form.split()))
+                                for form in sorted(self.forms, key=len, reverse=True))
+        self.pattern = re.compile(r'(?<![a-z0-9])(?:' + alternatives + r')(?![a-z0-9+#])')
+
+    def canonical(self, name):
+        """Canonical skill for a skill name or alias, None if unknown"""
+        return self.forms.get(' '.join((name or '').lower().split()))
+
+    def skill_id(self, name):
+        canonical = self.canonical(name)
+        return None if canonical is None else self.index[canonical]
+
+    def normalize(self, skills):
+        """Canonical, de-duplicated skills in input order; unknown names are dropped"""
+        return [skill for skill in dict.fromkeys(self.canonical(name) for name in skills) if skill is not None]
+
+    def encode(self, skills):
+        mask = 0
+        for name in skills:
+            canonical = self.canonical(name)
+            if canonical is not None:
+                mask |= 1 << self.index[canonical]
+        return mask
+
+    def extract(self, text):
+        mask = 0
+        for found in self.pattern.finditer((text or '').lower()):
+            mask |= 1 << self.index[self.forms[' '.join(found.group().split())]]
+        return mask
+
+    def extract_skills(self, text):
+        """Canonical skills mentioned in free text, in vocabulary order"""
+        return self.decode(self.extract(text))
+
+    def signature(self):
+        aliases = '\n'.join(f'{alias}={skill}' for alias, skill in sorted(self.forms.items()))
+        return f'{self.version}\n{super().signature()}\n{aliases}'
+
+skill_registry = SkillRegistry(SKILLS, ALIASES, VERSION)
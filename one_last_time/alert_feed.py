@@ -0,0 +1,64 @@
+import threading
+import time
+
+class AlertBroker:
+    """In-process notification hub for new JobAlert rows.
+
+    JobAlertService publishes the id of every alert it creates; alert
+    streams block on a condition variable until something newer than their
+    cursor arrives, so idle clients cost no queries between heartbeats.
+    Unread counts are cached per user for a short TTL, which also bounds
+    staleness when another worker changed them.
+    """
+
+    def __init__(self, unread_ttl=30):
+        self.unread_ttl = unread_ttl
+        self._condition = threading.Condition()
+        self._latest = {}  # user_id -> newest alert id published in this process
+        self._unread = {}  # user_id -> (count, expires_at)
+
+    def publish(self, user_id, alert_id):
+        with self._condition:
+            if alert_id > self._latest.get(user_id, 0):
+                self._latest[user_id] = alert_id
+            self._unread.pop(user_id, None)
+            self._condition.notify_all()
+
+    def wait_for_alerts(self, user_id, cursor, timeout):
+        """Block until an alert newer than cursor is published or timeout expires"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._latest.get(user_id, 0) > cursor, timeout)
+
+    def get_unread_count(self, user_id, loader):
+        now = time.monotonic()
+        with self._condition:
+            cached = self._unread.get(user_id)
+            if cached and cached[1] > now:
+                return cached[0]
+        count = loader()
+        with self._condition:
+            self._unread[user_id] = (count, now + self.unread_ttl)
+        return count
+
+    def invalidate_unread(self, user_id):
+        with self._condition:
+            self._unread.pop(user_id, None)
+
+broker = AlertBroker()
+
+def serialize_alert(alert):
+    """JSON-friendly view of a JobAlert for the incremental feed"""
+    job = alert.job
+    return {
+        'id': alert.id,
+        'job_id': alert.job_id,
+        'title': job.title if job else None,
+        'company_name': job.company_name if job else None,
+        'location': job.location if job else None,
+        'job_type': job.job_type if job else None,
+        'match_percentage': alert.match_percentage or 0,
+        'match_reason': alert.match_reason,
+        'is_read': bool(alert.is_read),
+        'sent_at': alert.sent_at.isoformat() if alert.sent_at else None,
+        'sent_at_display': alert.sent_at.strftime('%b %d, %Y at %I:%M %p') if alert.sent_at else ''
+    }
@@ -1,13 +1,17 @@
 
-from flask import Flask, render_template, request, redirect, url_for, flash, session, send_from_directory, jsonify, current_app
+from flask import Flask, render_template, request, redirect, url_for, flash, session, send_from_directory, jsonify, current_app, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user, UserMixin
 import os
 import json
+import threading
+import numpy as np
 from datetime import datetime, timedelta
 from werkzeug.utils import secure_filename
-from ai.resume_parser import parse_resume, COMMON_SKILLS
-from ai.job_matcher import match_jobs, extract_required_skills, skill_gap, rank_applicants, match_jobs_advanced
+from ai.resume_parser import parse_resume
+from ai.job_matcher import match_jobs, extract_required_skills, skill_gap, rank_applicants, match_explanation
+from ai.skill_matcher import SkillMatcher
+from ai.skill_registry import skill_registry
 from ai.career_counselor import get_career_advice, advanced_career_counseling
 from werkzeug.security import generate_password_hash, check_password_hash
 
@@ -20,10 +24,13 @@ os.makedirs(instance_dir, exist_ok=True)
 
 # Use an absolute path for the SQLite DB to avoid CWD issues
 db_path = os.path.join(instance_dir, 'jobportal.db')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + db_path
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///' + db_path)
 
 # Keep uploads inside the app directory for consistent path resolution
-app.config['UPLOAD_FOLDER'] = os.path.join(app.root_path, 'uploads')
+app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER', os.path.join(app.root_path, 'uploads'))
+
+# Shared skill scoring engine for every match view
+skill_matcher = SkillMatcher(skill_registry)
 
 # Custom Jinja2 filter for JSON parsing
 @app.template_filter('from_json')
@@ -44,6 +51,157 @@ login_manager.login_view = 'login'
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Instrumentation: per-route latency, SQL per request and hot-path timers on /metrics.
+# Set PROFILE_REQUESTS=1 to dump cProfile stats for a sample of requests to PROFILE_DIR.
+app.config['PROFILE_REQUESTS'] = os.environ.get('PROFILE_REQUESTS') == '1'
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', os.path.join(instance_dir, 'profiles'))
+app.config['PROFILE_SAMPLE_RATE'] = float(os.environ.get('PROFILE_SAMPLE_RATE', '1.0'))
+
+from instrumentation import init_instrumentation
+init_instrumentation(app)
+
+# Job alert stream: heartbeat (and cross-worker re-check) interval and maximum
+# connection lifetime in seconds; EventSource reconnects with Last-Event-ID
+app.config['ALERT_STREAM_HEARTBEAT'] = int(os.environ.get('ALERT_STREAM_HEARTBEAT', '15'))
+app.config['ALERT_STREAM_LIFETIME'] = int(os.environ.get('ALERT_STREAM_LIFETIME', '300'))
+# Each open stream holds a worker thread, so only this many run per worker; further
+# clients get 204 and fall back to polling /api/job_alerts
+app.config['ALERT_STREAM_MAX_PER_WORKER'] = int(os.environ.get('ALERT_STREAM_MAX_PER_WORKER', '4'))
+alert_stream_slots = threading.BoundedSemaphore(app.config['ALERT_STREAM_MAX_PER_WORKER'])
+
+# Upper bound on job ids accepted by the batched /check_applications endpoint
+app.config['CHECK_APPLICATIONS_MAX_IDS'] = int(os.environ.get('CHECK_APPLICATIONS_MAX_IDS', '500'))
+
+# Periodic repair of the incrementally maintained EmployerStats counters (0 disables)
+app.config['STATS_RECONCILE_INTERVAL'] = int(os.environ.get('STATS_RECONCILE_INTERVAL', '3600'))
+
+from background_tasks import start_periodic_task
+from employer_stats_service import EmployerStatsService
+start_periodic_task(app, 'employer-stats-reconcile', app.config['STATS_RECONCILE_INTERVAL'],
+                    lambda: EmployerStatsService().reconcile())
+
+# Materialized admin statistics: snapshots older than ADMIN_STATS_MAX_AGE seconds are
+# recomputed on read, and a background task refreshes them every ADMIN_STATS_REFRESH_INTERVAL
+app.config['ADMIN_STATS_MAX_AGE'] = int(os.environ.get('ADMIN_STATS_MAX_AGE', '900'))
+app.config['ADMIN_STATS_REFRESH_INTERVAL'] = int(os.environ.get('ADMIN_STATS_REFRESH_INTERVAL', '300'))
+
+from admin_stats_service import AdminStatsService
+start_periodic_task(app, 'admin-stats-refresh', app.config['ADMIN_STATS_REFRESH_INTERVAL'],
+                    lambda: AdminStatsService().refresh())
+
+# Query result cache for job listings. QUERY_CACHE_BACKEND is sqlite (shared by the
+# workers on this host, the default), redis (QUERY_CACHE_REDIS_URL) or memory (per
+# worker, only safe with a single worker); entries are dropped by tag when jobs or
+# applications are written.
+app.config['QUERY_CACHE_BACKEND'] = os.environ.get('QUERY_CACHE_BACKEND', 'sqlite')
+app.config['QUERY_CACHE_PATH'] = os.environ.get('QUERY_CACHE_PATH', os.path.join(instance_dir, 'query_cache.db'))
+app.config['QUERY_CACHE_REDIS_URL'] = os.environ.get('QUERY_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+app.config['QUERY_CACHE_TTL'] = int(os.environ.get('QUERY_CACHE_TTL', '300'))
+app.config['QUERY_CACHE_ENABLED'] = os.environ.get('QUERY_CACHE_ENABLED', '1') == '1'
+
+from query_cache import init_query_cache
+query_cache = init_query_cache(app)
+
+# Per-worker columnar snapshot of the active jobs used by the match and filter
+# views; the catalog version is re-checked at most every JOB_CATALOG_CHECK_INTERVAL seconds.
+# Large derived matrices are published once per node under SHARED_STORE_DIR and mmap'd by every worker.
+app.config['JOB_CATALOG_CHECK_INTERVAL'] = float(os.environ.get('JOB_CATALOG_CHECK_INTERVAL', '1.0'))
+app.config['SHARED_STORE_DIR'] = os.environ.get('SHARED_STORE_DIR', os.path.join(instance_dir, 'shared'))
+
+from shared_store import SharedArrayStore
+from job_catalog import job_catalog
+shared_store = SharedArrayStore(app.config['SHARED_STORE_DIR'])
+job_catalog.check_interval = app.config['JOB_CATALOG_CHECK_INTERVAL']
+job_catalog.store = shared_store
+job_catalog.register_matcher('resume', skill_matcher)
+
+# On-disk job embeddings for semantic matching: workers map the file instead of
+# re-encoding the catalog; post_job appends and a periodic pass compacts away
+# inactive or superseded rows (EMBEDDING_STORE_DTYPE may be float16 to halve the file)
+app.config['EMBEDDING_STORE_DIR'] = os.environ.get('EMBEDDING_STORE_DIR', os.path.join(instance_dir, 'embeddings', 'jobs'))
+app.config['EMBEDDING_STORE_DTYPE'] = os.environ.get('EMBEDDING_STORE_DTYPE', 'float32')
+app.config['EMBEDDING_COMPACT_INTERVAL'] = int(os.environ.get('EMBEDDING_COMPACT_INTERVAL', '86400'))
+
+# Opt-in: with SEMANTIC_QUANTIZATION='binary', hybrid ranking also scans sign-bit codes of
+# every job embedding and adds the HYBRID_SEMANTIC_CANDIDATES nearest jobs (SEMANTIC_OVERSAMPLE
+# times as many rescored exactly) to the skill candidates. The scan is lossy (recall@10 is
+# about 0.64), so the default '' scores the skill candidates exactly and skips it
+app.config['SEMANTIC_QUANTIZATION'] = os.environ.get('SEMANTIC_QUANTIZATION', '')
+app.config['SEMANTIC_OVERSAMPLE'] = int(os.environ.get('SEMANTIC_OVERSAMPLE', '40'))
+app.config['HYBRID_SEMANTIC_CANDIDATES'] = int(os.environ.get('HYBRID_SEMANTIC_CANDIDATES', '50'))
+
+# Inference backend for the embedding model: sentence-transformers (PyTorch) or onnx,
+# which runs the model exported to EMBEDDING_MODEL_DIR under ONNX Runtime
+# (python -m ai.inference_backends export); EMBEDDING_ONNX_QUANTIZED=1 uses its int8 weights
+app.config['EMBEDDING_BACKEND'] = os.environ.get('EMBEDDING_BACKEND', 'sentence-transformers')
+app.config['EMBEDDING_MODEL_DIR'] = os.environ.get('EMBEDDING_MODEL_DIR', os.path.join(instance_dir, 'models', 'minilm'))
+app.config['EMBEDDING_ONNX_QUANTIZED'] = os.environ.get('EMBEDDING_ONNX_QUANTIZED', '0') == '1'
+app.config['EMBEDDING_THREADS'] = int(os.environ.get('EMBEDDING_THREADS', '0'))
+
+# With EMBEDDING_SERVICE_SOCKET set, workers encode through the shared embedding service
+# (python -m ai.embedding_service) instead of each loading a model copy; while the
+# service is unreachable, matching falls back to CountVectorizer scores
+app.config['EMBEDDING_SERVICE_SOCKET'] = os.environ.get('EMBEDDING_SERVICE_SOCKET', '')
+app.config['EMBEDDING_SERVICE_TIMEOUT'] = float(os.environ.get('EMBEDDING_SERVICE_TIMEOUT', '5.0'))
+
+from ai.job_matcher import (configure_inference_backend, configure_embedding_service,
+                             init_job_embedding_store, job_embeddings)
+configure_inference_backend(app.config['EMBEDDING_BACKEND'], app.config['EMBEDDING_MODEL_DIR'],
+                            app.config['EMBEDDING_ONNX_QUANTIZED'], app.config['EMBEDDING_THREADS'])
+configure_embedding_service(app.config['EMBEDDING_SERVICE_SOCKET'], app.config['EMBEDDING_SERVICE_TIMEOUT'])
+job_embedding_store = init_job_embedding_store(app.config['EMBEDDING_STORE_DIR'], app.config['EMBEDDING_STORE_DTYPE'],
+                                               app.config['SEMANTIC_QUANTIZATION'], app.config['SEMANTIC_OVERSAMPLE'])
+if job_embedding_store is not None:
+    start_periodic_task(app, 'embedding-compact', app.config['EMBEDDING_COMPACT_INTERVAL'],
+                        lambda: job_embedding_store.compact(
+                            keep_ids=[job_id for (job_id,) in db.session.query(Job.id).filter(Job.is_active == True)],
+                            min_dead_ratio=0.2))
+
+# Materialized top-RECOMMENDATIONS_TOP_N job recommendations per student, ranked in two
+# stages: the skill index keeps the best HYBRID_CANDIDATES jobs and only those are scored
+# semantically, weighted by HYBRID_SEMANTIC_WEIGHT. Lists are updated when a job is posted
+# or a resume uploaded; a periodic pass evicts inactive or expired jobs and refills them.
+app.config['RECOMMENDATIONS_TOP_N'] = int(os.environ.get('RECOMMENDATIONS_TOP_N', '50'))
+app.config['RECOMMENDATIONS_MAINTAIN_INTERVAL'] = int(os.environ.get('RECOMMENDATIONS_MAINTAIN_INTERVAL', '600'))
+app.config['HYBRID_CANDIDATES'] = int(os.environ.get('HYBRID_CANDIDATES', '300'))
+app.config['HYBRID_SEMANTIC_WEIGHT'] = float(os.environ.get('HYBRID_SEMANTIC_WEIGHT', '0.5'))
+
+from resume_embedding_service import resume_text_hash
+
+# Applicant score breakdowns are stored on Application; those flagged stale by a
+# job description or resume change are recomputed every APPLICATION_RESCORE_INTERVAL seconds
+app.config['APPLICATION_RESCORE_INTERVAL'] = int(os.environ.get('APPLICATION_RESCORE_INTERVAL', '60'))
+
+from applicant_scoring_service import ApplicantScoringService
+start_periodic_task(app, 'application-rescore', app.config['APPLICATION_RESCORE_INTERVAL'],
+                    lambda: ApplicantScoringService().rescore_stale())
+from recommendation_service import RecommendationService
+from saved_search_service import SavedSearchService
+start_periodic_task(app, 'recommendations-maintain', app.config['RECOMMENDATIONS_MAINTAIN_INTERVAL'],
+                    lambda: RecommendationService().maintain())
+
+# Skill demand (active jobs, recent postings, median salary per skill) is kept current as
+# jobs change; this pass ages postings out of the recent window (0 disables)
+app.config['SKILL_DEMAND_REFRESH_INTERVAL'] = int(os.environ.get('SKILL_DEMAND_REFRESH_INTERVAL', '3600'))
+
+from skill_demand_service import SkillDemandService
+start_periodic_task(app, 'skill-demand-refresh', app.config['SKILL_DEMAND_REFRESH_INTERVAL'],
+                    lambda: SkillDemandService().refresh())
+
+# After a skill registry VERSION bump, stored job and resume skills are re-derived in
+# chunks of SKILL_REINDEX_CHUNK rows, at most SKILL_REINDEX_MAX_CHUNKS per pass; progress
+# is kept in SkillIndexState, so a restart resumes the re-index. A file lock next to the
+# shared arrays keeps the workers from re-indexing at the same time
+app.config['SKILL_REINDEX_INTERVAL'] = int(os.environ.get('SKILL_REINDEX_INTERVAL', '60'))
+app.config['SKILL_REINDEX_CHUNK'] = int(os.environ.get('SKILL_REINDEX_CHUNK', '200'))
+app.config['SKILL_REINDEX_MAX_CHUNKS'] = int(os.environ.get('SKILL_REINDEX_MAX_CHUNKS', '10'))
+
+from skill_reindex_service import SkillReindexService
+start_periodic_task(app, 'skill-reindex', app.config['SKILL_REINDEX_INTERVAL'],
+                    lambda: SkillReindexService().run(app.config['SKILL_REINDEX_CHUNK'],
+                                                      app.config['SKILL_REINDEX_MAX_CHUNKS'],
+                                                      os.path.join(app.config['SHARED_STORE_DIR'], 'skill-reindex.lock')))
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -142,37 +300,32 @@ def dashboard():
     if current_user.user_type == 'student':
         return redirect(url_for('student_dashboard'))
     elif current_user.user_type == 'employer':
-        # Get employer statistics
-        from models import EmployerStats, JobView
-        
-        # Get or create employer stats
-        employer_stats = EmployerStats.query.filter_by(employer_id=current_user.id).first()
-        if not employer_stats:
-            employer_stats = EmployerStats(employer_id=current_user.id)
-            db.session.add(employer_stats)
-            db.session.commit()
+        # Counters are maintained incrementally (see models.py), so this is a read
+        from models import JobView
+        employer_stats = EmployerStatsService().get_stats(current_user.id)
         
-        # Calculate recent statistics
-        recent_job_views = len([view for view in current_user.job_views 
-                               if view.view_time > datetime.utcnow() - timedelta(days=7)])
-        
-        # Get total applications for employer's jobs
-        total_applications = sum(len(job.applications) for job in current_user.jobs)
-        recent_applications = sum(len([app for app in job.applications 
-                                     if app.applied_at and app.applied_at > datetime.utcnow() - timedelta(days=30)])
-                                for job in current_user.jobs)
-        
-        # Update employer stats
-        employer_stats.total_applications_received = total_applications
-        employer_stats.total_job_views = sum(job.views for job in current_user.jobs)
-        employer_stats.last_updated = datetime.utcnow()
-        db.session.commit()
+        # Recent activity on this employer's jobs
+        recent_job_views = db.session.query(db.func.count(JobView.id)).join(
+            Job, JobView.job_id == Job.id
+        ).filter(
+            Job.employer_id == current_user.id,
+            JobView.view_time > datetime.utcnow() - timedelta(days=7)
+        ).scalar()
+        recent_applications = db.session.query(db.func.count(Application.id)).join(
+            Job, Application.job_id == Job.id
+        ).filter(
+            Job.employer_id == current_user.id,
+            Application.applied_at > datetime.utcnow() - timedelta(days=30)
+        ).scalar()
+        active_jobs = Job.query.filter_by(employer_id=current_user.id).count()
+        total_applications = employer_stats.total_applications_received
         
         return render_template('dashboard.html',
                              employer_stats=employer_stats,
                              recent_job_views=recent_job_views,
                              recent_applications=recent_applications,
-                             total_applications=total_applications)
+                             total_applications=total_applications,
+                             active_jobs=active_jobs)
     return redirect(url_for('index'))
 
 @app.route('/student_dashboard')
@@ -313,6 +466,8 @@ def analytics_dashboard():
         days=days
     )
 
+from job_queries import get_job_detail, employer_job_previews
+
 @app.route('/upload_resume', methods=['GET', 'POST'])
 @login_required
 def upload_resume():
@@ -320,6 +475,7 @@ def upload_resume():
     job_matches = []
     job_gaps = []
     resume_text = None
+    text_hash = None
     ats = []
     skill_buckets = {}
     chart_data = {}
@@ -343,32 +499,55 @@ def upload_resume():
                 if ats_sections:
                     ats_score = int(100 * sum(1 for s in ats_sections if s['present']) / len(ats_sections))
             
+            resume_text = feedback['text']
+            text_hash = resume_text_hash(resume_text) if resume_text else None
+            ApplicantScoringService().mark_user_stale(current_user.id)
             resume_upload = ResumeUpload(
                 user_id=current_user.id,
                 filename=filename,
                 file_size=file_size,
-                ats_score=ats_score
+                ats_score=ats_score,
+                text_hash=text_hash
             )
             db.session.add(resume_upload)
             db.session.commit()
-            
-            resume_text = open(filepath, encoding='utf-8', errors='ignore').read()
     elif current_user.resume:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], current_user.resume)
-        feedback = parse_resume(filepath)
-        resume_text = open(filepath, encoding='utf-8', errors='ignore').read()
-    jobs = Job.query.all()
+        upload = current_resume_upload(current_user)
+        feedback = resume_feedback(current_user, upload)
+        resume_text = feedback['text']
+        text_hash = upload.text_hash if upload else None
+    catalog = job_catalog.snapshot()
+    jobs = catalog.rows
     if feedback:
         ats = feedback.get('ats', [])
         skill_buckets = feedback.get('skill_buckets', {})
         chart_data = feedback.get('chart_data', {})
-        for job in jobs:
-            required = extract_required_skills(job.description, COMMON_SKILLS)
-            gaps = skill_gap(feedback['skills'], required)
-            job_gaps.append({'job': job, 'missing': gaps, 'required': required})
-        job_matches = match_jobs_advanced(resume_text, jobs) if resume_text else []
+        for index, job in enumerate(jobs):
+            match = catalog.skill_match('resume', feedback['skills'], index)
+            job_gaps.append({'job': job, 'missing': match.missing_skills, 'required': match.required_skills})
+        if resume_text:
+            # Stored list; rebuilt only when the resume text changed
+            for rec, job in RecommendationService().current_recommendations(current_user.id, feedback['skills'], resume_text,
+                                                                             text_hash=text_hash):
+                percent = int(rec.semantic_score * 100) if rec.semantic_score is not None else int(rec.match_percentage)
+                job_matches.append({'job': job, 'score': percent, 'explanation': match_explanation(percent)})
     return render_template('upload_resume.html', feedback=feedback, job_gaps=job_gaps, job_matches=job_matches, ats=ats, skill_buckets=skill_buckets, chart_data=chart_data)
 
+def current_resume_upload(user):
+    # The upload record of the student's current resume file; None for files uploaded before uploads were tracked
+    from models import ResumeUpload
+    upload = ResumeUpload.query.filter_by(user_id=user.id).order_by(ResumeUpload.id.desc()).first()
+    return upload if upload is not None and upload.filename == user.resume else None
+
+def resume_feedback(user, upload=None):
+    # parse_resume() of the student's current resume, cached under the text hash of its upload
+    # (and the skill vocabulary version) so page views don't re-parse an unchanged file
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], user.resume)
+    if upload is None or not upload.text_hash:
+        return parse_resume(filepath)
+    return query_cache.get_or_set('resume_feedback', {'text_hash': upload.text_hash, 'skills': skill_registry.version},
+                                  lambda: parse_resume(filepath), tags=('resumes',))
+
 @app.route('/jobs', methods=['GET'])
 @login_required
 def jobs():
@@ -376,34 +555,46 @@ def jobs():
         flash('This page is only for students.')
         return redirect(url_for('dashboard'))
     
-    # Get user skills from resume
+    # Skills and recommendations come from the stored profile while it matches the text hash
+    # recorded for the current resume; the file is only parsed when it doesn't
     user_skills = []
+    recommendations = []
     if current_user.resume:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], current_user.resume)
-        feedback = parse_resume(filepath)
-        user_skills = feedback['skills']
-    
-    # Get all jobs
-    all_jobs = Job.query.all()
+        recommendation_service = RecommendationService()
+        upload = current_resume_upload(current_user)
+        stored = recommendation_service.stored(current_user.id, upload.text_hash if upload else None)
+        if stored is not None:
+            user_skills, recommendations = stored
+        else:
+            feedback = resume_feedback(current_user, upload)
+            user_skills = feedback['skills']
+            if feedback['text']:
+                recommendations = recommendation_service.current_recommendations(current_user.id, user_skills, feedback['text'])
+    
+    # The student's stored recommendations first, then the other jobs by skill match
+    catalog = job_catalog.snapshot()
+    recommended = []
+    if recommendations:
+        recommended = [catalog.position[rec.job_id] for rec, _ in recommendations if rec.job_id in catalog.position]
+    percentages = catalog.match_percentages('resume', user_skills)
+    is_recommended = np.zeros(len(catalog), dtype=bool)
+    is_recommended[recommended] = True
+    rest = np.argsort(-percentages, kind='stable')
+    order = np.concatenate([np.asarray(recommended, dtype=np.int64), rest[~is_recommended[rest]]])
     
     # Filter jobs based on skill match
     matched_jobs = []
     partial_matches = []
     no_matches = []
     
-    for job in all_jobs:
-        required_skills = extract_required_skills(job.description, COMMON_SKILLS)
-        matching_skills = [skill for skill in user_skills if skill in required_skills]
-        missing_skills = [skill for skill in required_skills if skill not in user_skills]
-        
-        # Calculate match percentage
-        match_percentage = (len(matching_skills) / len(required_skills) * 100) if required_skills else 0
-        
+    for index in order:
+        match = catalog.skill_match('resume', user_skills, index)
+        match_percentage = match.match_percentage
         job_data = {
-            'job': job,
-            'required_skills': required_skills,
-            'matching_skills': matching_skills,
-            'missing_skills': missing_skills,
+            'job': catalog.rows[index],
+            'required_skills': match.required_skills,
+            'matching_skills': match.matching_skills,
+            'missing_skills': match.missing_skills,
             'match_percentage': match_percentage
         }
         
@@ -415,16 +606,13 @@ def jobs():
         else:
             no_matches.append(job_data)
     
-    # Sort by match percentage (highest first)
-    matched_jobs.sort(key=lambda x: x['match_percentage'], reverse=True)
-    partial_matches.sort(key=lambda x: x['match_percentage'], reverse=True)
-    
     return render_template('job_list.html', 
                          matched_jobs=matched_jobs,
                          partial_matches=partial_matches,
                          no_matches=no_matches,
                          user_skills=user_skills,
-                         has_resume=bool(current_user.resume))
+                         has_resume=bool(current_user.resume),
+                         applied_job_ids=cached_applied_jobs(current_user.id))
 
 @app.route('/advanced_search', methods=['GET'])
 @login_required
@@ -445,51 +633,33 @@ def advanced_search():
     sort_by = request.args.get('sort_by', 'relevance')
     min_match = request.args.get('min_match', '0')
     
-    # Build query
-    query = Job.query.filter(Job.is_active == True)
-    
-    # Apply filters
+    # Keyword search needs the full text columns, so it stays in SQL (cached);
+    # every other filter and the sort run against the in-memory catalog
+    keyword_ids = None
     if keyword:
-        query = query.filter(
-            db.or_(
-                Job.title.ilike(f'%{keyword}%'),
-                Job.description.ilike(f'%{keyword}%'),
-                Job.company_name.ilike(f'%{keyword}%'),
-                Job.requirements.ilike(f'%{keyword}%')
+        keyword_ids = query_cache.get_or_set('search_keyword_ids', {'keyword': keyword.lower()}, lambda: [
+            job_id for (job_id,) in db.session.query(Job.id).filter(
+                Job.is_active == True,
+                db.or_(
+                    Job.title.ilike(f'%{keyword}%'),
+                    Job.description.ilike(f'%{keyword}%'),
+                    Job.company_name.ilike(f'%{keyword}%'),
+                    Job.requirements.ilike(f'%{keyword}%')
+                )
             )
-        )
-    
-    if location:
-        query = query.filter(Job.location.ilike(f'%{location}%'))
-    
-    if job_type:
-        query = query.filter(Job.job_type == job_type)
-    
-    if remote_work:
-        query = query.filter(Job.remote_work == remote_work)
-    
-    if experience_level:
-        query = query.filter(Job.experience_level == experience_level)
-    
-    if industry:
-        query = query.filter(Job.industry == industry)
-    
-    if salary_min:
-        query = query.filter(Job.salary_max >= int(salary_min))
-    
-    if salary_max:
-        query = query.filter(Job.salary_min <= int(salary_max))
-    
-    # Apply sorting
-    if sort_by == 'date':
-        query = query.order_by(Job.posted_date.desc())
-    elif sort_by == 'salary':
-        query = query.order_by(Job.salary_max.desc())
-    else:  # relevance or match
-        query = query.order_by(Job.posted_date.desc())
-    
-    # Get filtered jobs
-    filtered_jobs = query.all()
+        ])
+    
+    catalog = job_catalog.snapshot()
+    masks = catalog.filter_masks(
+        job_type=job_type,
+        remote_work=remote_work,
+        experience_level=experience_level,
+        industry=industry,
+        location=location,
+        salary_min=int(salary_min) if salary_min else None,
+        salary_max=int(salary_max) if salary_max else None,
+        ids=keyword_ids
+    )
     
     # Get user skills for matching
     user_skills = []
@@ -498,37 +668,32 @@ def advanced_search():
         feedback = parse_resume(filepath)
         user_skills = feedback['skills']
     
-    # Calculate match percentages and filter by minimum match
-    jobs_with_match = []
-    for job in filtered_jobs:
-        required_skills = extract_required_skills(job.description, COMMON_SKILLS)
-        matching_skills = [skill for skill in user_skills if skill in required_skills]
-        
-        # Calculate match percentage
-        match_percentage = (len(matching_skills) / len(required_skills) * 100) if required_skills else 0
-        
-        # Filter by minimum match if specified
-        if not min_match or match_percentage >= int(min_match):
-            jobs_with_match.append({
-                'job': job,
-                'match_percentage': match_percentage,
-                'matching_skills': matching_skills,
-                'required_skills': required_skills
-            })
+    # Match percentages for the whole catalog, so the minimum match is one more filter mask
+    all_percentages = catalog.match_percentages('resume', user_skills)
+    if min_match and int(min_match):
+        masks['min_match'] = all_percentages >= int(min_match)
+    indices = np.flatnonzero(catalog.combine(masks))
+    facets = catalog.facet_counts(masks)
+    
+    # Apply sorting (the catalog is already newest first)
+    if sort_by == 'salary':
+        indices = catalog.order_by(indices, 'salary_max')
     
     # Sort by match percentage if sorting by match
     if sort_by == 'match':
-        jobs_with_match.sort(key=lambda x: x['match_percentage'], reverse=True)
+        indices = indices[np.argsort(-all_percentages[indices], kind='stable')]
     
     return render_template('advanced_job_search.html', 
-                         jobs=[item['job'] for item in jobs_with_match],
+                         jobs=[catalog.rows[index] for index in indices],
                          user_skills=user_skills,
-                         has_resume=bool(current_user.resume))
+                         has_resume=bool(current_user.resume),
+                         facets=facets,
+                         applied_job_ids=cached_applied_jobs(current_user.id))
 
 @app.route('/job/<int:job_id>')
 @login_required
 def job_details(job_id):
-    job = Job.query.get(job_id)
+    job = get_job_detail(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     
@@ -551,11 +716,8 @@ def job_details(job_id):
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], current_user.resume)
         feedback = parse_resume(filepath)
         user_skills = feedback['skills']
-    # Extract required skills from job description
-    required_skills = extract_required_skills(job.description, COMMON_SKILLS)
-    # Find matching and missing skills
-    matching_skills = [skill for skill in user_skills if skill in required_skills]
-    missing_skills = [skill for skill in required_skills if skill not in user_skills]
+    # Required, matching and missing skills for this job
+    match = skill_matcher.match(user_skills, job)
     return jsonify({
         'job': {
             'id': job.id,
@@ -573,9 +735,9 @@ def job_details(job_id):
             'benefits': job.benefits,
             'views': job.views
         },
-        'required_skills': required_skills,
-        'matching_skills': matching_skills,
-        'missing_skills': missing_skills
+        'required_skills': match.required_skills,
+        'matching_skills': match.matching_skills,
+        'missing_skills': match.missing_skills
     })
 
 @app.route('/check_application/<int:job_id>')
@@ -594,6 +756,47 @@ def check_application(job_id):
         'application_date': existing_application.applied_at.isoformat() if existing_application else None
     })
 
+def get_applied_jobs(user_id, job_ids=None):
+    """Map job id -> applied_at for the user's applications, in one query"""
+    query = db.session.query(Application.job_id, Application.applied_at).filter(Application.user_id == user_id)
+    if job_ids is not None:
+        query = query.filter(Application.job_id.in_(job_ids))
+    return {job_id: applied_at for job_id, applied_at in query}
+
+def cached_applied_jobs(user_id):
+    """get_applied_jobs for list pages, cached until the user's applications change"""
+    # A per-worker cache would keep showing "Apply" on other workers after applying
+    if not query_cache.backend.shared:
+        return get_applied_jobs(user_id)
+    return query_cache.get_or_set('applied_jobs', {'user_id': user_id},
+                                  lambda: get_applied_jobs(user_id), tags=(f'user:{user_id}',))
+
+@app.route('/check_applications', methods=['GET', 'POST'])
+@login_required
+def check_applications():
+    """Check application status for many jobs at once (?job_ids=1,2,3 or JSON body)"""
+    if request.method == 'POST':
+        raw_ids = (request.get_json(silent=True) or {}).get('job_ids', [])
+    else:
+        raw_ids = request.args.get('job_ids', '').split(',')
+    try:
+        job_ids = list(dict.fromkeys(int(job_id) for job_id in raw_ids if str(job_id).strip()))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'job_ids must be integers'}), 400
+    if len(job_ids) > app.config['CHECK_APPLICATIONS_MAX_IDS']:
+        return jsonify({'error': f"At most {app.config['CHECK_APPLICATIONS_MAX_IDS']} job ids per request"}), 400
+    
+    applied = get_applied_jobs(current_user.id, job_ids) if job_ids else {}
+    return jsonify({
+        'statuses': {
+            str(job_id): {
+                'has_applied': job_id in applied,
+                'application_date': applied[job_id].isoformat() if job_id in applied else None
+            }
+            for job_id in job_ids
+        }
+    })
+
 @app.route('/apply/<int:job_id>', methods=['POST'])
 @login_required
 def apply(job_id):
@@ -611,8 +814,13 @@ def apply(job_id):
             'application_date': existing_application.applied_at.isoformat()
         })
     
-    # Create new application
+    # Create new application with its score breakdown, so employers' rankings are a sorted read
     app_obj = Application(user_id=current_user.id, job_id=job_id)
+    try:
+        ApplicantScoringService().score(app_obj, job, current_user)
+    except Exception as e:
+        # Left unscored; the employer's next view scores it
+        print(f"Error scoring application for job {job_id}: {e}")
     db.session.add(app_obj)
     db.session.commit()
     
@@ -674,25 +882,35 @@ def post_job():
         )
         db.session.add(job)
         
-        # Update employer statistics
-        from models import EmployerStats
-        
-        employer_stats = EmployerStats.query.filter_by(employer_id=current_user.id).first()
-        if not employer_stats:
-            employer_stats = EmployerStats(employer_id=current_user.id)
-            db.session.add(employer_stats)
+        # EmployerStats counters are bumped by the Job after_insert listener
+        db.session.commit()
         
-        employer_stats.total_jobs_posted += 1
-        employer_stats.last_job_posted = datetime.utcnow()
-        employer_stats.last_updated = datetime.utcnow()
+        # Append the new job's embedding so no worker has to encode it on a match request
+        if job_embedding_store is not None:
+            try:
+                job_embeddings([job])
+            except Exception as e:
+                print(f"Error embedding job {job.id}: {e}")
         
-        db.session.commit()
+        # Insert it into the recommendation lists of the students it now ranks for
+        try:
+            RecommendationService().add_job(job)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error updating recommendations for job {job.id}: {e}")
         
         # Send job alerts to matching users
         from job_alert_service import JobAlertService
         alert_service = JobAlertService()
         alerts_sent = alert_service.check_job_matches(job)
         
+        # Percolate the job through the students' saved searches
+        try:
+            alerts_sent += SavedSearchService().percolate(job)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error matching saved searches for job {job.id}: {e}")
+        
         if alerts_sent > 0:
             flash(f'Job posted successfully! {alerts_sent} matching candidates notified.')
         else:
@@ -710,47 +928,16 @@ def applicants():
     
     jobs = Job.query.filter_by(employer_id=current_user.id).all()
     job_ids = [job.id for job in jobs]
-    applications = Application.query.filter(Application.job_id.in_(job_ids)).all()
+    scoring = ApplicantScoringService()
+    scoring.ensure_scored(job_ids)
     
-    # Enhanced applicant analysis for each job
-    job_applicants = {}
-    for job in jobs:
-        job_apps = [app for app in applications if app.job_id == job.id]
-        applicants_data = []
-        
-        for app_obj in job_apps:
-            user = User.query.get(app_obj.user_id)
-            skills = []
-            match_percentage = 0
-            matching_skills = []
-            missing_skills = []
-            
-            if user.resume:
-                filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], user.resume)
-                feedback = parse_resume(filepath)
-                skills = feedback['skills']
-                
-                # Calculate skill match for this specific job
-                required_skills = extract_required_skills(job.description, COMMON_SKILLS)
-                matching_skills = [skill for skill in skills if skill in required_skills]
-                missing_skills = [skill for skill in required_skills if skill not in skills]
-                
-                # Calculate match percentage
-                match_percentage = (len(matching_skills) / len(required_skills) * 100) if required_skills else 0
-            
-            applicants_data.append({
-                'user': user, 
-                'skills': skills, 
-                'app': app_obj,
-                'match_percentage': match_percentage,
-                'matching_skills': matching_skills,
-                'missing_skills': missing_skills,
-                'required_skills': extract_required_skills(job.description, COMMON_SKILLS)
-            })
-        
-        # Sort applicants by match percentage (highest first)
-        applicants_data.sort(key=lambda x: x['match_percentage'], reverse=True)
-        job_applicants[job.id] = applicants_data
+    # Stored breakdowns, best skill match first
+    job_applicants = {job.id: [] for job in jobs}
+    rows = db.session.query(Application, User).join(User, User.id == Application.user_id).filter(
+        Application.job_id.in_(job_ids)
+    ).order_by(Application.job_id, Application.match_percentage.desc()).all() if job_ids else []
+    for app_obj, user in rows:
+        job_applicants[app_obj.job_id].append(scoring.as_dict(app_obj, user))
     
     return render_template('applicants.html', 
                          jobs=jobs, 
@@ -769,96 +956,22 @@ def shortlist_applicants(job_id):
         flash('Job not found or access denied')
         return redirect(url_for('applicants'))
     
-    # Get all applications for this job
-    applications = Application.query.filter_by(job_id=job_id).all()
+    # Stored breakdowns ranked by the indexed overall score
+    scoring = ApplicantScoringService()
+    scoring.ensure_scored([job_id])
+    applications = db.session.query(Application, User).join(User, User.id == Application.user_id).filter(
+        Application.job_id == job_id
+    ).order_by(Application.overall_score.desc()).all()
     
-    # AI-powered shortlisting analysis
     shortlisted_applicants = []
     rejected_applicants = []
-    
-    for app_obj in applications:
-        user = User.query.get(app_obj.user_id)
-        
-        # Initialize analysis data
-        analysis = {
-            'user': user,
-            'application': app_obj,
-            'has_resume': bool(user.resume),
-            'skills': [],
-            'match_percentage': 0,
-            'ats_score': 0,
-            'experience_level': 'Unknown',
-            'shortlist_reason': '',
-            'overall_score': 0
-        }
-        
-        if user.resume:
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], user.resume)
-            feedback = parse_resume(filepath)
-            
-            # Extract skills and calculate match
-            skills = feedback['skills']
-            required_skills = extract_required_skills(job.description, COMMON_SKILLS)
-            matching_skills = [skill for skill in skills if skill in required_skills]
-            
-            # Calculate match percentage
-            match_percentage = (len(matching_skills) / len(required_skills) * 100) if required_skills else 0
-            
-            # Get ATS score
-            ats_score = 0
-            if 'ats' in feedback and feedback['ats']:
-                ats_sections = feedback['ats']
-                ats_score = int(100 * sum(1 for s in ats_sections if s['present']) / len(ats_sections)) if ats_sections else 0
-            
-            # Determine experience level based on skills and resume content
-            experience_level = 'Entry Level'
-            if len(skills) > 8:
-                experience_level = 'Senior'
-            elif len(skills) > 5:
-                experience_level = 'Mid Level'
-            
-            # Calculate overall score (weighted combination)
-            overall_score = (match_percentage * 0.6) + (ats_score * 0.3) + (len(skills) * 2)
-            
-            # Determine shortlist reason
-            shortlist_reason = []
-            if match_percentage >= 80:
-                shortlist_reason.append("Excellent skill match")
-            elif match_percentage >= 60:
-                shortlist_reason.append("Good skill match")
-            
-            if ats_score >= 80:
-                shortlist_reason.append("High ATS compatibility")
-            elif ats_score >= 60:
-                shortlist_reason.append("Good ATS compatibility")
-            
-            if len(skills) >= 8:
-                shortlist_reason.append("Strong technical background")
-            
-            analysis.update({
-                'skills': skills,
-                'match_percentage': match_percentage,
-                'ats_score': ats_score,
-                'experience_level': experience_level,
-                'shortlist_reason': ', '.join(shortlist_reason) if shortlist_reason else 'Manual review needed',
-                'overall_score': overall_score,
-                'matching_skills': matching_skills,
-                'missing_skills': [skill for skill in required_skills if skill not in skills]
-            })
-        else:
-            analysis['shortlist_reason'] = 'No resume uploaded'
-            analysis['overall_score'] = 0
-        
-        # Categorize based on overall score
-        if analysis['overall_score'] >= 70:
+    for app_obj, user in applications:
+        analysis = scoring.as_dict(app_obj, user)
+        if analysis['overall_score'] >= scoring.SHORTLIST_SCORE:
             shortlisted_applicants.append(analysis)
         else:
             rejected_applicants.append(analysis)
     
-    # Sort shortlisted applicants by overall score (highest first)
-    shortlisted_applicants.sort(key=lambda x: x['overall_score'], reverse=True)
-    rejected_applicants.sort(key=lambda x: x['overall_score'], reverse=True)
-    
     # Calculate statistics
     total_applicants = len(applications)
     shortlisted_count = len(shortlisted_applicants)
@@ -881,6 +994,7 @@ def shortlist_applicants(job_id):
 def counseling():
     advice = None
     missing_skills = []
+    skill_demand = []
     education = []
     strengths = []
     attitude = []
@@ -894,14 +1008,9 @@ def counseling():
     if current_user.resume:
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], current_user.resume)
         feedback = parse_resume(filepath)
-        # Skill gap for all jobs
-        jobs = Job.query.all()
-        all_missing = set()
-        for job in jobs:
-            required = extract_required_skills(job.description, COMMON_SKILLS)
-            gaps = skill_gap(feedback['skills'], required)
-            all_missing.update(gaps)
-        missing_skills = list(all_missing)
+        # Skills the student lacks, most demanded by active jobs first
+        skill_demand = SkillDemandService().missing_skills(feedback['skills'])
+        missing_skills = [demand.skill for demand in skill_demand]
         education = feedback['education']
         
         # Get career counseling with gap analysis
@@ -922,6 +1031,7 @@ def counseling():
     return render_template('counseling.html', 
                          advice=advice, 
                          missing_skills=missing_skills, 
+                         skill_demand=skill_demand,
                          strengths=strengths, 
                          attitude=attitude, 
                          career_advice=career_advice, 
@@ -1005,7 +1115,32 @@ def notification_settings():
     alert_service = JobAlertService()
     recent_alerts = alert_service.get_user_alerts(current_user.id, 5)
     
-    return render_template('notification_settings.html', recent_alerts=recent_alerts)
+    saved_searches = SavedSearchService().for_user(current_user.id)
+    
+    return render_template('notification_settings.html', recent_alerts=recent_alerts,
+                           saved_searches=saved_searches)
+
+@app.route('/saved_searches', methods=['POST'])
+@login_required
+def save_search():
+    """Save the current /advanced_search filters; new matching jobs raise job alerts"""
+    if current_user.user_type != 'student':
+        return jsonify({'success': False, 'message': 'Only students can save searches'}), 403
+    try:
+        search = SavedSearchService().save(current_user.id, request.form, request.form.get('name'))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Salary and match filters must be numbers'}), 400
+    return jsonify({'success': True, 'id': search.id, 'name': search.name})
+
+@app.route('/delete_saved_search/<int:search_id>')
+@login_required
+def delete_saved_search(search_id):
+    if SavedSearchService().delete(current_user.id, search_id):
+        flash('Saved search deleted.')
+    else:
+        flash('Saved search not found.')
+    
+    return redirect(request.referrer or url_for('notification_settings'))
 
 @app.route('/job_alerts')
 @login_required
@@ -1017,8 +1152,82 @@ def job_alerts():
     from job_alert_service import JobAlertService
     alert_service = JobAlertService()
     alerts = alert_service.get_user_alerts(current_user.id, 50)
+    cursor = max((alert.id for alert in alerts), default=0)
     
-    return render_template('job_alerts.html', alerts=alerts)
+    return render_template('job_alerts.html', alerts=alerts, cursor=cursor)
+
+@app.route('/api/job_alerts')
+@login_required
+def job_alerts_feed():
+    """Incremental alerts feed: only alerts newer than the client's cursor"""
+    from job_alert_service import JobAlertService
+    from alert_feed import serialize_alert
+    alert_service = JobAlertService()
+    
+    cursor = request.args.get('since', 0, type=int)
+    alerts = alert_service.get_alerts_since(current_user.id, cursor)
+    
+    return jsonify({
+        'alerts': [serialize_alert(alert) for alert in alerts],
+        'cursor': alerts[-1].id if alerts else cursor,
+        'unread_count': alert_service.get_unread_count(current_user.id)
+    })
+
+@app.route('/api/job_alerts/unread_count')
+@login_required
+def job_alerts_unread_count():
+    from job_alert_service import JobAlertService
+    return jsonify({'unread_count': JobAlertService().get_unread_count(current_user.id)})
+
+@app.route('/job_alerts/stream')
+@login_required
+def job_alerts_stream():
+    """Server-Sent Events stream pushing new alerts as they are created.
+    
+    Alerts created in this worker wake the stream immediately; the heartbeat
+    re-check picks up alerts created by other workers. When the worker's
+    stream slots are taken, 204 tells EventSource not to reconnect and the
+    page polls /api/job_alerts instead.
+    """
+    from job_alert_service import JobAlertService
+    from alert_feed import broker, serialize_alert
+    
+    if not alert_stream_slots.acquire(blocking=False):
+        return Response(status=204)
+    
+    user_id = current_user.id
+    cursor = request.headers.get('Last-Event-ID', type=int) or request.args.get('since', 0, type=int)
+    heartbeat = app.config['ALERT_STREAM_HEARTBEAT']
+    lifetime = app.config['ALERT_STREAM_LIFETIME']
+    
+    def events(cursor):
+        alert_service = JobAlertService()
+        deadline = datetime.utcnow() + timedelta(seconds=lifetime)
+        yield "retry: 2000\n\n"
+        while datetime.utcnow() < deadline:
+            alerts = alert_service.get_alerts_since(user_id, cursor)
+            if alerts:
+                unread_count = alert_service.get_unread_count(user_id)
+                for alert in alerts:
+                    payload = serialize_alert(alert)
+                    payload['unread_count'] = unread_count
+                    yield f"id: {alert.id}\nevent: alert\ndata: {json.dumps(payload)}\n\n"
+                cursor = alerts[-1].id
+            # Release the connection before sleeping so idle streams hold no DB resources
+            db.session.remove()
+            if not broker.wait_for_alerts(user_id, cursor, heartbeat):
+                yield ": keepalive\n\n"
+    
+    response = Response(stream_with_context(events(cursor)), mimetype='text/event-stream')
+    released = []
+    def release_slot():
+        if not released:
+            released.append(True)
+            alert_stream_slots.release()
+    response.call_on_close(release_slot)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/mark_alert_read/<int:alert_id>')
 @login_required
@@ -1151,7 +1360,7 @@ def employer_jobs():
     if current_user.user_type != 'employer':
         return jsonify({'error': 'Access denied'}), 403
     
-    jobs = Job.query.filter_by(employer_id=current_user.id).order_by(Job.posted_date.desc()).all()
+    jobs = employer_job_previews(current_user.id)
     
     jobs_data = []
     for job in jobs:
@@ -1165,10 +1374,10 @@ def employer_jobs():
             'salary_min': job.salary_min or 0,
             'salary_max': job.salary_max or 0,
             'views': job.views or 0,
-            'applications_count': len(job.applications),
+            'applications_count': job.applications_count,
             'posted_date': job.posted_date.strftime('%B %d, %Y') if job.posted_date else 'Recently',
             'is_active': job.is_active,
-            'description': job.description[:100] + '...' if len(job.description) > 100 else job.description
+            'description': job.preview + '...' if job.truncated else job.preview
         })
     
     return jsonify({'jobs': jobs_data})
@@ -1221,112 +1430,40 @@ def test_email():
 
 @app.route('/admin/stats')
 def admin_stats():
-    # Comprehensive admin statistics
-    from models import User, Job, Application, LoginHistory, ResumeUpload, JobView, EmployerStats
-    
-    # User statistics
-    total_users = User.query.count()
-    total_students = User.query.filter_by(user_type='student').count()
-    total_employers = User.query.filter_by(user_type='employer').count()
-    active_users = User.query.filter_by(is_active=True).count()
-    
-    # Recent registrations (last 30 days)
-    recent_users = User.query.filter(
-        User.created_at >= datetime.utcnow() - timedelta(days=30)
-    ).count()
-    
-    # Job statistics
-    total_jobs = Job.query.count()
-    total_applications = Application.query.count()
-    total_job_views = sum(job.views for job in Job.query.all())
-    
-    # Resume upload statistics
-    total_resume_uploads = ResumeUpload.query.count()
-    avg_ats_score = db.session.query(db.func.avg(ResumeUpload.ats_score)).scalar() or 0
+    # Comprehensive admin statistics, served from the materialized snapshot
+    stats, computed_at = AdminStatsService().get_stats(
+        max_age=app.config['ADMIN_STATS_MAX_AGE'],
+        force_refresh=request.args.get('refresh') == '1'
+    )
     
-    # Login statistics
-    total_logins = LoginHistory.query.count()
-    recent_logins = LoginHistory.query.filter(
-        LoginHistory.login_time >= datetime.utcnow() - timedelta(days=7)
-    ).count()
-    
-    # Top performing employers
-    top_employers = db.session.query(
-        User.username,
-        db.func.count(Job.id).label('jobs_posted'),
-        db.func.sum(Job.views).label('total_views')
-    ).join(Job).filter(User.user_type == 'employer').group_by(User.id).order_by(
-        db.func.sum(Job.views).desc()
-    ).limit(5).all()
-    
-    # Most active students
-    active_students = db.session.query(
-        User.username,
-        db.func.count(Application.id).label('applications'),
-        db.func.count(ResumeUpload.id).label('resumes_uploaded')
-    ).outerjoin(Application).outerjoin(ResumeUpload).filter(User.user_type == 'student').group_by(User.id).order_by(
-        db.func.count(Application.id).desc()
-    ).limit(5).all()
-    
-    # Recent activity (last 7 days)
-    recent_applications = Application.query.filter(
-        Application.applied_at >= datetime.utcnow() - timedelta(days=7)
-    ).count()
-    
-    recent_job_views = JobView.query.filter(
-        JobView.view_time >= datetime.utcnow() - timedelta(days=7)
-    ).count()
-    
-    recent_resume_uploads = ResumeUpload.query.filter(
-        ResumeUpload.upload_time >= datetime.utcnow() - timedelta(days=7)
-    ).count()
-    
-    return render_template('admin_stats.html',
-                         total_users=total_users,
-                         total_students=total_students,
-                         total_employers=total_employers,
-                         active_users=active_users,
-                         recent_users=recent_users,
-                         total_jobs=total_jobs,
-                         total_applications=total_applications,
-                         total_job_views=total_job_views,
-                         total_resume_uploads=total_resume_uploads,
-                         avg_ats_score=round(avg_ats_score, 2),
-                         total_logins=total_logins,
-                         recent_logins=recent_logins,
-                         top_employers=top_employers,
-                         active_students=active_students,
-                         recent_applications=recent_applications,
-                         recent_job_views=recent_job_views,
-                         recent_resume_uploads=recent_resume_uploads)
+    return render_template('admin_stats.html', stats_computed_at=computed_at, **stats)
+
+@app.route('/admin/stats.json')
+def admin_stats_json():
     """Admin route to view system statistics (no sensitive data)"""
-    from models import User, LoginHistory, ResumeUpload, Job, Application
-    
-    # Get basic statistics
-    total_users = User.query.count()
-    total_students = User.query.filter_by(user_type='student').count()
-    total_employers = User.query.filter_by(user_type='employer').count()
-    total_jobs = Job.query.count()
-    total_applications = Application.query.count()
-    
-    # Recent activity (last 7 days)
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    recent_logins = LoginHistory.query.filter(LoginHistory.login_time >= week_ago).count()
-    recent_resumes = ResumeUpload.query.filter(ResumeUpload.upload_time >= week_ago).count()
-    recent_applications = Application.query.filter(Application.applied_at >= week_ago).count()
+    stats, computed_at = AdminStatsService().get_stats(
+        max_age=app.config['ADMIN_STATS_MAX_AGE'],
+        force_refresh=request.args.get('refresh') == '1'
+    )
     
     return jsonify({
-        'total_users': total_users,
-        'total_students': total_students,
-        'total_employers': total_employers,
-        'total_jobs': total_jobs,
-        'total_applications': total_applications,
+        'total_users': stats['total_users'],
+        'total_students': stats['total_students'],
+        'total_employers': stats['total_employers'],
+        'total_jobs': stats['total_jobs'],
+        'total_applications': stats['total_applications'],
         'recent_activity': {
-            'logins_7_days': recent_logins,
-            'resumes_7_days': recent_resumes,
-            'applications_7_days': recent_applications
-        }
+            'logins_7_days': stats['recent_logins'],
+            'resumes_7_days': stats['recent_resume_uploads'],
+            'applications_7_days': stats['recent_applications']
+        },
+        'computed_at': computed_at.isoformat()
     })
 
+@app.route('/admin/query_cache.json')
+def admin_query_cache_json():
+    """Per-worker query cache hit ratios"""
+    return jsonify(query_cache.stats())
+
 if __name__ == '__main__':
     app.run(debug=True)
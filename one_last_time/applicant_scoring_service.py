@@ -0,0 +1,143 @@
+import json
+import os
+from datetime import datetime
+from flask import current_app
+from models import db, User, Job, Application
+from ai.resume_parser import parse_resume
+from job_catalog import job_catalog
+from resume_embedding_service import resume_text_hash
+
+class ApplicantScoringService:
+    """Compute and store each application's score breakdown.
+
+    Scores are written when a student applies, so /applicants and
+    /shortlist/<id> only read and sort indexed columns. Applications are
+    flagged score_stale when the job description changes (models.py
+    listener) or the student uploads a new resume; rescore_stale() runs as a
+    periodic task and recomputes them.
+    """
+
+    SHORTLIST_SCORE = 70
+
+    def __init__(self, matcher='resume'):
+        self.matcher = job_catalog.matchers[matcher]
+
+    def _feedback(self, user):
+        if not user or not user.resume:
+            return None
+        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], user.resume)
+        if not os.path.exists(filepath):
+            return None
+        return parse_resume(filepath)
+
+    def breakdown(self, job, feedback):
+        """Score fields for one applicant (feedback from parse_resume, or None/False without a resume)"""
+        if not feedback:
+            return {
+                'match_percentage': 0, 'ats_score': 0, 'overall_score': 0, 'experience_level': 'Unknown',
+                'matching_skills': [], 'missing_skills': [], 'shortlist_reason': 'No resume uploaded',
+                'resume_hash': None
+            }
+        skills = feedback['skills']
+        match = self.matcher.match(skills, job)
+        match_percentage = match.match_percentage
+
+        ats_sections = feedback.get('ats') or []
+        ats_score = int(100 * sum(1 for s in ats_sections if s['present']) / len(ats_sections)) if ats_sections else 0
+
+        # Experience level based on the breadth of skills
+        experience_level = 'Entry Level'
+        if len(skills) > 8:
+            experience_level = 'Senior'
+        elif len(skills) > 5:
+            experience_level = 'Mid Level'
+
+        # Weighted combination
+        overall_score = (match_percentage * 0.6) + (ats_score * 0.3) + (len(skills) * 2)
+
+        shortlist_reason = []
+        if match_percentage >= 80:
+            shortlist_reason.append("Excellent skill match")
+        elif match_percentage >= 60:
+            shortlist_reason.append("Good skill match")
+        if ats_score >= 80:
+            shortlist_reason.append("High ATS compatibility")
+        elif ats_score >= 60:
+            shortlist_reason.append("Good ATS compatibility")
+        if len(skills) >= 8:
+            shortlist_reason.append("Strong technical background")
+
+        return {
+            'match_percentage': match_percentage,
+            'ats_score': ats_score,
+            'overall_score': overall_score,
+            'experience_level': experience_level,
+            'matching_skills': match.matching_skills,
+            'missing_skills': match.missing_skills,
+            'shortlist_reason': ', '.join(shortlist_reason) if shortlist_reason else 'Manual review needed',
+            'resume_hash': resume_text_hash(feedback['text']) if feedback.get('text') else None
+        }
+
+    def score(self, application, job=None, user=None, feedback=None):
+        """Fill in an application's stored breakdown (the caller commits); feedback=False
+        means the applicant is known to have no readable resume"""
+        job = job or db.session.get(Job, application.job_id)
+        if feedback is None:
+            feedback = self._feedback(user or db.session.get(User, application.user_id))
+        values = self.breakdown(job, feedback)
+        for field in ('match_percentage', 'ats_score', 'overall_score', 'experience_level',
+                      'shortlist_reason', 'resume_hash'):
+            setattr(application, field, values[field])
+        application.matching_skills = json.dumps(values['matching_skills'])
+        application.missing_skills = json.dumps(values['missing_skills'])
+        application.scored_at = datetime.utcnow()
+        application.score_stale = False
+        return application
+
+    def score_pending(self, query, limit=None):
+        """Score the applications matched by query, parsing each resume once; returns how many"""
+        applications = query.limit(limit).all() if limit else query.all()
+        if not applications:
+            return 0
+        users = {user.id: user for user in User.query.filter(User.id.in_({a.user_id for a in applications}))}
+        jobs = {job.id: job for job in Job.query.filter(Job.id.in_({a.job_id for a in applications}))}
+        feedback = {user_id: self._feedback(user) for user_id, user in users.items()}
+        for application in applications:
+            self.score(application, jobs[application.job_id], feedback=feedback[application.user_id] or False)
+        db.session.commit()
+        return len(applications)
+
+    def ensure_scored(self, job_ids):
+        """Score applications of these jobs that predate stored scores"""
+        if not job_ids:
+            return 0
+        return self.score_pending(Application.query.filter(Application.job_id.in_(job_ids),
+                                                           Application.scored_at.is_(None)))
+
+    def mark_user_stale(self, user_id):
+        """Flag a student's applications after they upload a new resume (the caller commits)"""
+        Application.query.filter_by(user_id=user_id).update({'score_stale': True}, synchronize_session=False)
+
+    def rescore_stale(self, batch_size=500):
+        """Periodic pass over applications whose job or resume changed"""
+        rescored = self.score_pending(Application.query.filter(Application.score_stale == True), batch_size)
+        if rescored:
+            print(f"🧮 Rescored {rescored} applications")
+        return rescored
+
+    @staticmethod
+    def as_dict(application, user):
+        """Template row for /applicants and /shortlist from the stored columns"""
+        return {
+            'user': user,
+            'app': application,
+            'application': application,
+            'has_resume': bool(user.resume),
+            'match_percentage': application.match_percentage or 0,
+            'ats_score': application.ats_score or 0,
+            'overall_score': application.overall_score or 0,
+            'experience_level': application.experience_level or 'Unknown',
+            'matching_skills': json.loads(application.matching_skills or '[]'),
+            'missing_skills': json.loads(application.missing_skills or '[]'),
+            'shortlist_reason': application.shortlist_reason or ''
+        }
@@ -0,0 +1,43 @@
+import threading
+
+class PeriodicTask(threading.Thread):
+    """Run a function inside the Flask app context every `interval` seconds"""
+
+    def __init__(self, app, name, interval, func):
+        super().__init__(name=name, daemon=True)
+        self.app = app
+        self.interval = interval
+        self.func = func
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    self.func()
+                except Exception as e:
+                    print(f"Error in background task {self.name}: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+
+_tasks = {}
+_tasks_lock = threading.Lock()
+
+def start_periodic_task(app, name, interval, func):
+    """Start a named periodic task once per process; an interval of 0 disables it"""
+    if not interval or app.config.get('TESTING'):
+        return None
+    with _tasks_lock:
+        if name not in _tasks:
+            task = PeriodicTask(app, name, interval, func)
+            task.start()
+            _tasks[name] = task
+        return _tasks[name]
+
+def stop_periodic_tasks():
+    """Stop every task started in this process"""
+    with _tasks_lock:
+        for task in _tasks.values():
+            task.stop()
+        _tasks.clear()
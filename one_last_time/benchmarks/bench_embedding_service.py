@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Throughput and latency of resume encoding with and without the embedding service.
+
+Simulates --concurrency web workers each encoding one resume per request:
+first every caller runs model.encode itself (one text per call, as each
+worker does today), then the same load goes through ai.embedding_service
+on a Unix socket in a temporary directory, where concurrent requests are
+micro-batched. Needs sentence-transformers.
+
+Example:
+    python benchmarks/bench_embedding_service.py --requests 400 --concurrency 8 --max-wait-ms 5
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import synthetic_data
+from run_benchmarks import summarize
+from ai.embedding_service import EmbeddingServer, EmbeddingClient
+
+def concurrent_load(encode_one, texts, concurrency):
+    """Run encode_one over texts from `concurrency` threads; (wall seconds, latencies)"""
+    latencies = []
+    lock = threading.Lock()
+    cursor = iter(texts)
+
+    def worker():
+        while True:
+            with lock:
+                text = next(cursor, None)
+            if text is None:
+                return
+            started = time.perf_counter()
+            encode_one(text)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, latencies
+
+def report(wall_s, latencies):
+    result = summarize(latencies)
+    result['wall_s'] = round(wall_s, 3)
+    result['requests_per_s'] = round(len(latencies) / wall_s, 2) if wall_s else None
+    return result
+
+def run(args):
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(args.model)
+
+    def encode(batch):
+        return model.encode(batch, batch_size=args.max_batch, normalize_embeddings=True, convert_to_numpy=True)
+
+    rng = random.Random(args.seed)
+    texts = [synthetic_data.generate_resume_text(rng, i) for i in range(args.requests)]
+    encode(texts[:4])  # warm up
+
+    results = {'direct': report(*concurrent_load(lambda text: encode([text]), texts, args.concurrency))}
+
+    workdir = tempfile.mkdtemp(prefix='jobportal-embed-')
+    socket_path = os.path.join(workdir, 'embedding.sock')
+    server = EmbeddingServer(socket_path, encode, args.model, model.get_sentence_embedding_dimension(),
+                             args.max_batch, args.max_wait_ms, args.queue_size)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = EmbeddingClient(socket_path, model=args.model, timeout=60)
+        results['service'] = report(*concurrent_load(lambda text: client.encode([text]), texts, args.concurrency))
+        results['service']['batching'] = client.info()['stats']
+    finally:
+        server.shutdown()
+        server.server_close()
+        os.rmdir(workdir)
+
+    return {
+        'meta': {'model': args.model, 'requests': args.requests, 'concurrency': args.concurrency,
+                 'max_batch': args.max_batch, 'max_wait_ms': args.max_wait_ms, 'queue_size': args.queue_size,
+                 'cpu_count': os.cpu_count()},
+        'results': results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the micro-batching embedding service against direct encoding')
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--requests', type=int, default=400, help='Resumes to encode')
+    parser.add_argument('--concurrency', type=int, default=8, help='Simultaneous callers')
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--queue-size', type=int, default=256)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write results JSON to this file')
+    args = parser.parse_args()
+
+    results = run(args)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == '__main__':
+    main()
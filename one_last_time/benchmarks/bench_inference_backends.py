@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Encode throughput, single-text latency and memory of the embedding inference backends.
+
+For each backend in ai/inference_backends.py this measures batched
+sentences/sec over synthetic resumes and job descriptions, p50/p95 latency
+of one-text calls (what a match request pays for the resume), the RSS added
+by loading the model, and the consistency check against the
+sentence-transformers backend. The onnx backends need a model directory
+from `python -m ai.inference_backends export --quantize`.
+
+Example:
+    python benchmarks/bench_inference_backends.py --model-dir instance/models/minilm --threads 4
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import synthetic_data
+from run_benchmarks import summarize
+from ai.inference_backends import load_backend, consistency_check
+
+VARIANTS = {
+    'sentence-transformers': {'name': 'sentence-transformers'},
+    'onnx': {'name': 'onnx', 'quantized': False},
+    'onnx-int8': {'name': 'onnx', 'quantized': True},
+}
+
+def rss_bytes():
+    """Resident set size of this process (Linux), 0 where unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+def benchmark_backend(backend, texts, batch_size, single_calls):
+    backend.encode(texts[:batch_size], batch_size=batch_size)  # warm up
+    started = time.perf_counter()
+    backend.encode(texts, batch_size=batch_size)
+    batch_s = time.perf_counter() - started
+    latencies = []
+    for text in texts[:single_calls]:
+        started = time.perf_counter()
+        backend.encode([text])
+        latencies.append(time.perf_counter() - started)
+    return {
+        'sentences_per_s': round(len(texts) / batch_s, 1) if batch_s else None,
+        'single_text': summarize(latencies),
+    }
+
+def run(args):
+    rng = random.Random(args.seed)
+    texts = [synthetic_data.generate_resume_text(rng, i) for i in range(args.texts // 2)]
+    texts += [synthetic_data.generate_job_description(rng, rng.sample(synthetic_data.SKILL_POOL, 5))
+              for _ in range(args.texts - len(texts))]
+
+    results = {}
+    reference = None
+    for variant in args.backends:
+        options = VARIANTS[variant]
+        before = rss_bytes()
+        try:
+            backend = load_backend(options['name'], args.model, args.model_dir,
+                                   options.get('quantized', False), args.threads)
+        except (ImportError, OSError, ValueError) as e:
+            results[variant] = {'skipped': str(e)}
+            continue
+        result = {'model_id': backend.model_id, 'rss_added_bytes': rss_bytes() - before}
+        result.update(benchmark_backend(backend, texts, args.batch_size, args.single_calls))
+        if reference is None:
+            reference = backend
+        else:
+            result['consistency'] = consistency_check(reference, backend, texts[:args.check_texts])
+        results[variant] = result
+
+    base = results.get(args.backends[0], {}).get('sentences_per_s')
+    for result in results.values():
+        if base and result.get('sentences_per_s'):
+            result['throughput_vs_first'] = round(result['sentences_per_s'] / base, 2)
+    return {
+        'meta': {'model': args.model, 'texts': len(texts), 'batch_size': args.batch_size,
+                 'threads': args.threads, 'cpu_count': os.cpu_count()},
+        'results': results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sentence embedding inference backends')
+    parser.add_argument('--backends', nargs='+', default=list(VARIANTS), choices=list(VARIANTS),
+                        help='Backends to compare; the first one is the consistency reference')
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--model-dir', help='Exported ONNX model directory')
+    parser.add_argument('--texts', type=int, default=512, help='Texts encoded for the throughput run')
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--single-calls', type=int, default=100, help='One-text calls for the latency run')
+    parser.add_argument('--check-texts', type=int, default=100, help='Texts used by the consistency check')
+    parser.add_argument('--threads', type=int, default=0, help='Intra-op threads (0 keeps the default)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write results JSON to this file')
+    args = parser.parse_args()
+
+    results = run(args)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Memory, first-stage scan speed and recall@k of the quantized embedding codes.
+
+Generates clustered, normalized vectors shaped like all-MiniLM-L6-v2 job
+embeddings (384-d), then compares exact float32 scoring with the binary
+first stage of ai/quantization.QuantizedIndex, before and after
+exact rescoring of the oversampled candidates.
+
+Example:
+    python benchmarks/bench_quantization.py --jobs 10000 --k 10 --oversample 40
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import numpy as np
+from ai.quantization import QuantizedIndex, top_k_indices
+from run_benchmarks import summarize
+
+def synthetic_embeddings(rng, centroids, n, spread):
+    """Unit vectors scattered around a few topic centroids, like job descriptions"""
+    vectors = centroids[rng.integers(0, len(centroids), n)] + spread * rng.standard_normal((n, centroids.shape[1])).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def timed_calls(func, queries):
+    latencies = []
+    results = []
+    for query in queries:
+        started = time.perf_counter()
+        results.append(func(query))
+        latencies.append(time.perf_counter() - started)
+    return results, summarize(latencies)
+
+def recall(found, expected):
+    return float(np.mean([len(set(f.tolist()) & set(e.tolist())) / len(e) for f, e in zip(found, expected)]))
+
+def run(args):
+    rng = np.random.default_rng(args.seed)
+    centroids = rng.standard_normal((args.clusters, args.dim)).astype(np.float32)
+    vectors = synthetic_embeddings(rng, centroids, args.jobs, args.spread)
+    queries = synthetic_embeddings(rng, centroids, args.queries, args.spread)
+
+    exact, exact_timing = timed_calls(lambda q: top_k_indices(vectors @ q, args.k), queries)
+    results = {'float32': {'bytes': int(vectors.nbytes), 'scan': exact_timing, 'recall_at_k': 1.0}}
+
+    for mode in QuantizedIndex.MODES:
+        index = QuantizedIndex(mode, oversample=args.oversample)
+        index.extend(vectors)
+        first_stage, scan_timing = timed_calls(lambda q: index.candidates(q, args.k), queries)
+        rescored, search_timing = timed_calls(lambda q: index.search(q, args.k, vectors)[0], queries)
+        results[mode] = {
+            'bytes': int(index.nbytes),
+            'memory_ratio': round(index.nbytes / vectors.nbytes, 4),
+            'scan': scan_timing,
+            'scan_speedup': round(exact_timing['p50_ms'] / scan_timing['p50_ms'], 2) if scan_timing['p50_ms'] else None,
+            'first_stage_recall_at_k': round(recall(first_stage, exact), 4),
+            'search_with_rescore': search_timing,
+            'recall_at_k': round(recall(rescored, exact), 4),
+        }
+    return {
+        'meta': {'jobs': args.jobs, 'dim': args.dim, 'queries': args.queries, 'k': args.k,
+                 'oversample': args.oversample, 'clusters': args.clusters, 'spread': args.spread, 'seed': args.seed,
+                 'numpy': np.__version__},
+        'results': results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark quantized embedding scans against exact float scoring')
+    parser.add_argument('--jobs', type=int, default=10000, help='Number of job vectors')
+    parser.add_argument('--dim', type=int, default=384, help='Embedding dimension')
+    parser.add_argument('--queries', type=int, default=200, help='Number of resume queries')
+    parser.add_argument('--k', type=int, default=10, help='Top-k cut-off for recall@k')
+    parser.add_argument('--oversample', type=int, default=40, help='Candidates rescored per result')
+    parser.add_argument('--clusters', type=int, default=40, help='Topic clusters in the synthetic data')
+    parser.add_argument('--spread', type=float, default=0.6, help='Within-cluster noise relative to the centroids')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write results JSON to this file')
+    args = parser.parse_args()
+
+    results = run(args)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == '__main__':
+    main()
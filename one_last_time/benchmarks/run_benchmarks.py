@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmarks for the portal's hot paths.
+
+Builds a synthetic database and resume pool in a temporary directory,
+then measures latency and throughput of the matching functions and of the
+main list views through the Flask test client. Results are written as JSON
+so runs on different commits can be compared with --compare.
+
+Example:
+    python benchmarks/run_benchmarks.py --scale small --output bench.json
+    python benchmarks/run_benchmarks.py --scale small --compare bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import synthetic_data
+
+SCALES = {
+    'small': {'jobs': 200, 'students': 500, 'employers': 20, 'applications': 2000, 'resumes': 30},
+    'medium': {'jobs': 2000, 'students': 5000, 'employers': 100, 'applications': 20000, 'resumes': 100},
+    'large': {'jobs': 10000, 'students': 50000, 'employers': 500, 'applications': 200000, 'resumes': 300},
+}
+
+BENCHMARKS = ['parse_resume', 'match_jobs', 'match_jobs_top_k', 'match_jobs_advanced', 'hybrid_rank', 'check_job_matches',
+              'route_jobs', 'route_advanced_search', 'route_applicants', 'route_shortlist']
+
+# Some paths touch every student, so they default to fewer iterations
+DEFAULT_ITERATIONS = {'check_job_matches': 1, 'match_jobs_advanced': 3, 'hybrid_rank': 3}
+
+PASSWORD = 'benchmark'
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+def summarize(latencies):
+    """Summarize a list of latencies (seconds) in milliseconds"""
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    return {
+        'iterations': len(ordered),
+        'total_s': round(total, 4),
+        'throughput_per_s': round(len(ordered) / total, 3) if total else None,
+        'mean_ms': round(total / len(ordered) * 1000, 3) if ordered else 0,
+        'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3) if ordered else 0
+    }
+
+def measure(func, iterations, warmup=1, quiet=True):
+    """Call func repeatedly and return the latency summary"""
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+        for _ in range(warmup):
+            func()
+        latencies = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - started)
+    return summarize(latencies)
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=APP_DIR, text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_app(workdir):
+    """Import the app against a throwaway database and upload folder"""
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+    os.environ['STATS_RECONCILE_INTERVAL'] = '0'
+    os.environ['ADMIN_STATS_REFRESH_INTERVAL'] = '0'
+    # Keep caches, shared matrices and embeddings out of the real instance folder
+    os.environ['QUERY_CACHE_PATH'] = os.path.join(workdir, 'query_cache.db')
+    os.environ['SHARED_STORE_DIR'] = os.path.join(workdir, 'shared')
+    os.environ['EMBEDDING_STORE_DIR'] = os.path.join(workdir, 'embeddings')
+    os.environ['EMBEDDING_COMPACT_INTERVAL'] = '0'
+    from app import app
+    app.config['TESTING'] = True
+    return app
+
+def login(client, username):
+    response = client.post('/login', data={'username': username, 'password': PASSWORD})
+    if response.status_code not in (200, 302):
+        raise RuntimeError(f"Login failed for {username}: {response.status_code}")
+
+def run(args):
+    scale = dict(SCALES[args.scale])
+    for key in scale:
+        if getattr(args, key, None):
+            scale[key] = getattr(args, key)
+    selected = args.only or BENCHMARKS
+
+    workdir = tempfile.mkdtemp(prefix='jobportal-bench-')
+    try:
+        app = load_app(workdir)
+        from models import db, User, Job, Application
+        from employer_stats_service import EmployerStatsService
+        from werkzeug.security import generate_password_hash
+        from ai.resume_parser import parse_resume, COMMON_SKILLS
+        from ai.job_matcher import match_jobs, match_jobs_advanced, top_k_jobs
+        from job_alert_service import JobAlertService
+        from job_catalog import job_catalog
+        from ai.hybrid_retriever import hybrid_retriever
+
+        rng = random.Random(args.seed)
+        setup_started = time.perf_counter()
+        resumes = synthetic_data.generate_resume_files(rng, app.config['UPLOAD_FOLDER'], scale['resumes'])
+        with app.app_context():
+            db.create_all()
+            ids = synthetic_data.populate_database(
+                db, (User, Job, Application), rng,
+                n_students=scale['students'], n_employers=scale['employers'], n_jobs=scale['jobs'],
+                n_applications=scale['applications'], resumes=resumes,
+                password_hash=generate_password_hash(PASSWORD)
+            )
+            EmployerStatsService().reconcile()
+        setup_s = time.perf_counter() - setup_started
+        print(f"Synthetic data ready in {setup_s:.1f}s: {scale}")
+
+        resume_paths = [os.path.join(app.config['UPLOAD_FOLDER'], name) for name in resumes[:3]]
+        results = {}
+
+        def iterations(name):
+            return args.iterations or DEFAULT_ITERATIONS.get(name, 10)
+
+        with app.app_context():
+            student = db.session.get(User, ids['student_ids'][0])
+            student_name = student.username
+            employer_id = db.session.query(Job.employer_id).join(
+                Application, Application.job_id == Job.id
+            ).group_by(Job.employer_id).order_by(db.func.count(Application.id).desc()).first()[0]
+            employer_name = db.session.get(User, employer_id).username
+            shortlist_job_id = db.session.query(Application.job_id).join(
+                Job, Application.job_id == Job.id
+            ).filter(Job.employer_id == employer_id).group_by(Application.job_id).order_by(
+                db.func.count(Application.id).desc()
+            ).first()[0]
+
+            feedback = parse_resume(resume_paths[0])
+            user_skills = feedback['skills']
+            resume_text = open(resume_paths[0], encoding='utf-8', errors='ignore').read()
+            all_jobs = Job.query.all()
+            alert_job = all_jobs[0]
+
+            cases = {
+                'parse_resume': lambda: [parse_resume(path) for path in resume_paths],
+                'match_jobs': lambda: match_jobs(user_skills, all_jobs, COMMON_SKILLS),
+                'match_jobs_top_k': lambda: top_k_jobs(user_skills, all_jobs, 10, COMMON_SKILLS),
+                'match_jobs_advanced': lambda: match_jobs_advanced(resume_text, all_jobs),
+                'hybrid_rank': lambda: hybrid_retriever.rank(job_catalog.snapshot(), user_skills, resume_text, k=50),
+                'check_job_matches': lambda: JobAlertService().check_job_matches(alert_job),
+            }
+            for name, func in cases.items():
+                if name in selected:
+                    print(f"Running {name}...")
+                    results[name] = measure(func, iterations(name), warmup=args.warmup)
+
+        routes = {
+            'route_jobs': (student_name, '/jobs'),
+            'route_advanced_search': (student_name, '/advanced_search?keyword=python&sort_by=match&min_match=30'),
+            'route_applicants': (employer_name, '/applicants'),
+            'route_shortlist': (employer_name, f'/shortlist/{shortlist_job_id}'),
+        }
+        for name, (username, url) in routes.items():
+            if name not in selected:
+                continue
+            client = app.test_client()
+            login(client, username)
+
+            def request_page(client=client, url=url):
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{url} returned {response.status_code}")
+
+            print(f"Running {name}...")
+            results[name] = measure(request_page, iterations(name), warmup=args.warmup)
+    finally:
+        if args.keep_data:
+            print(f"Benchmark data kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'scale': args.scale,
+            'sizes': scale,
+            'seed': args.seed,
+            'setup_s': round(setup_s, 3)
+        },
+        'results': results
+    }
+
+def compare(current, previous_path):
+    """Print p50/p95 changes against a previous results file"""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+    print(f"\nComparison with {previous['meta'].get('commit') or previous_path}:")
+    print(f"{'benchmark':<24}{'p50 before':>12}{'p50 now':>12}{'change':>10}{'p95 before':>12}{'p95 now':>12}")
+    for name, now in current['results'].items():
+        before = previous['results'].get(name)
+        if not before:
+            continue
+        change = (now['p50_ms'] / before['p50_ms'] - 1) * 100 if before['p50_ms'] else 0
+        print(f"{name:<24}{before['p50_ms']:>12.2f}{now['p50_ms']:>12.2f}{change:>+9.1f}%"
+              f"{before['p95_ms']:>12.2f}{now['p95_ms']:>12.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the job portal hot paths on synthetic data')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--jobs', type=int, help='Override the number of jobs')
+    parser.add_argument('--students', type=int, help='Override the number of students')
+    parser.add_argument('--employers', type=int, help='Override the number of employers')
+    parser.add_argument('--applications', type=int, help='Override the number of applications')
+    parser.add_argument('--resumes', type=int, help='Override the size of the resume file pool')
+    parser.add_argument('--iterations', type=int, help='Iterations per benchmark (default depends on the benchmark)')
+    parser.add_argument('--warmup', type=int, default=1, help='Untimed warmup calls per benchmark')
+    parser.add_argument('--only', action='append', choices=BENCHMARKS, help='Run only these benchmarks')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write results JSON to this file')
+    parser.add_argument('--compare', help='Compare against a previous results JSON file')
+    parser.add_argument('--keep-data', action='store_true', help='Keep the temporary database and resumes')
+    args = parser.parse_args()
+
+    results = run(args)
+    print(json.dumps(results['results'], indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""Synthetic users, jobs, applications and resume files for benchmarks.
+
+All generators take a seeded random.Random so a given scale always
+produces the same data set.
+"""
+import os
+import random
+from datetime import datetime, timedelta
+
+SKILL_POOL = [
+    'python', 'java', 'c++', 'machine learning', 'data analysis', 'sql', 'excel', 'communication',
+    'project management', 'deep learning', 'nlp', 'cloud', 'aws', 'azure', 'javascript', 'html', 'css',
+    'leadership', 'teamwork', 'problem solving', 'pandas', 'numpy', 'tensorflow', 'keras', 'pytorch',
+    'react', 'django', 'flask', 'docker', 'kubernetes', 'mongodb', 'postgresql', 'git', 'agile'
+]
+TITLES = ['Software Engineer', 'Data Scientist', 'Frontend Developer', 'Backend Developer', 'ML Engineer',
+          'Data Analyst', 'Cloud Engineer', 'Project Manager', 'DevOps Engineer', 'Business Analyst']
+LOCATIONS = ['San Francisco, CA', 'New York, NY', 'Austin, TX', 'Chicago, IL', 'Seattle, WA',
+             'Boston, MA', 'Remote', 'London, UK', 'Bangalore, India', 'Berlin, Germany']
+JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship']
+REMOTE_OPTIONS = ['Remote', 'Hybrid', 'On-site']
+EXPERIENCE_LEVELS = ['Entry', 'Mid', 'Senior', 'Executive']
+INDUSTRIES = ['Technology', 'Finance', 'Healthcare', 'Marketing', 'Design', 'Education', 'Retail']
+
+RESUME_FORMATS = ('txt', 'docx', 'pdf')
+
+def generate_job_description(rng, skills):
+    return (f"We are looking for a motivated professional with experience in {', '.join(skills[:-1])}"
+            f" and {skills[-1]}. You will work with a cross-functional team to design, build and ship"
+            f" features used by thousands of customers. Strong ownership and a willingness to learn are expected.")
+
+def generate_jobs(rng, count, employer_ids, start_id=1):
+    """Yield row dicts for the job table"""
+    now = datetime.utcnow()
+    for i in range(count):
+        skills = rng.sample(SKILL_POOL, rng.randint(3, 8))
+        salary_min = rng.randrange(40000, 150000, 5000)
+        yield {
+            'id': start_id + i,
+            'title': rng.choice(TITLES),
+            'description': generate_job_description(rng, skills),
+            'employer_id': rng.choice(employer_ids),
+            'views': rng.randint(0, 500),
+            'location': rng.choice(LOCATIONS),
+            'salary_min': salary_min,
+            'salary_max': salary_min + rng.randrange(10000, 60000, 5000),
+            'salary_currency': 'USD',
+            'job_type': rng.choice(JOB_TYPES),
+            'remote_work': rng.choice(REMOTE_OPTIONS),
+            'experience_level': rng.choice(EXPERIENCE_LEVELS),
+            'industry': rng.choice(INDUSTRIES),
+            'company_name': f"Company {rng.randint(1, 2000)}",
+            'posted_date': now - timedelta(days=rng.randint(0, 90), seconds=rng.randint(0, 86400)),
+            'requirements': ', '.join(s.title() for s in skills),
+            'benefits': 'Health insurance, flexible hours',
+            'is_active': rng.random() > 0.05
+        }
+
+def generate_users(rng, count, user_type, password_hash, start_id=1, resumes=None):
+    """Yield row dicts for the user table; students get a resume from the pool"""
+    now = datetime.utcnow()
+    for i in range(count):
+        user_id = start_id + i
+        row = {
+            'id': user_id,
+            'username': f"bench_{user_type}_{user_id}",
+            'password': password_hash,
+            'user_type': user_type,
+            'created_at': now - timedelta(days=rng.randint(0, 365)),
+            'is_active': True,
+            'email_notifications': True,
+            'job_alert_frequency': 'immediate'
+        }
+        if user_type == 'student':
+            row['email'] = f"bench_{user_id}@example.com"
+            if resumes:
+                row['resume'] = resumes[i % len(resumes)]
+        yield row
+
+def generate_applications(rng, count, student_ids, job_ids):
+    """Yield unique (student, job) application row dicts"""
+    seen = set()
+    now = datetime.utcnow()
+    attempts = 0
+    while len(seen) < count and attempts < count * 10:
+        attempts += 1
+        pair = (rng.choice(student_ids), rng.choice(job_ids))
+        if pair in seen:
+            continue
+        seen.add(pair)
+        yield {
+            'user_id': pair[0],
+            'job_id': pair[1],
+            'status': 'applied',
+            'applied_at': now - timedelta(days=rng.randint(0, 60))
+        }
+
+def generate_resume_text(rng, index):
+    skills = rng.sample(SKILL_POOL, rng.randint(3, 12))
+    lines = [
+        f"Candidate {index}",
+        f"Email: candidate{index}@example.com | Phone: +1 555 {index:04d}",
+        f"linkedin.com/in/candidate{index}" if rng.random() > 0.5 else "",
+        "Summary",
+        f"Engineer with hands-on experience in {', '.join(skills[:3])}.",
+        "Skills",
+        ', '.join(skills),
+        "Education",
+        f"Bachelor of Technology, {rng.choice(['State University', 'Tech Institute', 'City College'])}",
+        "Experience",
+        f"Software developer intern at Company {rng.randint(1, 500)} working with {skills[0]}.",
+        "Projects",
+        f"Developed a {rng.choice(['dashboard', 'recommendation engine', 'web app'])} using {skills[-1]}.",
+    ]
+    if rng.random() > 0.5:
+        lines += ["Certifications", "AWS Certified Cloud Practitioner"]
+    if rng.random() > 0.5:
+        lines += ["Achievements", "Won the university hackathon award"]
+    return '\n'.join(line for line in lines if line)
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').encode('latin-1', 'replace').decode('latin-1')
+
+def write_pdf(path, text):
+    """Write a minimal single-page text PDF that pdfminer can extract"""
+    body = ' '.join(f"({_pdf_escape(line)}) Tj T*" for line in text.splitlines())
+    content = f"BT /F1 11 Tf 14 TL 50 760 Td {body} ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n".encode('latin-1')
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode('latin-1')
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode('latin-1')
+    with open(path, 'wb') as f:
+        f.write(out)
+
+def write_resume(path, text):
+    """Write resume text as .txt, .docx or .pdf depending on the extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.pdf':
+        write_pdf(path, text)
+    elif ext == '.docx':
+        from docx import Document
+        document = Document()
+        for line in text.splitlines():
+            document.add_paragraph(line)
+        document.save(path)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+def generate_resume_files(rng, folder, count, formats=RESUME_FORMATS):
+    """Write a pool of resume files, cycling through formats; returns file names"""
+    os.makedirs(folder, exist_ok=True)
+    names = []
+    for i in range(count):
+        name = f"bench_resume_{i}.{formats[i % len(formats)]}"
+        write_resume(os.path.join(folder, name), generate_resume_text(rng, i))
+        names.append(name)
+    return names
+
+def populate_database(db, models, rng, n_students, n_employers, n_jobs, n_applications,
+                      resumes, password_hash, chunk_size=5000):
+    """Bulk insert a synthetic data set with Core inserts; returns the generated ids"""
+    User, Job, Application = models
+
+    def insert_chunked(table, rows):
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                db.session.execute(table.insert(), chunk)
+                chunk = []
+        if chunk:
+            db.session.execute(table.insert(), chunk)
+
+    employer_ids = list(range(1, n_employers + 1))
+    student_ids = list(range(n_employers + 1, n_employers + n_students + 1))
+    job_ids = list(range(1, n_jobs + 1))
+
+    insert_chunked(User.__table__, generate_users(rng, n_employers, 'employer', password_hash, start_id=1))
+    insert_chunked(User.__table__, generate_users(rng, n_students, 'student', password_hash,
+                                                  start_id=n_employers + 1, resumes=resumes))
+    insert_chunked(Job.__table__, generate_jobs(rng, n_jobs, employer_ids))
+    insert_chunked(Application.__table__, generate_applications(rng, n_applications, student_ids, job_ids))
+    db.session.commit()
+    return {'employer_ids': employer_ids, 'student_ids': student_ids, 'job_ids': job_ids}
@@ -0,0 +1,400 @@
+import csv
+import json
+import os
+import sqlite3
+from datetime import datetime
+from html import escape
+from urllib.request import pathname2url
+
+DEFAULT_DB_PATH = 'instance/jobportal.db'
+
+RELATIONSHIPS = [
+    "user → job (employer_id)",
+    "user → application (user_id)",
+    "user → login_history (user_id)",
+    "user → resume_upload (user_id)",
+    "user → job_view (viewer_id)",
+    "user → employer_stats (employer_id)",
+    "job → application (job_id)",
+    "job → job_view (job_id)"
+]
+
+# (emoji, label, required table, SQL expression) for the statistics section
+STATISTICS = [
+    ("👥", "Total Users", 'user', "SELECT COUNT(*) FROM user"),
+    ("🎓", "Students", 'user', "SELECT COUNT(*) FROM user WHERE user_type = 'student'"),
+    ("💼", "Employers", 'user', "SELECT COUNT(*) FROM user WHERE user_type = 'employer'"),
+    ("💼", "Total Jobs", 'job', "SELECT COUNT(*) FROM job"),
+    ("👀", "Job Views", 'job', "SELECT COALESCE(SUM(views), 0) FROM job"),
+    ("📝", "Applications", 'application', "SELECT COUNT(*) FROM application"),
+    ("🔐", "Logins", 'login_history', "SELECT COUNT(*) FROM login_history"),
+    ("📄", "Resume Uploads", 'resume_upload', "SELECT COUNT(*) FROM resume_upload")
+]
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI Job Portal - Database Report</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+            margin: 0;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background: white;
+            padding: 30px;
+            border-radius: 10px;
+            box-shadow: 0 0 20px rgba(0,0,0,0.1);
+        }
+        h1 {
+            color: #2c3e50;
+            text-align: center;
+            border-bottom: 3px solid #3498db;
+            padding-bottom: 10px;
+        }
+        h2 {
+            color: #34495e;
+            border-left: 4px solid #3498db;
+            padding-left: 15px;
+            margin-top: 30px;
+        }
+        h3 {
+            color: #2980b9;
+            margin-top: 25px;
+        }
+        .info-box {
+            background: #ecf0f1;
+            padding: 15px;
+            border-radius: 5px;
+            margin: 10px 0;
+        }
+        .table-section {
+            margin: 30px 0;
+            border: 1px solid #bdc3c7;
+            border-radius: 8px;
+            overflow: hidden;
+        }
+        .table-header {
+            background: #3498db;
+            color: white;
+            padding: 15px;
+            font-weight: bold;
+            font-size: 18px;
+        }
+        .table-content {
+            padding: 20px;
+        }
+        .column-list {
+            background: #f8f9fa;
+            padding: 15px;
+            border-radius: 5px;
+            margin: 10px 0;
+        }
+        .column-item {
+            margin: 5px 0;
+            padding: 5px 10px;
+            background: white;
+            border-left: 3px solid #3498db;
+        }
+        .data-table {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 15px 0;
+        }
+        .data-table th {
+            background: #34495e;
+            color: white;
+            padding: 12px;
+            text-align: left;
+        }
+        .data-table td {
+            padding: 10px;
+            border-bottom: 1px solid #ddd;
+        }
+        .data-table tr:nth-child(even) {
+            background: #f8f9fa;
+        }
+        .stats-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 20px;
+            margin: 20px 0;
+        }
+        .stat-card {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 20px;
+            border-radius: 10px;
+            text-align: center;
+        }
+        .stat-number {
+            font-size: 2em;
+            font-weight: bold;
+            margin-bottom: 5px;
+        }
+        .stat-label {
+            font-size: 0.9em;
+            opacity: 0.9;
+        }
+        .relationship-diagram {
+            background: #f8f9fa;
+            padding: 20px;
+            border-radius: 8px;
+            margin: 20px 0;
+        }
+        .relationship-item {
+            margin: 10px 0;
+            padding: 10px;
+            background: white;
+            border-radius: 5px;
+            border-left: 4px solid #e74c3c;
+        }
+        .timestamp {
+            text-align: center;
+            color: #7f8c8d;
+            font-style: italic;
+            margin-top: 30px;
+        }
+        .export-btn {
+            background: #27ae60;
+            color: white;
+            padding: 10px 20px;
+            border: none;
+            border-radius: 5px;
+            cursor: pointer;
+            font-size: 16px;
+            margin: 10px;
+        }
+        .export-btn:hover {
+            background: #229954;
+        }
+    </style>
+</head>
+"""
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def open_database(db_path=DEFAULT_DB_PATH, snapshot=False):
+    """Open the database read-only.
+
+    With snapshot=True the live file is copied into memory through the SQLite
+    backup API and the file handle is released immediately, so a long report
+    never holds a read transaction against the running app.
+    """
+    uri = 'file:' + pathname2url(os.path.abspath(db_path)) + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True)
+    if not snapshot:
+        return conn
+    memory_conn = sqlite3.connect(':memory:')
+    conn.backup(memory_conn)
+    conn.close()
+    return memory_conn
+
+def collect_report(conn, db_path=DEFAULT_DB_PATH, sample_rows=5):
+    """Gather everything the report needs in one pass over the database.
+
+    Each table's schema is read once, and all row counts and statistics are
+    fetched with a single SELECT of scalar subqueries.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY rowid")
+    table_names = [row[0] for row in cursor.fetchall()]
+
+    tables = []
+    for name in table_names:
+        cursor.execute(f"PRAGMA table_info({quote_identifier(name)})")
+        columns = [
+            {'name': col[1], 'type': col[2], 'not_null': bool(col[3]), 'default': col[4], 'pk': bool(col[5])}
+            for col in cursor.fetchall()
+        ]
+        tables.append({'name': name, 'columns': columns, 'row_count': 0, 'sample': []})
+
+    statistics = [stat for stat in STATISTICS if stat[2] in table_names]
+    subqueries = [f"(SELECT COUNT(*) FROM {quote_identifier(table['name'])})" for table in tables]
+    subqueries += [f"({stat[3]})" for stat in statistics]
+    counts = cursor.execute("SELECT " + ", ".join(subqueries)).fetchone() if subqueries else ()
+
+    for table, row_count in zip(tables, counts):
+        table['row_count'] = row_count
+        if row_count and sample_rows:
+            cursor.execute(f"SELECT * FROM {quote_identifier(table['name'])} LIMIT {int(sample_rows)}")
+            table['sample'] = cursor.fetchall()
+
+    stat_values = counts[len(tables):]
+    return {
+        'database': {
+            'location': os.path.abspath(db_path),
+            'file_size': os.path.getsize(db_path),
+            'last_modified': datetime.fromtimestamp(os.path.getmtime(db_path)).isoformat(sep=' ')
+        },
+        'tables': tables,
+        'relationships': RELATIONSHIPS,
+        'statistics': [
+            {'emoji': emoji, 'label': label, 'value': value or 0}
+            for (emoji, label, _, _), value in zip(statistics, stat_values)
+        ],
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def _truncate(value, limit=50):
+    text = str(value)
+    return escape(text[:limit]) + ('...' if len(text) > limit else '')
+
+def write_html(report, out):
+    """Stream the report as HTML to a writable text file object"""
+    database = report['database']
+    out.write(HTML_HEAD)
+    out.write(f"""<body>
+    <div class="container">
+        <h1>🤖 AI Job Portal - Database Report</h1>
+        
+        <div class="info-box">
+            <h3>📁 Database Information</h3>
+            <p><strong>Location:</strong> {escape(database['location'])}</p>
+            <p><strong>File Size:</strong> {database['file_size']} bytes</p>
+            <p><strong>Last Modified:</strong> {database['last_modified']}</p>
+        </div>
+        
+        <h2>📋 Database Tables</h2>
+        <p>The database contains the following tables:</p>
+        <ul>
+""")
+    for table in report['tables']:
+        out.write(f"            <li><strong>{escape(table['name'])}</strong></li>\n")
+    out.write("""        </ul>
+        
+        <h2>📊 Detailed Table Structure</h2>
+""")
+
+    for table in report['tables']:
+        out.write(f"""
+        <div class="table-section">
+            <div class="table-header">
+                📊 Table: {escape(table['name'].upper())}
+            </div>
+            <div class="table-content">
+                <h3>📝 Columns ({len(table['columns'])} total)</h3>
+                <div class="column-list">
+""")
+        for col in table['columns']:
+            pk_mark = " 🔑" if col['pk'] else ""
+            null_mark = " NOT NULL" if col['not_null'] else ""
+            default_mark = f" DEFAULT {escape(str(col['default']))}" if col['default'] else ""
+            out.write(f"""                    <div class="column-item">
+                        <strong>{escape(col['name'])}</strong> ({escape(col['type'])}){null_mark}{default_mark}{pk_mark}
+                    </div>
+""")
+        out.write(f"""                </div>
+                
+                <h3>📈 Data Statistics</h3>
+                <p><strong>Total Rows:</strong> {table['row_count']}</p>
+""")
+        if table['sample']:
+            out.write(f"""
+                <h3>📄 Sample Data (First {len(table['sample'])} rows)</h3>
+                <table class="data-table">
+                    <thead>
+                        <tr>
+""")
+            for col in table['columns']:
+                out.write(f"                            <th>{escape(col['name'])}</th>\n")
+            out.write("""                        </tr>
+                    </thead>
+                    <tbody>
+""")
+            for row in table['sample']:
+                out.write("                        <tr>\n")
+                for cell in row:
+                    out.write(f"                            <td>{_truncate(cell)}</td>\n")
+                out.write("                        </tr>\n")
+            out.write("""                    </tbody>
+                </table>
+""")
+        out.write("""            </div>
+        </div>
+""")
+
+    out.write("""
+        <h2>🔗 Database Relationships</h2>
+        <div class="relationship-diagram">
+""")
+    for rel in report['relationships']:
+        out.write(f'            <div class="relationship-item">• {escape(rel)}</div>\n')
+    out.write("""        </div>
+        
+        <h2>📈 Database Statistics</h2>
+        <div class="stats-grid">
+""")
+    for stat in report['statistics']:
+        out.write(f"""            <div class="stat-card">
+                <div class="stat-number">{stat['value']}</div>
+                <div class="stat-label">{stat['emoji']} {escape(stat['label'])}</div>
+            </div>
+""")
+    out.write(f"""        </div>
+        
+        <div class="timestamp">
+            Report generated on: {report['generated_at']}
+        </div>
+        
+        <div style="text-align: center; margin-top: 30px;">
+            <button class="export-btn" onclick="window.print()">🖨️ Print/Save as PDF</button>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+def write_json(report, out):
+    """Write the report as JSON (sample rows become lists of strings)"""
+    serializable = dict(report)
+    serializable['tables'] = [
+        dict(table, sample=[[None if cell is None else str(cell) for cell in row] for row in table['sample']])
+        for table in report['tables']
+    ]
+    json.dump(serializable, out, indent=2, ensure_ascii=False)
+
+def write_csv(report, out):
+    """Write the report's counts as CSV rows of (section, name, value)"""
+    writer = csv.writer(out)
+    writer.writerow(['section', 'name', 'value'])
+    writer.writerow(['database', 'file_size', report['database']['file_size']])
+    for table in report['tables']:
+        writer.writerow(['table_rows', table['name'], table['row_count']])
+        writer.writerow(['table_columns', table['name'], len(table['columns'])])
+    for stat in report['statistics']:
+        writer.writerow(['statistic', stat['label'], stat['value']])
+
+WRITERS = {
+    'html': write_html,
+    'json': write_json,
+    'csv': write_csv
+}
+
+def generate_reports(formats=('html',), db_path=DEFAULT_DB_PATH, output_base='database_report',
+                     snapshot=False, sample_rows=5):
+    """Collect the report once and write it in every requested format.
+
+    Returns a dict of format -> output file path.
+    """
+    conn = open_database(db_path, snapshot=snapshot)
+    try:
+        report = collect_report(conn, db_path, sample_rows)
+    finally:
+        conn.close()
+
+    outputs = {}
+    for fmt in formats:
+        path = f"{output_base}.{fmt}"
+        with open(path, 'w', encoding='utf-8', newline='' if fmt == 'csv' else None) as out:
+            WRITERS[fmt](report, out)
+        outputs[fmt] = path
+    return outputs
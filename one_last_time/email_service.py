@@ -2,6 +2,7 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from flask import current_app
+from instrumentation import timer
 import os
 
 class EmailService:
@@ -95,12 +96,13 @@ class EmailService:
             # Send email if configured
             if self.email_enabled:
                 try:
-                    server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-                    server.starttls()
-                    server.login(self.sender_email, self.sender_password)
-                    text = msg.as_string()
-                    server.sendmail(self.sender_email, user_email, text)
-                    server.quit()
+                    with timer('smtp_send'):
+                        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+                        server.starttls()
+                        server.login(self.sender_email, self.sender_password)
+                        text = msg.as_string()
+                        server.sendmail(self.sender_email, user_email, text)
+                        server.quit()
                     print(f"✅ Email sent successfully to {user_email}")
                     return True
                 except Exception as e:
@@ -166,12 +168,13 @@ class EmailService:
             # Send email if configured
             if self.email_enabled:
                 try:
-                    server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-                    server.starttls()
-                    server.login(self.sender_email, self.sender_password)
-                    text = msg.as_string()
-                    server.sendmail(self.sender_email, user_email, text)
-                    server.quit()
+                    with timer('smtp_send'):
+                        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+                        server.starttls()
+                        server.login(self.sender_email, self.sender_password)
+                        text = msg.as_string()
+                        server.sendmail(self.sender_email, user_email, text)
+                        server.quit()
                     print(f"✅ Welcome email sent successfully to {user_email}")
                     return True
                 except Exception as e:
@@ -0,0 +1,92 @@
+from datetime import datetime
+from models import db, User, Job, Application, EmployerStats
+
+class EmployerStatsService:
+    """Read and repair the incrementally maintained EmployerStats counters.
+
+    The counters themselves are bumped by the after_insert listeners in
+    models.py; this service only reads them and reconciles drift.
+    """
+
+    COUNTERS = ('total_jobs_posted', 'total_applications_received', 'total_job_views', 'last_job_posted')
+
+    def get_stats(self, employer_id):
+        """Return the stats row for an employer, seeding it on first access"""
+        stats = EmployerStats.query.filter_by(employer_id=employer_id).first()
+        if not stats:
+            self.reconcile(employer_id)
+            stats = EmployerStats.query.filter_by(employer_id=employer_id).first()
+        return stats
+
+    def compute_totals(self, employer_id=None):
+        """Compute the real counters per employer with two grouped queries"""
+        job_query = db.session.query(
+            Job.employer_id,
+            db.func.count(Job.id),
+            db.func.coalesce(db.func.sum(Job.views), 0),
+            db.func.max(Job.posted_date)
+        )
+        app_query = db.session.query(
+            Job.employer_id,
+            db.func.count(Application.id)
+        ).join(Job, Application.job_id == Job.id)
+        employer_query = db.session.query(User.id).filter(User.user_type == 'employer')
+
+        if employer_id is not None:
+            job_query = job_query.filter(Job.employer_id == employer_id)
+            app_query = app_query.filter(Job.employer_id == employer_id)
+            employer_query = employer_query.filter(User.id == employer_id)
+
+        def empty():
+            return {
+                'total_jobs_posted': 0,
+                'total_applications_received': 0,
+                'total_job_views': 0,
+                'last_job_posted': None
+            }
+
+        totals = {emp_id: empty() for (emp_id,) in employer_query.all()}
+        for emp_id, jobs_posted, job_views, last_posted in job_query.group_by(Job.employer_id).all():
+            totals.setdefault(emp_id, empty()).update({
+                'total_jobs_posted': jobs_posted,
+                'total_job_views': job_views,
+                'last_job_posted': last_posted
+            })
+        for emp_id, applications_received in app_query.group_by(Job.employer_id).all():
+            totals.setdefault(emp_id, empty())['total_applications_received'] = applications_received
+        return totals
+
+    def reconcile(self, employer_id=None):
+        """Rewrite stats rows whose counters drifted from the real totals.
+
+        Returns the number of rows created or repaired.
+        """
+        totals = self.compute_totals(employer_id)
+        query = EmployerStats.query
+        if employer_id is not None:
+            query = query.filter_by(employer_id=employer_id)
+        existing = {stats.employer_id: stats for stats in query.all()}
+
+        repaired = 0
+        now = datetime.utcnow()
+        for emp_id, values in totals.items():
+            stats = existing.get(emp_id)
+            if stats is None:
+                stats = EmployerStats(employer_id=emp_id)
+                db.session.add(stats)
+            elif all(getattr(stats, name) == values[name] for name in self.COUNTERS):
+                continue
+            for name in self.COUNTERS:
+                setattr(stats, name, values[name])
+            stats.last_updated = now
+            repaired += 1
+
+        if repaired:
+            db.session.commit()
+            print(f"📊 Reconciled {repaired} employer stats rows")
+        return repaired
+
+if __name__ == '__main__':
+    from app import app
+    with app.app_context():
+        EmployerStatsService().reconcile()
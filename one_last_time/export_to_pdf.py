@@ -22,8 +22,11 @@ def convert_html_to_pdf():
         pdf_file = 'database_report.pdf'
         
         if not os.path.exists(html_file):
-            print("❌ HTML report not found. Please run generate_db_report.py first.")
-            return
+            # Build the HTML from a single read-only pass instead of asking for a separate run
+            from generate_db_report import generate_html_report
+            print("🔄 HTML report not found, generating it...")
+            if not generate_html_report(open_browser=False):
+                return
         
         print("🔄 Converting HTML to PDF...")
         HTML(filename=html_file).write_pdf(pdf_file)
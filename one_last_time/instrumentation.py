@@ -0,0 +1,290 @@
+"""Per-request timing, SQL accounting and hot-path timers for the Flask app.
+
+Everything is kept in process memory; each gunicorn worker exposes its own
+numbers on /metrics (Prometheus text, or JSON with ?format=json).
+"""
+import cProfile
+import functools
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 3),
+            'avg': round(self.sum / self.count, 3) if self.count else 0,
+            'buckets': {str(bound): total for bound, total in self.cumulative()}
+        }
+
+class MetricsRegistry:
+    """Thread-safe store of labelled histograms and counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}  # (metric, labels) -> Histogram
+        self.counters = {}    # (metric, labels) -> float
+        self.descriptions = {}
+
+    def describe(self, metric, description):
+        self.descriptions[metric] = description
+
+    def observe(self, metric, value, buckets=LATENCY_BUCKETS_MS, **labels):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def inc(self, metric, amount=1, **labels):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def to_dict(self):
+        with self._lock:
+            histograms = {}
+            for (metric, labels), histogram in self.histograms.items():
+                histograms.setdefault(metric, []).append({'labels': dict(labels), **histogram.to_dict()})
+            counters = {}
+            for (metric, labels), value in self.counters.items():
+                counters.setdefault(metric, []).append({'labels': dict(labels), 'value': value})
+        return {'histograms': histograms, 'counters': counters}
+
+    def to_prometheus(self):
+        def format_labels(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + '}'
+
+        lines = []
+        with self._lock:
+            seen = set()
+            for (metric, labels), histogram in sorted(self.histograms.items()):
+                if metric not in seen:
+                    seen.add(metric)
+                    if metric in self.descriptions:
+                        lines.append(f'# HELP {metric} {self.descriptions[metric]}')
+                    lines.append(f'# TYPE {metric} histogram')
+                for bound, total in histogram.cumulative():
+                    lines.append(f'{metric}_bucket{format_labels(labels, [("le", bound)])} {total}')
+                lines.append(f'{metric}_sum{format_labels(labels)} {histogram.sum}')
+                lines.append(f'{metric}_count{format_labels(labels)} {histogram.count}')
+            for (metric, labels), value in sorted(self.counters.items()):
+                if metric not in seen:
+                    seen.add(metric)
+                    if metric in self.descriptions:
+                        lines.append(f'# HELP {metric} {self.descriptions[metric]}')
+                    lines.append(f'# TYPE {metric} counter')
+                lines.append(f'{metric}{format_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+registry = MetricsRegistry()
+registry.describe('http_request_duration_ms', 'Request latency per route in milliseconds')
+registry.describe('http_requests_total', 'Requests per route and status code')
+registry.describe('sql_queries_per_request', 'Number of SQL statements executed per request')
+registry.describe('sql_time_per_request_ms', 'Time spent in SQL per request in milliseconds')
+registry.describe('function_duration_ms', 'Duration of instrumented hot-path functions in milliseconds')
+
+# Per-thread request state; gunicorn sync workers and the dev server run one
+# request per thread, so SQL events can be attributed to the current request
+_local = threading.local()
+
+# Only one cProfile profiler can be active per process (Python 3.12+ raises
+# otherwise), so concurrent requests skip profiling while one is running
+_profile_lock = threading.Lock()
+
+# Long-lived responses (Server-Sent Events) are never profiled: they would
+# hold the profiler for the whole stream
+PROFILE_EXCLUDED_PATHS = ('/job_alerts/stream',)
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['query_start_time'].pop()
+    stats = getattr(_local, 'sql', None)
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += (time.perf_counter() - started) * 1000
+
+def timed(name):
+    """Decorator recording each call's duration under function_duration_ms"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.observe('function_duration_ms', (time.perf_counter() - started) * 1000, function=name)
+        return wrapper
+    return decorator
+
+@contextmanager
+def timer(name):
+    """Context manager variant of timed() for blocks such as SMTP sends"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe('function_duration_ms', (time.perf_counter() - started) * 1000, function=name)
+
+class InstrumentationMiddleware:
+    """WSGI middleware recording latency and SQL usage per route.
+
+    With a profile_dir set, a sample of requests (profile_sample_rate) is
+    run under cProfile and the stats are dumped there as .prof files. At
+    most one request per process is profiled at a time; streaming paths
+    in PROFILE_EXCLUDED_PATHS never are.
+    """
+
+    def __init__(self, wsgi_app, profile_dir=None, profile_sample_rate=1.0):
+        self.wsgi_app = wsgi_app
+        self.profile_dir = profile_dir
+        self.profile_sample_rate = profile_sample_rate
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def __call__(self, environ, start_response):
+        status_holder = {}
+
+        def capture_start_response(status, headers, exc_info=None):
+            status_holder['status'] = status.split(' ', 1)[0]
+            return start_response(status, headers, exc_info)
+
+        profiler = None
+        if (self.profile_dir and random.random() < self.profile_sample_rate
+                and not environ.get('PATH_INFO', '').startswith(PROFILE_EXCLUDED_PATHS)
+                and _profile_lock.acquire(blocking=False)):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiling tool (e.g. a debugger) is already active
+                profiler = None
+                _profile_lock.release()
+
+        _local.sql = [0, 0.0]
+        started = time.perf_counter()
+        try:
+            iterable = self.wsgi_app(environ, capture_start_response)
+        except Exception:
+            self._finish(environ, '500', started, profiler)
+            raise
+        return _ClosingIterator(iterable, lambda: self._finish(environ, status_holder.get('status', '500'), started, profiler))
+
+    def _finish(self, environ, status, started, profiler):
+        duration_ms = (time.perf_counter() - started) * 1000
+        if profiler is not None:
+            profiler.disable()
+            _profile_lock.release()
+        route = environ.get('instrumentation.route') or 'unmatched'
+        method = environ.get('REQUEST_METHOD', 'GET')
+        query_count, query_time_ms = getattr(_local, 'sql', None) or (0, 0.0)
+        _local.sql = None
+
+        registry.observe('http_request_duration_ms', duration_ms, route=route, method=method)
+        registry.inc('http_requests_total', route=route, method=method, status=status)
+        registry.observe('sql_queries_per_request', query_count, buckets=QUERY_COUNT_BUCKETS, route=route)
+        registry.observe('sql_time_per_request_ms', query_time_ms, route=route)
+
+        if profiler is not None:
+            safe_route = route.strip('/').replace('/', '_').replace('<', '').replace('>', '').replace(':', '_') or 'index'
+            filename = f"{int(time.time() * 1000)}-{method}-{safe_route}-{duration_ms:.0f}ms.prof"
+            profiler.dump_stats(os.path.join(self.profile_dir, filename))
+
+class _ClosingIterator:
+    """Wrap a WSGI response so the callback runs once the body has been sent"""
+
+    def __init__(self, iterable, callback):
+        self.iterable = iterable
+        self.callback = callback
+        self._iterator = iter(iterable)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iterator)
+
+    def close(self):
+        callback, self.callback = self.callback, None
+        try:
+            if hasattr(self.iterable, 'close'):
+                self.iterable.close()
+        finally:
+            # Servers may call close() more than once; finish the request only once
+            if callback is not None:
+                callback()
+
+def init_instrumentation(app):
+    """Install the middleware, route tagging and the /metrics endpoint"""
+    from flask import request, jsonify, Response
+
+    @app.before_request
+    def _tag_route():
+        request.environ['instrumentation.route'] = request.url_rule.rule if request.url_rule else None
+
+    @app.route('/metrics')
+    def metrics():
+        if request.args.get('format') == 'json':
+            return jsonify(registry.to_dict())
+        return Response(registry.to_prometheus(), mimetype='text/plain; version=0.0.4')
+
+    profile_dir = None
+    if app.config.get('PROFILE_REQUESTS'):
+        profile_dir = app.config.get('PROFILE_DIR') or os.path.join(app.root_path, 'instance', 'profiles')
+    app.wsgi_app = InstrumentationMiddleware(
+        app.wsgi_app,
+        profile_dir=profile_dir,
+        profile_sample_rate=app.config.get('PROFILE_SAMPLE_RATE', 1.0)
+    )
+    return registry
@@ -1,21 +1,25 @@
 import json
 from datetime import datetime, timedelta
 from email_service import EmailService
+from alert_feed import broker
+from flask import current_app
 from models import User, Job, JobAlert, db
 from ai.resume_parser import parse_resume
-from ai.job_matcher import extract_required_skills
+from ai.skill_matcher import SkillMatcher
+from ai.skill_registry import skill_registry
+from job_catalog import job_catalog
 import os
 
+# Used only when the app's 'resume' matcher isn't registered (standalone scripts)
+_fallback_matcher = SkillMatcher(skill_registry)
+
 class JobAlertService:
+    # Alerts score with the app's 'resume' matcher, so the catalog publishes one set of job bitsets
+    MATCHER = 'resume'
+    
     def __init__(self):
         self.email_service = EmailService()
-        self.COMMON_SKILLS = [
-            'python', 'javascript', 'java', 'react', 'angular', 'vue', 'node.js', 'django', 'flask',
-            'sql', 'mongodb', 'postgresql', 'mysql', 'aws', 'azure', 'docker', 'kubernetes',
-            'machine learning', 'ai', 'data science', 'analytics', 'excel', 'powerbi', 'tableau',
-            'html', 'css', 'git', 'agile', 'scrum', 'project management', 'leadership',
-            'marketing', 'sales', 'customer service', 'communication', 'teamwork'
-        ]
+        self.skill_matcher = job_catalog.matchers.get(self.MATCHER, _fallback_matcher)
     
     def check_job_matches(self, job):
         """Check if a new job matches any users and send alerts"""
@@ -27,6 +31,7 @@ class JobAlertService:
             ).all()
             
             matches_found = 0
+            created_alerts = []
             
             for student in students:
                 if not student.email:
@@ -58,9 +63,14 @@ class JobAlertService:
                             match_reason=match_result['match_reason']
                         )
                         db.session.add(job_alert)
+                        created_alerts.append(job_alert)
                         matches_found += 1
             
             db.session.commit()
+            
+            # Wake any open alert streams for these students
+            for job_alert in created_alerts:
+                broker.publish(job_alert.user_id, job_alert.id)
             print(f"📧 Sent {matches_found} job alerts for job: {job.title}")
             return matches_found
             
@@ -72,24 +82,28 @@ class JobAlertService:
         """Calculate how well a job matches a user's profile"""
         try:
             # Get user skills from resume
-            filepath = os.path.join('uploads', user.resume)
+            filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], user.resume)
             if not os.path.exists(filepath):
                 return {'match_percentage': 0, 'match_reason': 'No resume uploaded'}
             
             feedback = parse_resume(filepath)
             user_skills = feedback.get('skills', [])
             
-            # Extract required skills from job description
-            required_skills = extract_required_skills(job.description, self.COMMON_SKILLS)
+            # Score the user's skills against the job's required skills,
+            # using the catalog's precomputed bitset when the job is in it
+            catalog = job_catalog.snapshot()
+            index = catalog.position.get(job.id)
+            if index is not None and self.MATCHER in job_catalog.matchers:
+                match = catalog.skill_match(self.MATCHER, user_skills, index)
+            else:
+                match = self.skill_matcher.match(user_skills, job)
+            required_skills = match.required_skills
             
             if not required_skills:
                 return {'match_percentage': 0, 'match_reason': 'No specific skills required'}
             
-            # Calculate matching skills
-            matching_skills = [skill for skill in user_skills if skill.lower() in [req.lower() for req in required_skills]]
-            
-            # Calculate match percentage
-            match_percentage = (len(matching_skills) / len(required_skills)) * 100 if required_skills else 0
+            matching_skills = match.matching_skills
+            match_percentage = match.match_percentage
             
             # Create match reason
             if matching_skills:
@@ -160,12 +174,27 @@ class JobAlertService:
             JobAlert.sent_at.desc()
         ).limit(limit).all()
     
+    def get_alerts_since(self, user_id, cursor=0, limit=50):
+        """Get alerts newer than the client's cursor (an alert id), oldest first"""
+        return JobAlert.query.filter(
+            JobAlert.user_id == user_id,
+            JobAlert.id > cursor
+        ).order_by(JobAlert.id.asc()).limit(limit).all()
+    
+    def get_unread_count(self, user_id):
+        """Get the number of unread alerts, cached briefly per user"""
+        return broker.get_unread_count(
+            user_id,
+            lambda: JobAlert.query.filter_by(user_id=user_id, is_read=False).count()
+        )
+    
     def mark_alert_read(self, alert_id, user_id):
         """Mark a job alert as read"""
         alert = JobAlert.query.filter_by(id=alert_id, user_id=user_id).first()
         if alert:
             alert.is_read = True
             db.session.commit()
+            broker.invalidate_unread(user_id)
             return True
         return False
     
@@ -175,5 +204,6 @@ class JobAlertService:
         if alert:
             db.session.delete(alert)
             db.session.commit()
+            broker.invalidate_unread(user_id)
             return True
-        return False 
\ No newline at end of file
+        return False 
@@ -0,0 +1,259 @@
+"""Per-worker, read-only snapshot of the active jobs in a columnar layout.
+
+Each snapshot keeps the card rows (JobSummary) for rendering next to NumPy
+columns for the fields list views filter and sort on: salary bounds, posting
+time, interned codes for the categorical fields and skill bitsets per
+registered SkillMatcher vocabulary. Snapshots are immutable; refreshes build
+a new one and swap the reference, so readers never lock.
+
+With a SharedArrayStore attached, the skill bitset matrix of each version is
+computed by the first worker that needs it and published as an mmap'd file;
+the other workers map that file instead of keeping their own copy.
+
+Change detection is a single read of CatalogVersion, which models.py bumps
+on every job content change. A refresh then reloads only the rows whose
+updated_at moved, plus the id list to drop deleted or deactivated jobs.
+"""
+import hashlib
+import threading
+import time
+from datetime import timedelta
+import numpy as np
+from models import db, Job, CatalogVersion
+from job_queries import JobSummary, SUMMARY_COLUMNS
+from ai.quantization import popcount
+
+CATEGORY_FIELDS = ('job_type', 'remote_work', 'experience_level', 'industry')
+
+# Re-read rows stamped slightly before the last watermark, in case a slower
+# transaction committed its earlier timestamp after we refreshed
+WATERMARK_SLACK = timedelta(minutes=5)
+
+def mask_to_words(mask, n_words):
+    """Split a Python int bitmask into little-endian uint64 words"""
+    return np.array([(mask >> (64 * i)) & 0xFFFFFFFFFFFFFFFF for i in range(n_words)], dtype=np.uint64)
+
+class CatalogSnapshot:
+    """Immutable columnar view of the active jobs at one catalog version"""
+
+    def __init__(self, version, rows, watermark, matchers, store=None):
+        self.version = version
+        self.rows = rows
+        self.watermark = watermark
+        self.loaded_at = time.time()
+        self.ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+        self.position = {row.id: i for i, row in enumerate(rows)}
+        self.salary_min = self._float_column(row.salary_min for row in rows)
+        self.salary_max = self._float_column(row.salary_max for row in rows)
+        self.posted = self._float_column(row.posted_date.timestamp() if row.posted_date else None for row in rows)
+        self.location = [(row.location or '').lower() for row in rows]
+        # Interned categorical columns: code -1 means NULL
+        self.categories = {}
+        self.codes = {}
+        for field in CATEGORY_FIELDS:
+            values = [getattr(row, field) for row in rows]
+            vocabulary = {value: code for code, value in enumerate(sorted({v for v in values if v is not None}))}
+            self.categories[field] = vocabulary
+            self.codes[field] = np.fromiter((vocabulary.get(v, -1) for v in values), dtype=np.int32, count=len(rows))
+        self._matchers = matchers
+        self._store = store
+        self._skills = {}  # matcher name -> (jobs, words) uint64 array
+
+    def _float_column(self, values):
+        return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=len(self.rows))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def skill_masks(self, name):
+        """Per-job skill bitsets for a registered matcher as a (jobs, words) uint64 array"""
+        words = self._skills.get(name)
+        if words is None:
+            matcher = self._matchers[name]
+            fingerprint = hashlib.sha1(matcher.vocabulary.signature().encode('utf-8')).hexdigest()[:12]
+            bundle_name, bundle_version = f'skills-{name}', f'{self.version}-{fingerprint}'
+            if self._store is not None:
+                bundle = self._store.attach(bundle_name, bundle_version)
+                # Same catalog version but a different row order (e.g. full vs incremental load) can't be shared
+                if bundle is not None and np.array_equal(bundle['ids'], self.ids):
+                    words = bundle['words']
+            if words is None:
+                n_words = max(1, (len(matcher.vocabulary) + 63) // 64)
+                words = np.zeros((len(self.rows), n_words), dtype=np.uint64)
+                for i, row in enumerate(self.rows):
+                    mask = matcher.job_mask(row)
+                    if mask:
+                        words[i] = mask_to_words(mask, n_words)
+                if self._store is not None:
+                    words = self._publish(bundle_name, bundle_version, words)
+            self._skills[name] = words
+        return words
+
+    def _publish(self, bundle_name, bundle_version, words):
+        """Share a freshly computed matrix and switch to the mapped copy to free this worker's"""
+        try:
+            if self._store.publish(bundle_name, bundle_version, ids=self.ids, words=words):
+                bundle = self._store.attach(bundle_name, bundle_version)
+                if bundle is not None and np.array_equal(bundle['ids'], self.ids):
+                    return bundle['words']
+        except OSError as e:
+            print(f"⚠️ Could not publish {bundle_name} to the shared store: {e}")
+        return words
+
+    def job_mask(self, name, index):
+        """One job's skill bitset as a Python int"""
+        return sum(int(word) << (64 * i) for i, word in enumerate(self.skill_masks(name)[index]))
+
+    def filter_masks(self, job_type=None, remote_work=None, experience_level=None, industry=None,
+                     location=None, salary_min=None, salary_max=None, ids=None):
+        """{filter: boolean row mask} for each filter that is set, as /advanced_search applies them"""
+        masks = {}
+        for field, value in (('job_type', job_type), ('remote_work', remote_work),
+                             ('experience_level', experience_level), ('industry', industry)):
+            if value:
+                masks[field] = self.codes[field] == self.categories[field].get(value, -2)
+        if location:
+            needle = location.lower()
+            masks['location'] = np.fromiter((needle in loc for loc in self.location), dtype=bool, count=len(self.rows))
+        # NaN compares False, matching SQL's NULL semantics
+        if salary_min is not None:
+            masks['salary_min'] = self.salary_max >= salary_min
+        if salary_max is not None:
+            masks['salary_max'] = self.salary_min <= salary_max
+        if ids is not None:
+            masks['ids'] = np.isin(self.ids, np.fromiter(ids, dtype=np.int64))
+        return masks
+
+    def combine(self, masks, skip=None):
+        """AND of the given row masks (all rows when empty), leaving out the `skip` filter"""
+        keep = np.ones(len(self.rows), dtype=bool)
+        for name, mask in masks.items():
+            if name != skip:
+                keep &= mask
+        return keep
+
+    def filter(self, **filters):
+        """Row indices matching the same filters /advanced_search applies in SQL"""
+        return np.flatnonzero(self.combine(self.filter_masks(**filters)))
+
+    def facet_counts(self, masks):
+        """{facet field: {value: matching jobs}} for each categorical field.
+
+        Each facet is counted under every filter except its own, so the
+        counts show what choosing another value would return. One AND and a
+        bincount over the interned codes per facet; no SQL.
+        """
+        facets = {}
+        for field in CATEGORY_FIELDS:
+            codes = self.codes[field][self.combine(masks, skip=field)]
+            counts = np.bincount(codes[codes >= 0], minlength=len(self.categories[field]))
+            facets[field] = {value: int(counts[code]) for value, code in self.categories[field].items()}
+        return facets
+
+    def order_by(self, indices, column, descending=True):
+        """Sort row indices by a numeric column, NULLs last"""
+        values = getattr(self, column)[indices]
+        values = np.where(np.isnan(values), -np.inf if descending else np.inf, values)
+        order = np.argsort(-values if descending else values, kind='stable')
+        return indices[order]
+
+    def match_percentages(self, name, user_skills, indices=None):
+        """Skill match percentage of one user against every (or the given) job"""
+        matcher = self._matchers[name]
+        words = self.skill_masks(name)
+        if indices is not None:
+            words = words[indices]
+        user_words = mask_to_words(matcher.user_mask(user_skills), words.shape[1])
+        required = popcount(words)
+        matching = popcount(words & user_words)
+        return np.divide(matching * 100.0, required, out=np.zeros(len(words)), where=required > 0)
+
+    def skill_match(self, name, user_skills, index):
+        """Full SkillMatch (with skill names) for one row"""
+        matcher = self._matchers[name]
+        job_mask = self.job_mask(name, index)
+        percentage, matching, missing = next(matcher.score_masks(matcher.user_mask(user_skills), [job_mask]))
+        return matcher._result(percentage, matching, missing, job_mask)
+
+    def missing_skills(self, name, user_skills):
+        """Union of required-but-missing skills across all jobs"""
+        matcher = self._matchers[name]
+        words = self.skill_masks(name)
+        if not len(words):
+            return []
+        union = np.bitwise_or.reduce(words, axis=0)
+        mask = sum(int(word) << (64 * i) for i, word in enumerate(union))
+        return matcher.vocabulary.decode(mask & ~matcher.user_mask(user_skills))
+
+class JobCatalog:
+    """Holds the current snapshot for this worker and refreshes it when the DB version moves"""
+
+    def __init__(self, check_interval=1.0, store=None):
+        self.check_interval = check_interval
+        self.store = store
+        self.matchers = {}
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def register_matcher(self, name, matcher):
+        self.matchers[name] = matcher
+
+    def snapshot(self):
+        """Current snapshot, refreshed first if the catalog version changed"""
+        if self._snapshot is None or time.monotonic() - self._checked_at >= self.check_interval:
+            self.refresh()
+        return self._snapshot
+
+    def refresh(self, force=False):
+        with self._lock:
+            self._checked_at = time.monotonic()
+            version = db.session.query(CatalogVersion.version).filter(CatalogVersion.id == 1).scalar() or 0
+            current = self._snapshot
+            if current is not None and current.version == version and not force:
+                return current
+            started = time.perf_counter()
+            if current is None or force:
+                rows, watermark = self._load_all()
+                mode = 'full'
+            else:
+                rows, watermark = self._load_changes(current)
+                mode = 'incremental'
+            self._snapshot = CatalogSnapshot(version, rows, watermark, self.matchers, self.store)
+            print(f"🗂️ Job catalog v{version} {mode} refresh: {len(rows)} active jobs "
+                  f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+            return self._snapshot
+
+    def _query(self):
+        return db.session.query(*SUMMARY_COLUMNS, Job.updated_at).filter(Job.is_active == True)
+
+    def _load_all(self):
+        rows = []
+        watermark = None
+        for *values, updated_at in self._query().order_by(Job.posted_date.desc(), Job.id.desc()):
+            rows.append(JobSummary(*values))
+            if updated_at and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+        return rows, watermark
+
+    def _load_changes(self, current):
+        if current.watermark is None:
+            return self._load_all()
+        # Changed rows (new, edited or deactivated) plus the ids still active
+        changed = {}
+        watermark = current.watermark
+        for *values, updated_at in db.session.query(*SUMMARY_COLUMNS, Job.updated_at).filter(
+                Job.updated_at >= current.watermark - WATERMARK_SLACK):
+            changed[values[0]] = JobSummary(*values)
+            if updated_at > watermark:
+                watermark = updated_at
+        active_ids = {job_id for (job_id,) in db.session.query(Job.id).filter(Job.is_active == True)}
+        rows = [changed.pop(row.id, row) for row in current.rows if row.id in active_ids]
+        rows = [row for row in rows if row.is_active]
+        new_rows = [row for row in changed.values() if row.is_active and row.id in active_ids]
+        if new_rows:
+            rows.extend(new_rows)
+            rows.sort(key=lambda row: (row.posted_date.timestamp() if row.posted_date else 0, row.id), reverse=True)
+        return rows, watermark
+
+job_catalog = JobCatalog()
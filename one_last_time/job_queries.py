@@ -0,0 +1,52 @@
+"""List-oriented Job queries that skip ORM hydration.
+
+List pages only need the card fields plus the description (for skill
+matching and the preview), so they select exactly those columns and wrap
+each row in a small ``__slots__`` object. ``requirements`` and ``benefits``
+are deferred on the model and only loaded by the detail view.
+"""
+from sqlalchemy.orm import undefer_group
+from models import db, Job, Application
+
+class JobSummary:
+    """Read-only card view of a job; duck-types as Job for templates and matchers"""
+
+    __slots__ = ('id', 'title', 'description', 'employer_id', 'company_name', 'location',
+                 'job_type', 'remote_work', 'experience_level', 'industry', 'salary_min',
+                 'salary_max', 'salary_currency', 'posted_date', 'application_deadline',
+                 'views', 'is_active')
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return f'<JobSummary {self.id} {self.title!r}>'
+
+SUMMARY_COLUMNS = [getattr(Job, name) for name in JobSummary.__slots__]
+
+def get_job_detail(job_id):
+    """Full Job with its deferred long-text columns loaded in the same query"""
+    return Job.query.options(undefer_group('details')).filter(Job.id == job_id).first()
+
+def employer_job_previews(employer_id, preview_length=100):
+    """An employer's jobs with a SQL-side description preview and application count"""
+    application_count = (
+        db.session.query(db.func.count(Application.id))
+        .filter(Application.job_id == Job.id)
+        .correlate(Job)
+        .scalar_subquery()
+    )
+    return (
+        db.session.query(
+            Job.id, Job.title, Job.company_name, Job.location, Job.job_type,
+            Job.experience_level, Job.salary_min, Job.salary_max, Job.views,
+            Job.posted_date, Job.is_active,
+            db.func.substr(Job.description, 1, preview_length).label('preview'),
+            (db.func.length(Job.description) > preview_length).label('truncated'),
+            application_count.label('applications_count')
+        )
+        .filter(Job.employer_id == employer_id)
+        .order_by(Job.posted_date.desc())
+        .all()
+    )
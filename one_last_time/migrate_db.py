@@ -27,7 +27,8 @@ def migrate_database():
             ('application_deadline', 'DATETIME'),
             ('benefits', 'TEXT'),
             ('requirements', 'TEXT'),
-            ('is_active', 'BOOLEAN')
+            ('is_active', 'BOOLEAN'),
+            ('updated_at', 'DATETIME')
         ]
         
         # Add user notification columns
@@ -78,10 +79,94 @@ def migrate_database():
                 except Exception as e:
                     print(f"Error adding column {column_name}: {e}")
         
+        # Link resume uploads to their stored embedding
+        cursor.execute("PRAGMA table_info(resume_upload)")
+        if 'text_hash' not in [column[1] for column in cursor.fetchall()]:
+            try:
+                cursor.execute("ALTER TABLE resume_upload ADD COLUMN text_hash TEXT")
+                cursor.execute("CREATE INDEX IF NOT EXISTS ix_resume_upload_text_hash ON resume_upload (text_hash)")
+                print("Added resume_upload column: text_hash")
+            except Exception as e:
+                print(f"Error adding resume_upload column text_hash: {e}")
+        try:
+            # Pages look up a student's latest upload
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_resume_upload_user_id ON resume_upload (user_id)")
+        except Exception as e:
+            print(f"Error indexing resume_upload.user_id: {e}")
+        
+        # Skill bitmask of each recommendation profile, so a new job only loads the students it can reach;
+        # NULL until the profile's next rebuild
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='recommendation_profile'")
+        if cursor.fetchone():
+            cursor.execute("PRAGMA table_info(recommendation_profile)")
+            if 'skill_mask' not in [column[1] for column in cursor.fetchall()]:
+                try:
+                    cursor.execute("ALTER TABLE recommendation_profile ADD COLUMN skill_mask BIGINT")
+                    print("Added recommendation_profile column: skill_mask")
+                except Exception as e:
+                    print(f"Error adding recommendation_profile column skill_mask: {e}")
+        
+        # Stored applicant score breakdown; existing rows are scored on first view
+        cursor.execute("PRAGMA table_info(application)")
+        application_columns = [column[1] for column in cursor.fetchall()]
+        application_new_columns = [
+            ('match_percentage', 'REAL'),
+            ('ats_score', 'REAL'),
+            ('overall_score', 'REAL'),
+            ('experience_level', 'TEXT'),
+            ('matching_skills', 'TEXT'),
+            ('missing_skills', 'TEXT'),
+            ('shortlist_reason', 'TEXT'),
+            ('resume_hash', 'TEXT'),
+            ('scored_at', 'DATETIME'),
+            ('score_stale', 'BOOLEAN DEFAULT 0')
+        ]
+        for column_name, column_type in application_new_columns:
+            if column_name not in application_columns:
+                try:
+                    cursor.execute(f"ALTER TABLE application ADD COLUMN {column_name} {column_type}")
+                    print(f"Added application column: {column_name}")
+                except Exception as e:
+                    print(f"Error adding application column {column_name}: {e}")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_application_job_overall_score ON application (job_id, overall_score)")
+        
+        # One stats row per employer: drop duplicates left by concurrent inserts (keeping the
+        # oldest row, whose counters reconcile() fixes below), then enforce it
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='employer_stats'")
+        if cursor.fetchone():
+            try:
+                cursor.execute("DELETE FROM employer_stats WHERE id NOT IN "
+                               "(SELECT MIN(id) FROM employer_stats GROUP BY employer_id)")
+                if cursor.rowcount:
+                    print(f"Removed {cursor.rowcount} duplicate employer_stats rows")
+                cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_employer_stats_employer_id "
+                               "ON employer_stats (employer_id)")
+            except Exception as e:
+                print(f"Error adding unique index on employer_stats.employer_id: {e}")
+        
+        # Jobs created before updated_at existed count as changed when posted
+        cursor.execute("UPDATE job SET updated_at = COALESCE(posted_date, CURRENT_TIMESTAMP) WHERE updated_at IS NULL")
+        
         # Commit changes
         conn.commit()
         conn.close()
         
+        # Create any tables added since the database was first set up
+        # (e.g. admin_stats_snapshot, resume_embedding); existing tables are left untouched
+        db.create_all()
+        print("Created missing tables")
+        
+        # Seed the skill demand aggregate from the existing jobs; the job skills now match the
+        # registry, so the skill re-index task doesn't redo them on first boot
+        from skill_demand_service import SkillDemandService
+        from skill_reindex_service import SkillReindexService
+        SkillDemandService().rebuild()
+        SkillReindexService().mark_current()
+        
+        # Repair employer counters, including rows kept when duplicates were removed
+        from employer_stats_service import EmployerStatsService
+        EmployerStatsService().reconcile()
+        
         print("Database migration completed!")
 
 if __name__ == "__main__":
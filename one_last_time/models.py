@@ -1,5 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import deferred
 from datetime import datetime
 
 db = SQLAlchemy()
@@ -49,9 +51,11 @@ class Job(db.Model):
     company_name = db.Column(db.String(100), nullable=True)
     posted_date = db.Column(db.DateTime, default=datetime.utcnow)
     application_deadline = db.Column(db.DateTime, nullable=True)
-    benefits = db.Column(db.Text, nullable=True)
-    requirements = db.Column(db.Text, nullable=True)
+    # Long text only shown on the detail view; loaded on first access or via undefer_group('details')
+    benefits = deferred(db.Column(db.Text, nullable=True), group='details')
+    requirements = deferred(db.Column(db.Text, nullable=True), group='details')
     is_active = db.Column(db.Boolean, default=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # Last content change (not view bumps)
 
 class Application(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -59,6 +63,21 @@ class Application(db.Model):
     job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
     status = db.Column(db.String(50), default='applied')
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Applicant score breakdown, computed at apply time by ApplicantScoringService and
+    # recomputed in the background when the job description or the resume changes
+    match_percentage = db.Column(db.Float)
+    ats_score = db.Column(db.Float)
+    overall_score = db.Column(db.Float)
+    experience_level = db.Column(db.String(20))
+    matching_skills = db.Column(db.Text)  # JSON list
+    missing_skills = db.Column(db.Text)  # JSON list
+    shortlist_reason = db.Column(db.Text)
+    resume_hash = db.Column(db.String(16))  # Resume text the score was computed from
+    scored_at = db.Column(db.DateTime)  # NULL until first scored
+    score_stale = db.Column(db.Boolean, default=False)
+    
+    __table_args__ = (db.Index('ix_application_job_overall_score', 'job_id', 'overall_score'),)
 
 class LoginHistory(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -68,11 +87,21 @@ class LoginHistory(db.Model):
 
 class ResumeUpload(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     filename = db.Column(db.String(200), nullable=False)
     upload_time = db.Column(db.DateTime, default=datetime.utcnow)
     file_size = db.Column(db.Integer)  # Size in bytes
     ats_score = db.Column(db.Float)  # ATS compatibility score
+    text_hash = db.Column(db.String(16), index=True)  # Hash of the extracted text, see ResumeEmbedding
+
+class ResumeEmbedding(db.Model):
+    __table_args__ = (db.UniqueConstraint('text_hash', 'model'),)
+    id = db.Column(db.Integer, primary_key=True)
+    text_hash = db.Column(db.String(16), nullable=False)  # Hex of ai.embedding_store.text_hash(extracted text)
+    model = db.Column(db.String(100), nullable=False)  # Embedding model id; a new model re-embeds
+    dim = db.Column(db.Integer, nullable=False)
+    vector = db.Column(db.LargeBinary, nullable=False)  # float32 bytes
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class JobView(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -83,7 +112,7 @@ class JobView(db.Model):
 
 class EmployerStats(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    employer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    employer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, unique=True)
     total_jobs_posted = db.Column(db.Integer, default=0)
     total_applications_received = db.Column(db.Integer, default=0)
     total_job_views = db.Column(db.Integer, default=0)
@@ -103,3 +132,187 @@ class JobAlert(db.Model):
     # Relationships
     user = db.relationship('User', backref='job_alerts', lazy=True)
     job = db.relationship('Job', backref='job_alerts', lazy=True)
+
+class SavedSearch(db.Model):
+    # Each search is indexed under one anchor term, its most selective predicate, so a new
+    # job only evaluates the searches anchored on one of its own terms (see SavedSearchService)
+    __table_args__ = (db.Index('ix_saved_search_anchor', 'anchor_field', 'anchor_value'),)
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    name = db.Column(db.String(100))
+    query = db.Column(db.Text, nullable=False)  # JSON of the /advanced_search filters
+    anchor_field = db.Column(db.String(20), nullable=False)  # '*' for searches without a term predicate
+    anchor_value = db.Column(db.String(100), nullable=False, default='')
+    salary_min = db.Column(db.Integer)  # Copied from the query to pre-filter '*' searches in SQL
+    salary_max = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_matched_at = db.Column(db.DateTime)
+
+class AdminStatsSnapshot(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    duration_ms = db.Column(db.Float)  # Time taken to compute the snapshot
+    payload = db.Column(db.Text, nullable=False)  # JSON string of the statistics
+
+class RecommendationProfile(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    text_hash = db.Column(db.String(16))  # Resume text the list was computed from
+    skills = db.Column(db.Text, nullable=False, default='[]')  # JSON list of the resume's skills
+    skill_mask = db.Column(db.BigInteger)  # The skills as a SkillMatcher bitmask; NULL if unknown
+    threshold = db.Column(db.Float, nullable=False, default=0.0)  # Score of the Nth entry; 0 while the list is short
+    stale = db.Column(db.Boolean, nullable=False, default=False)  # Entries were evicted, refill on the next pass
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class JobRecommendation(db.Model):
+    __table_args__ = (db.UniqueConstraint('user_id', 'job_id'),
+                      db.Index('ix_job_recommendation_user_score', 'user_id', 'score'))
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False, index=True)
+    score = db.Column(db.Float, nullable=False)  # Weighted skill + semantic score used for ranking
+    match_percentage = db.Column(db.Float, nullable=False)  # Skill match
+    semantic_score = db.Column(db.Float)  # Resume/job cosine similarity, NULL without an embedding model
+    match_reason = db.Column(db.Text)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class JobSkill(db.Model):
+    # Skills extracted from each active job's description, with the fields SkillDemand aggregates
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    skill = db.Column(db.String(100), primary_key=True, index=True)
+    posted_date = db.Column(db.DateTime)
+    salary = db.Column(db.Float)  # Midpoint of the job's salary bounds, NULL if neither is set
+
+class SkillDemand(db.Model):
+    # Market demand per skill, maintained by skill_demand_service as jobs change
+    skill = db.Column(db.String(100), primary_key=True)
+    active_jobs = db.Column(db.Integer, nullable=False, default=0, index=True)
+    recent_jobs = db.Column(db.Integer, nullable=False, default=0)  # Posted within SkillDemandService.RECENT_DAYS
+    median_salary = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class SkillIndexState(db.Model):
+    # Progress of re-deriving stored skills after a skill registry version bump (single row, id=1)
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)  # Registry version the stored skills match
+    target_version = db.Column(db.Integer)  # Version being re-indexed to, NULL when idle
+    phase = db.Column(db.String(20))  # 'jobs', 'profiles' or 'applications'
+    cursor = db.Column(db.Integer, nullable=False, default=0)  # Last id done in the current phase
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class CatalogVersion(db.Model):
+    id = db.Column(db.Integer, primary_key=True)  # Single row, id=1
+    version = db.Column(db.Integer, nullable=False, default=0)  # Bumped on every job content change
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# --- Incremental employer statistics ---
+# Counters on EmployerStats are bumped inside the same flush that inserts the
+# Job, Application or JobView row, so the dashboard never has to recompute them.
+# EmployerStatsService.reconcile() repairs any drift periodically.
+
+def employer_totals(connection, employer_id):
+    """Compute the EmployerStats counters for one employer from scratch"""
+    job = Job.__table__
+    application = Application.__table__
+    jobs_posted, job_views, last_posted = connection.execute(
+        select(func.count(job.c.id), func.coalesce(func.sum(job.c.views), 0), func.max(job.c.posted_date))
+        .where(job.c.employer_id == employer_id)
+    ).one()
+    applications_received = connection.execute(
+        select(func.count(application.c.id))
+        .select_from(application.join(job, application.c.job_id == job.c.id))
+        .where(job.c.employer_id == employer_id)
+    ).scalar()
+    return {
+        'total_jobs_posted': jobs_posted,
+        'total_applications_received': applications_received,
+        'total_job_views': job_views,
+        'last_job_posted': last_posted,
+    }
+
+def _bump_employer_stats(connection, employer_id, deltas, **values):
+    """Apply counter deltas to an employer's stats row, creating it if missing"""
+    if employer_id is None:
+        return
+    stats = EmployerStats.__table__
+    now = datetime.utcnow()
+    values.update({name: stats.c[name] + delta for name, delta in deltas.items()})
+    values['last_updated'] = now
+    result = connection.execute(
+        stats.update().where(stats.c.employer_id == employer_id).values(**values)
+    )
+    if result.rowcount == 0:
+        # First event for this employer: seed the row from the real totals,
+        # which already include the row being inserted in this flush
+        connection.execute(
+            stats.insert().values(employer_id=employer_id, last_updated=now,
+                                  **employer_totals(connection, employer_id))
+        )
+
+def _job_employer_id(connection, job_id):
+    job = Job.__table__
+    return connection.execute(select(job.c.employer_id).where(job.c.id == job_id)).scalar()
+
+@event.listens_for(Job, 'after_insert')
+def _job_inserted(mapper, connection, target):
+    _bump_employer_stats(connection, target.employer_id, {'total_jobs_posted': 1},
+                         last_job_posted=target.posted_date or datetime.utcnow())
+
+@event.listens_for(Application, 'after_insert')
+def _application_inserted(mapper, connection, target):
+    _bump_employer_stats(connection, _job_employer_id(connection, target.job_id),
+                         {'total_applications_received': 1})
+
+@event.listens_for(JobView, 'after_insert')
+def _job_view_inserted(mapper, connection, target):
+    _bump_employer_stats(connection, _job_employer_id(connection, target.job_id),
+                         {'total_job_views': 1})
+
+
+# --- Job catalog change tracking ---
+# Every content change to a Job (not view-counter bumps) stamps updated_at and
+# bumps the single CatalogVersion row in the same flush, so per-worker job
+# catalogs can detect changes with one primary-key read and reload only the
+# rows changed since their last refresh.
+IGNORED_JOB_CHANGES = ('views', 'applications', 'job_alerts')
+
+def job_content_changed(job):
+    """True if a pending update touches anything other than the view counter"""
+    state = inspect(job)
+    return any(attr.history.has_changes() for attr in state.attrs if attr.key not in IGNORED_JOB_CHANGES)
+
+def bump_catalog_version(connection):
+    versions = CatalogVersion.__table__
+    now = datetime.utcnow()
+    result = connection.execute(
+        versions.update().where(versions.c.id == 1).values(version=versions.c.version + 1, updated_at=now)
+    )
+    if result.rowcount == 0:
+        connection.execute(versions.insert().values(id=1, version=1, updated_at=now))
+
+@event.listens_for(Job, 'before_update')
+def _job_stamp_updated(mapper, connection, target):
+    if job_content_changed(target):
+        target.updated_at = datetime.utcnow()
+
+@event.listens_for(Job, 'after_insert')
+def _job_catalog_inserted(mapper, connection, target):
+    bump_catalog_version(connection)
+
+@event.listens_for(Job, 'after_update')
+def _job_catalog_updated(mapper, connection, target):
+    if job_content_changed(target):
+        bump_catalog_version(connection)
+
+@event.listens_for(Job, 'after_delete')
+def _job_catalog_deleted(mapper, connection, target):
+    bump_catalog_version(connection)
+
+@event.listens_for(Job, 'after_update')
+def _job_applications_stale(mapper, connection, target):
+    # Stored applicant scores depend on the description's required skills
+    if inspect(target).attrs.description.history.has_changes():
+        applications = Application.__table__
+        connection.execute(
+            applications.update().where(applications.c.job_id == target.id).values(score_stale=True)
+        )
@@ -0,0 +1,306 @@
+"""Tag-invalidated cache for query results shared by the list views.
+
+Entries are keyed on a namespace plus normalized filter parameters and carry
+tags such as ``jobs``, ``job:<id>`` and ``user:<id>``. Every tag has a
+version number; an entry remembers the versions it was stored under and is
+treated as a miss once any of them has been bumped, so invalidation is a
+single counter increment however many entries share a tag.
+
+Backends:
+    memory  - per-process dict (invalidation only reaches this worker)
+    sqlite  - a SQLite file shared by all workers on the host (default)
+    redis   - a Redis server shared by every host (needs the redis package)
+"""
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from instrumentation import registry
+
+class MemoryBackend:
+    """LRU dict of live Python objects; values are never copied.
+
+    Invalidations only reach the worker that made the write, so this is
+    only correct when a single process serves the app.
+    """
+
+    shared = False
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._versions = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def tag_versions(self, tags):
+        with self._lock:
+            return [self._versions.get(tag, 0) for tag in tags]
+
+    def bump(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+class SQLiteBackend:
+    """Pickled entries in a SQLite file so every worker on the host shares hits and invalidations"""
+
+    shared = True
+
+    PURGE_EVERY = 200  # sets between sweeps of expired rows
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._sets = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connection()
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_entry (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)')
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_tag (tag TEXT PRIMARY KEY, version INTEGER NOT NULL)')
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT value FROM cache_entry WHERE key = ? AND expires_at >= ?', (key, time.time())
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        conn = self._connection()
+        now = time.time()
+        conn.execute('INSERT OR REPLACE INTO cache_entry (key, value, expires_at) VALUES (?, ?, ?)',
+                     (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), now + ttl))
+        self._sets += 1
+        if self._sets % self.PURGE_EVERY == 0:
+            conn.execute('DELETE FROM cache_entry WHERE expires_at < ?', (now,))
+        conn.commit()
+
+    def tag_versions(self, tags):
+        if not tags:
+            return []
+        placeholders = ','.join('?' * len(tags))
+        rows = dict(self._connection().execute(
+            f'SELECT tag, version FROM cache_tag WHERE tag IN ({placeholders})', list(tags)
+        ))
+        return [rows.get(tag, 0) for tag in tags]
+
+    def bump(self, tags):
+        conn = self._connection()
+        conn.executemany(
+            'INSERT INTO cache_tag (tag, version) VALUES (?, 1) '
+            'ON CONFLICT(tag) DO UPDATE SET version = version + 1',
+            [(tag,) for tag in tags]
+        )
+        conn.commit()
+
+    def clear(self):
+        conn = self._connection()
+        conn.execute('DELETE FROM cache_entry')
+        conn.execute('DELETE FROM cache_tag')
+        conn.commit()
+
+class RedisBackend:
+    """Pickled entries in Redis with native expiry; tag versions are INCR counters"""
+
+    shared = True
+
+    def __init__(self, url, prefix='qc:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), ex=max(1, int(ttl)))
+
+    def tag_versions(self, tags):
+        if not tags:
+            return []
+        return [int(v or 0) for v in self.client.mget([self.prefix + 'tag:' + tag for tag in tags])]
+
+    def bump(self, tags):
+        pipe = self.client.pipeline()
+        for tag in tags:
+            pipe.incr(self.prefix + 'tag:' + tag)
+        pipe.execute()
+
+    def clear(self):
+        keys = list(self.client.scan_iter(self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+def normalize_params(params):
+    """Drop empty values and trim strings so equivalent searches share a key"""
+    normalized = {}
+    for name, value in (params or {}).items():
+        if isinstance(value, str):
+            value = value.strip()
+        if value in (None, '', [], ()):
+            continue
+        normalized[name] = value
+    return normalized
+
+class QueryCache:
+    """Namespace + parameter keyed result cache with tag invalidation and hit accounting"""
+
+    def __init__(self, backend=None, default_ttl=300):
+        self.backend = backend or MemoryBackend()
+        self.default_ttl = default_ttl
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._stats = {}  # namespace -> [hits, misses]
+
+    def make_key(self, namespace, params=None):
+        encoded = json.dumps(normalize_params(params), sort_keys=True, default=str)
+        return f"{namespace}:{hashlib.sha1(encoded.encode('utf-8')).hexdigest()}"
+
+    def get_or_set(self, namespace, params, loader, tags=('jobs',), ttl=None):
+        """Return the cached result for (namespace, params), calling loader() on a miss"""
+        if not self.enabled:
+            return loader()
+        tags = tuple(tags)
+        key = self.make_key(namespace, params)
+        entry = self._safe(self.backend.get, key)
+        versions = self._safe(self.backend.tag_versions, tags)
+        if entry is not None and versions is not None and entry[0] == tuple(versions):
+            self._record(namespace, hit=True)
+            return entry[1]
+        self._record(namespace, hit=False)
+        value = loader()
+        # Store under the versions read *before* loading, so a write that
+        # lands while loader() runs leaves this entry already stale
+        if versions is not None:
+            self._safe(self.backend.set, key, (tuple(versions), value), ttl or self.default_ttl)
+        return value
+
+    def invalidate(self, *tags):
+        if tags:
+            self._safe(self.backend.bump, tags)
+            registry.inc('query_cache_invalidations_total', len(tags))
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self._stats.clear()
+
+    def stats(self):
+        """Hit/miss counts and hit ratio per namespace for this process"""
+        with self._lock:
+            result = {}
+            for namespace, (hits, misses) in sorted(self._stats.items()):
+                total = hits + misses
+                result[namespace] = {'hits': hits, 'misses': misses,
+                                     'hit_ratio': round(hits / total, 4) if total else 0.0}
+            return {'backend': type(self.backend).__name__, 'namespaces': result}
+
+    def _record(self, namespace, hit):
+        with self._lock:
+            counts = self._stats.setdefault(namespace, [0, 0])
+            counts[0 if hit else 1] += 1
+        registry.inc('query_cache_requests_total', namespace=namespace, result='hit' if hit else 'miss')
+
+    def _safe(self, func, *args):
+        # A broken shared backend degrades to uncached queries rather than errors
+        try:
+            return func(*args)
+        except Exception as e:
+            registry.inc('query_cache_errors_total')
+            print(f"⚠️ Query cache error ({type(self.backend).__name__}.{func.__name__}): {e}")
+            return None
+
+query_cache = QueryCache()
+registry.describe('query_cache_requests_total', 'Query cache lookups by namespace and result')
+
+def create_backend(name, app=None):
+    if name == 'sqlite':
+        path = app.config.get('QUERY_CACHE_PATH') if app else None
+        return SQLiteBackend(path or os.path.join(app.root_path if app else '.', 'instance', 'query_cache.db'))
+    if name == 'redis':
+        return RedisBackend(app.config.get('QUERY_CACHE_REDIS_URL') or 'redis://localhost:6379/0')
+    return MemoryBackend(app.config.get('QUERY_CACHE_MAX_ENTRIES', 1024) if app else 1024)
+
+# Tags to invalidate after the current transaction commits, kept on session.info
+_PENDING = 'query_cache_tags'
+
+def _queue_tags(target, tags):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING, set()).update(tags)
+
+def _job_tags(mapper, connection, target):
+    _queue_tags(target, {'jobs', f'job:{target.id}'})
+
+def _job_update_tags(mapper, connection, target):
+    # View-counter bumps from the detail view alone don't invalidate listings
+    from models import job_content_changed
+    if job_content_changed(target):
+        _job_tags(mapper, connection, target)
+
+def _application_tags(mapper, connection, target):
+    _queue_tags(target, {f'user:{target.user_id}', f'job:{target.job_id}'})
+
+@event.listens_for(Session, 'after_commit')
+def _flush_invalidations(session):
+    tags = session.info.pop(_PENDING, None)
+    if tags:
+        query_cache.invalidate(*sorted(tags))
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_invalidations(session, previous_transaction):
+    session.info.pop(_PENDING, None)
+
+def init_query_cache(app):
+    """Configure the backend from app.config and hook invalidation into model writes"""
+    from models import Job, Application
+    query_cache.backend = create_backend(app.config.get('QUERY_CACHE_BACKEND', 'sqlite'), app)
+    query_cache.default_ttl = app.config.get('QUERY_CACHE_TTL', 300)
+    query_cache.enabled = app.config.get('QUERY_CACHE_ENABLED', True)
+    listeners = (
+        (Job, 'after_insert', _job_tags), (Job, 'after_update', _job_update_tags), (Job, 'after_delete', _job_tags),
+        (Application, 'after_insert', _application_tags), (Application, 'after_update', _application_tags),
+        (Application, 'after_delete', _application_tags),
+    )
+    for model, operation, tagger in listeners:
+        if not event.contains(model, operation, tagger):
+            event.listen(model, operation, tagger)
+    return query_cache
@@ -0,0 +1,212 @@
+import json
+from datetime import datetime
+import numpy as np
+from flask import current_app
+from sqlalchemy import or_
+from models import db, Job, JobRecommendation, RecommendationProfile
+from ai.hybrid_retriever import HybridRetriever
+from ai.job_matcher import job_embeddings
+from job_catalog import job_catalog
+from resume_embedding_service import ResumeEmbeddingService, resume_text_hash
+
+# Profile skill masks are stored in a signed 64-bit column
+MASK_BITS = 63
+
+class RecommendationService:
+    """Materialized top-N job recommendations per student.
+
+    Each student with a resume has a RecommendationProfile (skills and their
+    bitmask, resume text hash and the score of their Nth entry) and up to N JobRecommendation
+    rows. Scores are absolute, so a list can change one job at a time:
+
+        score = (1 - w) * skill_match / 100 + w * resume/job cosine
+
+    A new resume rebuilds only that student's list; a new job is scored only
+    against students whose threshold it can beat, pre-selected in SQL by
+    threshold and skill-mask overlap; inactive or expired jobs
+    are evicted and the lists they leave short are refilled by maintain().
+    """
+
+    def __init__(self, matcher='resume'):
+        config = current_app.config
+        self.matcher = matcher
+        self.top_n = config.get('RECOMMENDATIONS_TOP_N', 50)
+        self.semantic_weight = config.get('HYBRID_SEMANTIC_WEIGHT', 0.5)
+        self.retriever = HybridRetriever(matcher, config.get('HYBRID_CANDIDATES', 300), 'weighted',
+                                         semantic_weight=self.semantic_weight,
+                                         semantic_candidates=config.get('HYBRID_SEMANTIC_CANDIDATES', 50))
+
+    # --- reading ---
+
+    def recommendations(self, user_id, limit=None):
+        """(JobRecommendation, Job) pairs of a student's list, best first; one indexed query"""
+        return db.session.query(JobRecommendation, Job).join(
+            Job, Job.id == JobRecommendation.job_id
+        ).filter(
+            JobRecommendation.user_id == user_id,
+            Job.is_active == True
+        ).order_by(JobRecommendation.score.desc()).limit(limit or self.top_n).all()
+
+    def stored(self, user_id, text_hash):
+        """(skills, list) of a student whose profile was computed from the resume text with
+        text_hash (as stored on ResumeUpload), else None; needs no resume parsing"""
+        profile = db.session.get(RecommendationProfile, user_id)
+        if text_hash is None or profile is None or profile.text_hash != text_hash:
+            return None
+        return json.loads(profile.skills), self.recommendations(user_id)
+
+    def current_recommendations(self, user_id, skills, resume_text, resume_vector=None, text_hash=None):
+        """The student's list, rebuilt first if it was computed from a different resume"""
+        profile = db.session.get(RecommendationProfile, user_id)
+        if text_hash is None:
+            text_hash = resume_text_hash(resume_text) if resume_text else None
+        if profile is None or profile.text_hash != text_hash:
+            if resume_vector is None:
+                resume_vector = ResumeEmbeddingService().embedding(resume_text)
+            self.rebuild(user_id, skills, text_hash, resume_vector)
+        return self.recommendations(user_id)
+
+    # --- maintenance ---
+
+    @staticmethod
+    def _expired(row, now):
+        return row.application_deadline is not None and row.application_deadline < now
+
+    @staticmethod
+    def reason(match, semantic_score=None):
+        if match.matching_skills:
+            reason = f"Your skills match: {', '.join(match.matching_skills[:3])}"
+            if len(match.matching_skills) > 3:
+                reason += f" and {len(match.matching_skills) - 3} more"
+            return reason
+        if semantic_score is not None and semantic_score >= 0.5:
+            return "Similar to the experience described in your resume"
+        return "Job matches your profile based on other criteria"
+
+    def rebuild(self, user_id, skills, text_hash, resume_vector=None):
+        """Recompute one student's list from the catalog"""
+        catalog = job_catalog.snapshot()
+        now = datetime.utcnow()
+        order, percentages = self.retriever.skill_order(catalog, skills)
+        order = np.array([i for i in order if not self._expired(catalog.rows[i], now)], dtype=np.int64)
+        matches = self.retriever.rank(catalog, skills, k=self.top_n, order=(order, percentages),
+                                      resume_vector=resume_vector)
+
+        JobRecommendation.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+        for match in matches:
+            db.session.add(JobRecommendation(
+                user_id=user_id,
+                job_id=match.job.id,
+                score=match.score,
+                match_percentage=match.skill_percentage,
+                semantic_score=match.semantic_score,
+                match_reason=self.reason(catalog.skill_match(self.matcher, skills, match.index), match.semantic_score),
+                computed_at=now
+            ))
+        profile = db.session.get(RecommendationProfile, user_id)
+        if profile is None:
+            profile = RecommendationProfile(user_id=user_id)
+            db.session.add(profile)
+        profile.text_hash = text_hash
+        profile.skills = json.dumps(list(skills))
+        skill_mask = job_catalog.matchers[self.matcher].user_mask(skills)
+        profile.skill_mask = skill_mask if skill_mask.bit_length() <= MASK_BITS else None
+        profile.threshold = matches[-1].score if len(matches) >= self.top_n else 0.0
+        profile.stale = False
+        profile.computed_at = now
+        db.session.commit()
+        return len(matches)
+
+    def add_job(self, job):
+        """Insert a newly posted job into the lists it belongs in; returns how many"""
+        if not job.is_active or self._expired(job, datetime.utcnow()):
+            return 0
+        matcher = job_catalog.matchers[self.matcher]
+        job_mask = matcher.job_mask(job)
+        required = job_mask.bit_count()
+        weight = self.semantic_weight
+        # Without a shared skill a student scores at most w (a perfect semantic score), so SQL
+        # loads only the profiles below that threshold or whose skill mask overlaps the job's;
+        # masks still NULL (not rebuilt since the column was added) are decoded here
+        reach = [RecommendationProfile.threshold < weight, RecommendationProfile.skill_mask.is_(None)]
+        stored_bits = job_mask & ((1 << MASK_BITS) - 1)
+        if stored_bits:
+            reach.append(RecommendationProfile.skill_mask.op('&')(stored_bits) != 0)
+        profiles = RecommendationProfile.query.filter(or_(*reach)).all()
+        if not profiles:
+            return 0
+        percentages = np.array([
+            ((profile.skill_mask if profile.skill_mask is not None else matcher.user_mask(json.loads(profile.skills)))
+             & job_mask).bit_count() / required * 100 if required else 0.0
+            for profile in profiles
+        ])
+
+        # Upper bound with a perfect semantic score: students it cannot reach are skipped
+        bound = (1 - weight) * percentages / 100 + weight
+        thresholds = np.array([profile.threshold for profile in profiles])
+        reachable = np.flatnonzero(bound > thresholds)
+        if not len(reachable):
+            return 0
+
+        job_vector = job_embeddings([job])
+        resume_vectors = {}
+        if job_vector is not None:
+            resume_vectors = ResumeEmbeddingService().stored_many(
+                profiles[i].text_hash for i in reachable if profiles[i].text_hash)
+
+        added = 0
+        now = datetime.utcnow()
+        for i in reachable:
+            profile = profiles[i]
+            resume_vector = resume_vectors.get(profile.text_hash)
+            semantic = float(job_vector[0] @ resume_vector) if resume_vector is not None else None
+            score = float(self.retriever.fuse(percentages[i:i + 1], None if semantic is None else np.array([semantic]))[0])
+            if score <= profile.threshold:
+                continue
+            skills = json.loads(profile.skills)
+            db.session.add(JobRecommendation(
+                user_id=profile.user_id, job_id=job.id, score=score, match_percentage=float(percentages[i]),
+                semantic_score=semantic, match_reason=self.reason(matcher.match(skills, job), semantic),
+                computed_at=now
+            ))
+            db.session.flush()
+            self._trim(profile)
+            added += 1
+        db.session.commit()
+        return added
+
+    def _trim(self, profile):
+        """Drop entries past the top N and move the threshold to the new Nth score"""
+        scores = db.session.query(JobRecommendation.id, JobRecommendation.score).filter(
+            JobRecommendation.user_id == profile.user_id
+        ).order_by(JobRecommendation.score.desc()).all()
+        extra = [rec_id for rec_id, _ in scores[self.top_n:]]
+        if extra:
+            JobRecommendation.query.filter(JobRecommendation.id.in_(extra)).delete(synchronize_session=False)
+        profile.threshold = scores[self.top_n - 1][1] if len(scores) >= self.top_n else 0.0
+
+    def evict(self):
+        """Remove recommendations of deleted, inactive or expired jobs; returns how many"""
+        gone = db.session.query(Job.id).filter(or_(Job.is_active == False, Job.application_deadline < datetime.utcnow()))
+        condition = or_(JobRecommendation.job_id.in_(gone), ~JobRecommendation.job_id.in_(db.session.query(Job.id)))
+        affected = [user_id for (user_id,) in
+                    db.session.query(JobRecommendation.user_id).filter(condition).distinct()]
+        if not affected:
+            return 0
+        removed = JobRecommendation.query.filter(condition).delete(synchronize_session=False)
+        RecommendationProfile.query.filter(RecommendationProfile.user_id.in_(affected)).update(
+            {'stale': True, 'threshold': 0.0}, synchronize_session=False)
+        db.session.commit()
+        return removed
+
+    def maintain(self):
+        """Periodic pass: evict, then refill the lists left short"""
+        removed = self.evict()
+        stale = RecommendationProfile.query.filter_by(stale=True).all()
+        embeddings = ResumeEmbeddingService()
+        for profile in stale:
+            resume_vector = embeddings.stored(profile.text_hash) if profile.text_hash else None
+            self.rebuild(profile.user_id, json.loads(profile.skills), profile.text_hash, resume_vector)
+        if removed or stale:
+            print(f"🎯 Recommendations: evicted {removed} entries, refilled {len(stale)} lists")
+        return removed
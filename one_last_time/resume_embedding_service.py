@@ -0,0 +1,79 @@
+"""Resume embeddings computed once per distinct resume text and model.
+
+Vectors are stored in ResumeEmbedding keyed by (text hash, model id), and a
+small per-process LRU sits in front of the table. Re-ranking jobs for an
+already uploaded resume therefore costs one indexed row read at most, not
+a transformer call. Switching the model or its int8 variant changes the
+model id, so each resume is re-embedded on its next use.
+"""
+import threading
+from collections import OrderedDict
+import numpy as np
+from sqlalchemy.exc import IntegrityError
+from models import db, ResumeEmbedding
+from ai.embedding_store import text_hash
+from ai.job_matcher import encode_texts, embedding_model_id
+
+def resume_text_hash(text):
+    """Hex key of the extracted resume text, as stored on ResumeUpload and ResumeEmbedding"""
+    return format(text_hash(text), '016x')
+
+class ResumeEmbeddingService:
+    MEMORY_ENTRIES = 1024
+
+    # Shared by every instance in this process
+    _memory = OrderedDict()  # (text hash, model) -> float32 vector
+    _lock = threading.Lock()
+
+    def embedding(self, text):
+        """Normalized float32 vector of the resume text, or None without a semantic encoder"""
+        if not text:
+            return None
+        key = (resume_text_hash(text), embedding_model_id())
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                return vector
+        row = ResumeEmbedding.query.filter_by(text_hash=key[0], model=key[1]).first()
+        if row is not None:
+            vector = np.frombuffer(row.vector, dtype=np.float32)
+        else:
+            encoded = encode_texts([text])
+            if encoded is None:
+                return None
+            vector = np.ascontiguousarray(encoded[0], dtype=np.float32)
+            self._store(key, vector)
+        with self._lock:
+            self._memory[key] = vector
+            if len(self._memory) > self.MEMORY_ENTRIES:
+                self._memory.popitem(last=False)
+        return vector
+
+    def stored(self, text_hash):
+        """Stored vector for a resume text hash under the current model, without encoding"""
+        key = (text_hash, embedding_model_id())
+        with self._lock:
+            vector = self._memory.get(key)
+        if vector is None:
+            row = ResumeEmbedding.query.filter_by(text_hash=key[0], model=key[1]).first()
+            vector = np.frombuffer(row.vector, dtype=np.float32) if row is not None else None
+        return vector
+
+    def stored_many(self, text_hashes):
+        """{text hash: vector} of the stored vectors among text_hashes (current model)"""
+        vectors = {}
+        hashes = list(set(text_hashes))
+        for start in range(0, len(hashes), 500):
+            rows = ResumeEmbedding.query.filter(ResumeEmbedding.model == embedding_model_id(),
+                                                ResumeEmbedding.text_hash.in_(hashes[start:start + 500]))
+            for row in rows:
+                vectors[row.text_hash] = np.frombuffer(row.vector, dtype=np.float32)
+        return vectors
+
+    def _store(self, key, vector):
+        try:
+            db.session.add(ResumeEmbedding(text_hash=key[0], model=key[1], dim=len(vector), vector=vector.tobytes()))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # another worker stored the same resume first
@@ -0,0 +1,212 @@
+import json
+import re
+from datetime import datetime
+from sqlalchemy import and_, or_
+from models import db, User, JobAlert, RecommendationProfile, SavedSearch
+from email_service import EmailService
+from alert_feed import broker
+from job_catalog import job_catalog
+
+# Term fields of a search, most selective first; the first one a search sets is its anchor
+ANCHOR_FIELDS = ('keyword', 'location', 'industry', 'experience_level', 'job_type', 'remote_work')
+CATEGORY_FIELDS = ('industry', 'experience_level', 'job_type', 'remote_work')
+NUMBER_FIELDS = ('salary_min', 'salary_max', 'min_match')
+# Job text /advanced_search matches keywords against
+KEYWORD_COLUMNS = ('title', 'description', 'company_name', 'requirements')
+
+TOKEN = re.compile(r'[a-z0-9+#]+')
+
+def tokens(text):
+    return set(TOKEN.findall((text or '').lower()))
+
+class SavedSearchService:
+    """Saved /advanced_search queries, percolated against each newly posted job.
+
+    A saved search is stored as its structured filters plus one anchor
+    term: the longest word of its keyword or location, else its most
+    selective category value, else '*'. A job can only match a search if
+    it carries the search's anchor term, so percolate() looks up the
+    searches anchored on the job's own terms with one indexed query per
+    field (plus the '*' searches, pre-filtered on salary in SQL) and
+    evaluates the full predicate on those candidates only. The cost per
+    posting is proportional to the candidates, not to all saved searches.
+
+    Keyword and location filters match substrings in /advanced_search; an
+    alert additionally needs the anchor word to appear as a whole word.
+    """
+
+    IN_CHUNK = 500
+
+    def __init__(self, matcher='resume'):
+        self.matcher = job_catalog.matchers.get(matcher)
+        self.email_service = EmailService()
+
+    # --- saving ---
+
+    @staticmethod
+    def normalize_query(args):
+        """The non-empty /advanced_search filters of a request's args; ValueError on bad numbers"""
+        query = {}
+        for field in ANCHOR_FIELDS:
+            value = (args.get(field) or '').strip()
+            if value:
+                query[field] = value
+        for field in NUMBER_FIELDS:
+            value = (args.get(field) or '').strip()
+            if value and int(value):
+                query[field] = int(value)
+        return query
+
+    @staticmethod
+    def anchor(query):
+        for field in ANCHOR_FIELDS:
+            if field not in query:
+                continue
+            if field in CATEGORY_FIELDS:
+                return field, query[field]
+            words = tokens(query[field])
+            if words:
+                return field, max(sorted(words), key=len)
+        return '*', ''
+
+    @staticmethod
+    def describe(query):
+        parts = [str(query[field]) for field in ANCHOR_FIELDS if field in query]
+        if 'salary_min' in query:
+            parts.append(f"from ${query['salary_min']:,}")
+        if 'salary_max' in query:
+            parts.append(f"up to ${query['salary_max']:,}")
+        if 'min_match' in query:
+            parts.append(f"{query['min_match']}%+ match")
+        return ', '.join(parts) or 'All new jobs'
+
+    def save(self, user_id, args, name=None):
+        query = self.normalize_query(args)
+        anchor_field, anchor_value = self.anchor(query)
+        search = SavedSearch(
+            user_id=user_id,
+            name=(name or '').strip()[:100] or self.describe(query)[:100],
+            query=json.dumps(query),
+            anchor_field=anchor_field,
+            anchor_value=anchor_value[:100],
+            salary_min=query.get('salary_min'),
+            salary_max=query.get('salary_max')
+        )
+        db.session.add(search)
+        db.session.commit()
+        return search
+
+    def for_user(self, user_id):
+        return SavedSearch.query.filter_by(user_id=user_id).order_by(SavedSearch.created_at.desc()).all()
+
+    def delete(self, user_id, search_id):
+        search = SavedSearch.query.filter_by(id=search_id, user_id=user_id).first()
+        if search:
+            db.session.delete(search)
+            db.session.commit()
+            return True
+        return False
+
+    # --- percolation ---
+
+    def job_terms(self, job):
+        """{anchor field: values} a job carries"""
+        words = set()
+        for column in KEYWORD_COLUMNS:
+            words |= tokens(getattr(job, column))
+        terms = {'keyword': words, 'location': tokens(job.location)}
+        for field in CATEGORY_FIELDS:
+            value = getattr(job, field)
+            terms[field] = {value} if value else set()
+        return terms
+
+    def candidates(self, job):
+        """Saved searches whose anchor term the job carries"""
+        found = []
+        for field, values in self.job_terms(job).items():
+            values = sorted(values)
+            for start in range(0, len(values), self.IN_CHUNK):
+                found += SavedSearch.query.filter(SavedSearch.anchor_field == field,
+                                                  SavedSearch.anchor_value.in_(values[start:start + self.IN_CHUNK])).all()
+        # Searches without a term predicate: only their salary bounds can rule the job out
+        salary_min_ok = SavedSearch.salary_min.is_(None)
+        if job.salary_max is not None:
+            salary_min_ok = or_(salary_min_ok, SavedSearch.salary_min <= job.salary_max)
+        salary_max_ok = SavedSearch.salary_max.is_(None)
+        if job.salary_min is not None:
+            salary_max_ok = or_(salary_max_ok, SavedSearch.salary_max >= job.salary_min)
+        found += SavedSearch.query.filter(SavedSearch.anchor_field == '*', and_(salary_min_ok, salary_max_ok)).all()
+        return found
+
+    @staticmethod
+    def matches(query, job, match_percentage):
+        """The /advanced_search predicate for one job; match_percentage() is only called for min_match"""
+        for field in CATEGORY_FIELDS:
+            if field in query and getattr(job, field) != query[field]:
+                return False
+        if 'location' in query and query['location'].lower() not in (job.location or '').lower():
+            return False
+        # NULL salaries never satisfy a bound, as in SQL
+        if 'salary_min' in query and (job.salary_max is None or job.salary_max < query['salary_min']):
+            return False
+        if 'salary_max' in query and (job.salary_min is None or job.salary_min > query['salary_max']):
+            return False
+        if 'keyword' in query:
+            keyword = query['keyword'].lower()
+            if not any(keyword in (getattr(job, column) or '').lower() for column in KEYWORD_COLUMNS):
+                return False
+        if 'min_match' in query and match_percentage() < query['min_match']:
+            return False
+        return True
+
+    def percolate(self, job):
+        """Alert the owners of saved searches matching a newly posted job; returns how many"""
+        if not job.is_active:
+            return 0
+        candidates = self.candidates(job)
+        if not candidates:
+            return 0
+        # One alert per student and job, also across JobAlertService's skill alerts
+        alerted = {user_id for (user_id,) in db.session.query(JobAlert.user_id).filter(JobAlert.job_id == job.id)}
+        candidates = [search for search in candidates if search.user_id not in alerted]
+        profiles = {}
+        user_ids = sorted({search.user_id for search in candidates})
+        for start in range(0, len(user_ids), self.IN_CHUNK):
+            for profile in RecommendationProfile.query.filter(
+                    RecommendationProfile.user_id.in_(user_ids[start:start + self.IN_CHUNK])):
+                profiles[profile.user_id] = json.loads(profile.skills or '[]')
+
+        percentages = {}
+        def match_percentage(user_id):
+            if user_id not in percentages:
+                skills = profiles.get(user_id)
+                percentages[user_id] = (self.matcher.match(skills, job).match_percentage
+                                        if skills and self.matcher is not None else 0.0)
+            return percentages[user_id]
+
+        matched = {}  # user_id -> first matching search
+        for search in candidates:
+            if search.user_id not in matched and self.matches(json.loads(search.query), job,
+                                                               lambda: match_percentage(search.user_id)):
+                matched[search.user_id] = search
+        if not matched:
+            return 0
+
+        now = datetime.utcnow()
+        created_alerts = []
+        for user_id, search in matched.items():
+            search.last_matched_at = now
+            job_alert = JobAlert(user_id=user_id, job_id=job.id, match_percentage=match_percentage(user_id),
+                                 match_reason=f'Matches your saved search "{search.name}"')
+            db.session.add(job_alert)
+            created_alerts.append(job_alert)
+        db.session.commit()
+
+        for job_alert in created_alerts:
+            broker.publish(job_alert.user_id, job_alert.id)
+        for user in User.query.filter(User.id.in_(list(matched)), User.email_notifications == True):
+            if user.email:
+                self.email_service.send_job_alert(user.email, user.username, job, percentages[user.id],
+                                                  f'Matches your saved search "{matched[user.id].name}"')
+        print(f"🔔 Saved searches: {len(candidates)} candidates, {len(matched)} alerts for job: {job.title}")
+        return len(matched)
@@ -0,0 +1,105 @@
+"""Versioned NumPy arrays shared by every worker through mmap'd files.
+
+A publisher writes each array of a version to ``<dir>/<name>/<version>/`` as
+.npy files, renames the directory into place and then atomically replaces
+``<dir>/<name>.json`` to point at it. Readers follow the manifest and open
+the arrays with ``mmap_mode='r'``, so all workers on a node share one copy
+in the page cache and only touched pages count against their RSS.
+
+Publishing takes an exclusive, non-blocking file lock per name; if another
+process is already writing, the caller simply skips publishing.
+"""
+import json
+import os
+import shutil
+import threading
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, last writer wins
+    fcntl = None
+
+class SharedArrayStore:
+    """Publish and attach read-only, memory-mapped array bundles by name and version"""
+
+    KEEP_VERSIONS = 2  # older versions are unlinked; open mmaps stay valid
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._attached = {}  # name -> (version, arrays)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _manifest_path(self, name):
+        return os.path.join(self.directory, f'{name}.json')
+
+    def read_manifest(self, name):
+        try:
+            with open(self._manifest_path(name), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def current_version(self, name):
+        manifest = self.read_manifest(name)
+        return manifest['version'] if manifest else None
+
+    def attach(self, name, version=None):
+        """Memory-mapped arrays of the current bundle, or None if missing or not at `version`"""
+        manifest = self.read_manifest(name)
+        if not manifest or (version is not None and manifest['version'] != version):
+            return None
+        with self._lock:
+            cached = self._attached.get(name)
+            if cached and cached[0] == manifest['version']:
+                return cached[1]
+        path = os.path.join(self.directory, name, manifest['path'])
+        try:
+            arrays = {array: np.load(os.path.join(path, f'{array}.npy'), mmap_mode='r')
+                      for array in manifest['arrays']}
+        except OSError:
+            return None  # superseded and pruned between reading the manifest and opening
+        with self._lock:
+            self._attached[name] = (manifest['version'], arrays)
+        return arrays
+
+    def publish(self, name, version, **arrays):
+        """Write a new version of a bundle and make it current; False if another writer holds the lock"""
+        base = os.path.join(self.directory, name)
+        os.makedirs(base, exist_ok=True)
+        with open(os.path.join(self.directory, f'{name}.lock'), 'w') as lock:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return False
+            if self.current_version(name) == version:
+                return True
+            folder = f'{version}'
+            staging = os.path.join(base, f'.{folder}.{os.getpid()}.tmp')
+            shutil.rmtree(staging, ignore_errors=True)
+            os.makedirs(staging)
+            for array_name, array in arrays.items():
+                np.save(os.path.join(staging, f'{array_name}.npy'), np.ascontiguousarray(array))
+            final = os.path.join(base, folder)
+            shutil.rmtree(final, ignore_errors=True)
+            os.rename(staging, final)
+            manifest = {'version': version, 'path': folder, 'arrays': sorted(arrays)}
+            tmp_manifest = self._manifest_path(name) + f'.{os.getpid()}.tmp'
+            with open(tmp_manifest, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_manifest, self._manifest_path(name))
+            self._prune(base, keep=folder)
+        return True
+
+    def _prune(self, base, keep):
+        versions = sorted(
+            (entry for entry in os.scandir(base) if entry.is_dir() and not entry.name.startswith('.')),
+            key=lambda entry: entry.stat().st_mtime, reverse=True
+        )
+        for entry in versions[self.KEEP_VERSIONS:]:
+            if entry.name != keep:
+                shutil.rmtree(entry.path, ignore_errors=True)
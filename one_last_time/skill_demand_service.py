@@ -0,0 +1,215 @@
+"""Market demand per skill: active job count, recent postings and median salary.
+
+The Job listeners below keep JobSkill (the skills of each active job) and
+the SkillDemand rows of the affected skills current inside the same flush
+that posts, edits, deactivates or deletes a job: each JobSkill row removed
+or added shifts its skill's active and recent counts by one, and the median
+salary is recomputed only for skills whose salaries changed. /counseling can
+then rank a student's missing skills with one query instead of extracting
+skills from every job. Skills come from the matcher registered on
+job_catalog, which is why these listeners live here rather than in models.py.
+
+refresh() runs as a periodic task so postings age out of the recent window;
+rebuild() re-extracts every job (after a migration or a vocabulary change).
+"""
+import statistics
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy import bindparam, event, inspect, select
+from models import db, Job, JobSkill, SkillDemand
+from job_catalog import job_catalog
+
+# Job fields the demand aggregate depends on
+DEMAND_FIELDS = ('description', 'is_active', 'salary_min', 'salary_max', 'posted_date')
+
+def salary_midpoint(salary_min, salary_max):
+    bounds = [value for value in (salary_min, salary_max) if value is not None]
+    return sum(bounds) / len(bounds) if bounds else None
+
+class SkillDemandService:
+    RECENT_DAYS = 30
+
+    def __init__(self, matcher='resume'):
+        self.matcher = job_catalog.matchers.get(matcher)
+
+    def job_skills(self, job):
+        """Skills required by an active job; none for inactive jobs"""
+        if self.matcher is None or not job.is_active:
+            return []
+        return self.matcher.vocabulary.decode(self.matcher.job_mask(job))
+
+    # --- reading ---
+
+    def missing_skills(self, user_skills, limit=None):
+        """SkillDemand rows of the skills a student lacks, most demanded first"""
+        query = SkillDemand.query.filter(SkillDemand.active_jobs > 0)
+        if user_skills:
+            query = query.filter(SkillDemand.skill.notin_(list(user_skills)))
+        query = query.order_by(SkillDemand.active_jobs.desc(), SkillDemand.recent_jobs.desc(), SkillDemand.skill)
+        return query.limit(limit).all() if limit else query.all()
+
+    # --- maintenance ---
+
+    def aggregate(self, connection, skills, now=None):
+        """Recompute the SkillDemand rows of these skills from JobSkill"""
+        skills = set(skills)
+        if not skills:
+            return
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(days=self.RECENT_DAYS)
+        job_skill = JobSkill.__table__
+        demand = SkillDemand.__table__
+
+        totals = {skill: [0, 0, []] for skill in skills}  # active, recent, salaries
+        rows = connection.execute(
+            select(job_skill.c.skill, job_skill.c.posted_date, job_skill.c.salary).where(job_skill.c.skill.in_(skills))
+        )
+        for skill, posted, salary in rows:
+            entry = totals[skill]
+            entry[0] += 1
+            if posted is not None and posted >= cutoff:
+                entry[1] += 1
+            if salary is not None:
+                entry[2].append(salary)
+
+        connection.execute(demand.delete().where(demand.c.skill.in_(skills)))
+        values = [
+            {'skill': skill, 'active_jobs': active, 'recent_jobs': recent,
+             'median_salary': statistics.median(salaries) if salaries else None, 'updated_at': now}
+            for skill, (active, recent, salaries) in totals.items() if active
+        ]
+        if values:
+            connection.execute(demand.insert(), values)
+
+    def apply_deltas(self, connection, removed, added, now=None):
+        """Shift the SkillDemand counts by -1 per removed and +1 per added JobSkill row
+        (mappings with skill, posted_date and salary), then recompute the median salary of
+        the skills whose salaries changed; call once the JobSkill rows are replaced"""
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(days=self.RECENT_DAYS)
+        deltas = {}  # skill -> [active, recent]
+        salary_changes = {}  # skill -> Counter of salary -> net rows
+        for rows, sign in ((removed, -1), (added, 1)):
+            for row in rows:
+                entry = deltas.setdefault(row['skill'], [0, 0])
+                entry[0] += sign
+                if row['posted_date'] is not None and row['posted_date'] >= cutoff:
+                    entry[1] += sign
+                if row['salary'] is not None:
+                    salary_changes.setdefault(row['skill'], Counter())[row['salary']] += sign
+        deltas = {skill: delta for skill, delta in deltas.items() if delta != [0, 0]}
+        median_skills = [skill for skill, change in salary_changes.items() if any(change.values())]
+        demand = SkillDemand.__table__
+
+        if deltas:
+            existing = {skill for (skill,) in connection.execute(
+                select(demand.c.skill).where(demand.c.skill.in_(list(deltas))))}
+            updates = [{'b_skill': skill, 'b_active': active, 'b_recent': recent}
+                       for skill, (active, recent) in deltas.items() if skill in existing]
+            if updates:
+                connection.execute(
+                    demand.update().where(demand.c.skill == bindparam('b_skill')).values(
+                        active_jobs=demand.c.active_jobs + bindparam('b_active'),
+                        recent_jobs=demand.c.recent_jobs + bindparam('b_recent'),
+                        updated_at=now),
+                    updates)
+            values = [
+                {'skill': skill, 'active_jobs': active, 'recent_jobs': max(recent, 0),
+                 'median_salary': None, 'updated_at': now}
+                for skill, (active, recent) in deltas.items() if skill not in existing and active > 0
+            ]
+            if values:
+                connection.execute(demand.insert(), values)
+            connection.execute(demand.delete().where(demand.c.skill.in_(list(deltas)), demand.c.active_jobs <= 0))
+
+        if median_skills:
+            # Salaries of just these skills, through the JobSkill.skill index
+            job_skill = JobSkill.__table__
+            salaries = {skill: [] for skill in median_skills}
+            for skill, salary in connection.execute(
+                    select(job_skill.c.skill, job_skill.c.salary).where(
+                        job_skill.c.skill.in_(median_skills), job_skill.c.salary.isnot(None))):
+                salaries[skill].append(salary)
+            connection.execute(
+                demand.update().where(demand.c.skill == bindparam('b_skill')).values(
+                    median_salary=bindparam('b_median'), updated_at=now),
+                [{'b_skill': skill, 'b_median': statistics.median(values) if values else None}
+                 for skill, values in salaries.items()])
+
+    def jobs_changed(self, connection, jobs, deleted=False):
+        """Replace the jobs' JobSkill rows and update the demand of the skills they gained or lost"""
+        job_skill = JobSkill.__table__
+        ids = [job.id for job in jobs]
+        if not ids:
+            return
+        now = datetime.utcnow()
+        old = [row._mapping for row in connection.execute(
+            select(job_skill.c.skill, job_skill.c.posted_date, job_skill.c.salary).where(job_skill.c.job_id.in_(ids)))]
+        connection.execute(job_skill.delete().where(job_skill.c.job_id.in_(ids)))
+        values = [] if deleted else [
+            {'job_id': job.id, 'skill': skill, 'posted_date': job.posted_date or now,
+             'salary': salary_midpoint(job.salary_min, job.salary_max)}
+            for job in jobs for skill in self.job_skills(job)
+        ]
+        if values:
+            connection.execute(job_skill.insert(), values)
+        self.apply_deltas(connection, old, values, now)
+
+    def refresh(self):
+        """Re-aggregate every skill so old postings leave the recent counts; returns how many skills"""
+        skills = {skill for (skill,) in db.session.query(JobSkill.skill).distinct()}
+        skills |= {skill for (skill,) in db.session.query(SkillDemand.skill)}
+        self.aggregate(db.session.connection(), skills)
+        db.session.commit()
+        return len(skills)
+
+    def rebuild(self):
+        """Re-extract the skills of every active job and recompute all demand rows"""
+        if self.matcher is None:
+            return 0
+        connection = db.session.connection()
+        connection.execute(JobSkill.__table__.delete())
+        jobs = db.session.query(Job.id, Job.description, Job.is_active, Job.posted_date,
+                                Job.salary_min, Job.salary_max).filter(Job.is_active == True)
+        values = [
+            {'job_id': job.id, 'skill': skill, 'posted_date': job.posted_date,
+             'salary': salary_midpoint(job.salary_min, job.salary_max)}
+            for job in jobs for skill in self.job_skills(job)
+        ]
+        if values:
+            connection.execute(JobSkill.__table__.insert(), values)
+        skills = {value['skill'] for value in values} | {skill for (skill,) in db.session.query(SkillDemand.skill)}
+        self.aggregate(connection, skills)
+        db.session.commit()
+        print(f"📈 Rebuilt skill demand: {len(values)} job skills across {len(skills)} skills")
+        return len(values)
+
+
+# --- Incremental maintenance ---
+# A job only shifts the demand counts of the skills it gains or loses. Without
+# a registered matcher (standalone scripts) changes are skipped; rebuild()
+# catches up.
+
+def _update_job_demand(connection, target, deleted=False):
+    service = SkillDemandService()
+    if service.matcher is not None:
+        service.jobs_changed(connection, [target], deleted)
+
+@event.listens_for(Job, 'after_insert')
+def _skill_demand_job_inserted(mapper, connection, target):
+    _update_job_demand(connection, target)
+
+@event.listens_for(Job, 'after_update')
+def _skill_demand_job_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in DEMAND_FIELDS):
+        _update_job_demand(connection, target)
+
+@event.listens_for(Job, 'before_delete')
+def _skill_demand_job_deleted(mapper, connection, target):
+    _update_job_demand(connection, target, deleted=True)
+
+if __name__ == '__main__':
+    from app import app
+    with app.app_context():
+        SkillDemandService().rebuild()
@@ -0,0 +1,131 @@
+import json
+import os
+from datetime import datetime
+from flask import current_app
+from models import db, User, Job, Application, RecommendationProfile, SkillIndexState
+from ai.resume_parser import parse_resume
+from ai.skill_registry import skill_registry
+from skill_demand_service import SkillDemandService
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock
+    fcntl = None
+
+class SkillReindexService:
+    """Re-derive stored skills after the skill registry's VERSION is bumped.
+
+    Runs in three phases, each walking its table in id order one chunk per
+    transaction: job skills (JobSkill and SkillDemand), the skills stored on
+    recommendation profiles (re-extracted from the resume file and flagged
+    for RecommendationService.maintain()), and finally every application is
+    flagged score_stale for the rescore task. SkillIndexState records the
+    phase and last id done after each chunk, so an interrupted run resumes
+    where it stopped. Every step is idempotent. Every worker schedules run(),
+    so with a lock_path only the process holding that file lock works; the
+    others return at once.
+    """
+
+    PHASES = ('jobs', 'profiles', 'applications')
+
+    def __init__(self, registry=skill_registry):
+        self.registry = registry
+
+    def state(self):
+        state = db.session.get(SkillIndexState, 1)
+        if state is None:
+            # A database without jobs or profiles has nothing extracted by an older vocabulary
+            empty = Job.query.first() is None and RecommendationProfile.query.first() is None
+            state = SkillIndexState(id=1, version=self.registry.version if empty else 0, cursor=0)
+            db.session.add(state)
+        return state
+
+    def mark_current(self):
+        """Record that the stored skills match the registry, e.g. right after a full rebuild"""
+        state = self.state()
+        state.version = self.registry.version
+        state.target_version = state.phase = None
+        state.cursor = 0
+        state.updated_at = datetime.utcnow()
+        db.session.commit()
+
+    def run(self, chunk_size=200, max_chunks=None, lock_path=None):
+        """Process up to max_chunks chunks (default: until done); returns the rows processed,
+        0 if another process holds lock_path"""
+        if lock_path is None or fcntl is None:
+            return self._run(chunk_size, max_chunks)
+        with open(lock_path, 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return 0
+            return self._run(chunk_size, max_chunks)
+
+    def _run(self, chunk_size, max_chunks):
+        # Read the state only once the lock is held, so a run another worker finished isn't repeated
+        db.session.expire_all()
+        state = self.state()
+        if state.version == self.registry.version and state.target_version is None:
+            return 0
+        if state.target_version != self.registry.version:
+            print(f"🔁 Re-indexing skills: vocabulary v{state.version} -> v{self.registry.version}")
+            state.target_version = self.registry.version
+            state.phase = self.PHASES[0]
+            state.cursor = 0
+            db.session.commit()
+
+        processed = chunks = 0
+        while state.phase is not None and (max_chunks is None or chunks < max_chunks):
+            done = getattr(self, f'_reindex_{state.phase}')(state, chunk_size)
+            processed += done
+            chunks += 1
+            if done < chunk_size:
+                following = self.PHASES.index(state.phase) + 1
+                state.phase = self.PHASES[following] if following < len(self.PHASES) else None
+                state.cursor = 0
+            if state.phase is None:
+                state.version = state.target_version
+                state.target_version = None
+                print(f"✅ Skill re-index to v{state.version} complete")
+            state.updated_at = datetime.utcnow()
+            db.session.commit()
+        return processed
+
+    def _reindex_jobs(self, state, chunk_size):
+        jobs = db.session.query(Job.id, Job.description, Job.is_active, Job.posted_date,
+                                Job.salary_min, Job.salary_max).filter(
+            Job.id > state.cursor).order_by(Job.id).limit(chunk_size).all()
+        if jobs:
+            SkillDemandService().jobs_changed(db.session.connection(), jobs)
+            state.cursor = jobs[-1].id
+        return len(jobs)
+
+    def _reindex_profiles(self, state, chunk_size):
+        profiles = RecommendationProfile.query.filter(
+            RecommendationProfile.user_id > state.cursor
+        ).order_by(RecommendationProfile.user_id).limit(chunk_size).all()
+        if not profiles:
+            return 0
+        users = {user.id: user for user in User.query.filter(User.id.in_([p.user_id for p in profiles]))}
+        for profile in profiles:
+            user = users.get(profile.user_id)
+            filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], user.resume) if user and user.resume else None
+            if filepath and os.path.exists(filepath):
+                skills = parse_resume(filepath)['skills']
+            else:
+                skills = self.registry.normalize(json.loads(profile.skills or '[]'))
+            profile.skills = json.dumps(skills)
+            profile.skill_mask = None  # Re-derived by the rebuild
+            profile.stale = True
+        state.cursor = profiles[-1].user_id
+        return len(profiles)
+
+    def _reindex_applications(self, state, chunk_size):
+        # One statement; ApplicantScoringService.rescore_stale() works through them in batches
+        Application.query.update({'score_stale': True}, synchronize_session=False)
+        return 0
+
+if __name__ == '__main__':
+    from app import app
+    with app.app_context():
+        SkillReindexService().run()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Route check: /advanced_search renders facet counts next to the filter options
+"""
+
+import os
+import shutil
+import tempfile
+
+# Point every file app.py writes at a throwaway directory and disable the periodic
+# tasks; app.py reads these at import time, so setting TESTING afterwards is too late
+workdir = tempfile.mkdtemp(prefix='jobportal-test-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'test.db')
+os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+os.environ['QUERY_CACHE_PATH'] = os.path.join(workdir, 'query_cache.db')
+os.environ['SHARED_STORE_DIR'] = os.path.join(workdir, 'shared')
+os.environ['EMBEDDING_STORE_DIR'] = os.path.join(workdir, 'embeddings')
+os.environ['PROFILE_DIR'] = os.path.join(workdir, 'profiles')
+for interval in ('STATS_RECONCILE_INTERVAL', 'ADMIN_STATS_REFRESH_INTERVAL', 'EMBEDDING_COMPACT_INTERVAL',
+                 'RECOMMENDATIONS_MAINTAIN_INTERVAL', 'APPLICATION_RESCORE_INTERVAL',
+                 'SKILL_DEMAND_REFRESH_INTERVAL', 'SKILL_REINDEX_INTERVAL'):
+    os.environ[interval] = '0'
+
+from app import app, db
+from models import User, Job
+
+def teardown_module(module=None):
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+def test_advanced_search_facets():
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        student = User(username='facetstudent', password='x', user_type='student')
+        employer = User(username='facetemployer', password='x', user_type='employer')
+        db.session.add_all([student, employer])
+        db.session.commit()
+        for title, job_type, remote_work in [('Backend Developer', 'Full-time', 'Remote'),
+                                             ('Data Analyst', 'Full-time', 'On-site'),
+                                             ('Intern', 'Internship', 'Remote')]:
+            db.session.add(Job(title=title, description=f'{title} role', employer_id=employer.id,
+                               job_type=job_type, remote_work=remote_work, is_active=True))
+        db.session.commit()
+        student_id = student.id
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(student_id)
+        session['_fresh'] = True
+
+    response = client.get('/advanced_search')
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert 'Full-time (2)' in html
+    assert 'Internship (1)' in html
+    assert 'Remote (2)' in html
+
+    # A facet is counted under the other filters only, so its own options stay visible
+    html = client.get('/advanced_search?job_type=Full-time').get_data(as_text=True)
+    assert 'Internship (1)' in html
+    assert 'Remote (1)' in html
+    assert 'On-site (1)' in html
+
+    # /jobs renders without the advanced search facets
+    assert client.get('/jobs').status_code == 200
+    print("✅ Facet counts render on /advanced_search")
+
+if __name__ == '__main__':
+    try:
+        test_advanced_search_facets()
+    finally:
+        teardown_module()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Regression checks for skill extraction in the shared skill registry
+"""
+
+from ai.skill_registry import skill_registry
+
+def test_multi_word_skills():
+    text = ("Worked in data science using machine learning, deep learning, project management, "
+            "data analysis and customer service")
+    assert skill_registry.extract_skills(text) == [
+        'machine learning', 'data analysis', 'project management', 'deep learning',
+        'data science', 'customer service'
+    ]
+    # Any whitespace between the words
+    assert skill_registry.extract_skills("Machine\n  Learning") == ['machine learning']
+
+def test_aliases():
+    assert skill_registry.extract_skills("Power BI dashboards") == ['powerbi']
+    assert skill_registry.extract_skills("Amazon Web Services") == ['aws']
+    assert skill_registry.extract_skills("natural language processing") == ['nlp']
+    assert skill_registry.extract_skills("node js backends") == ['node.js']
+    assert skill_registry.extract_skills("NodeJS, ML and k8s") == ['machine learning', 'node.js', 'kubernetes']
+    assert skill_registry.normalize(['ML', 'node js', 'Python', 'unknown', 'ml']) == ['machine learning', 'node.js', 'python']
+
+def test_word_boundaries():
+    assert skill_registry.extract_skills("javascript") == ['javascript']
+    assert skill_registry.extract_skills("mysql") == ['mysql']
+    assert skill_registry.extract_skills("maintain the c++ code") == ['c++']
+
+if __name__ == '__main__':
+    test_multi_word_skills()
+    test_aliases()
+    test_word_boundaries()
+    print("✅ Skill registry extraction checks passed")